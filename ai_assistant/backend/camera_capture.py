@@ -1,43 +1,93 @@
 import sys
+import threading
 from pathlib import Path
 import base64
-import cv2
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.config.ports_and_cameras import camera_config
+# cv2 and the camera config (which pulls in lerobot) are imported on first use so the backend
+# starts serving without them; see warmup.py.
+_cameras = {}
+# One lock per camera: /camera/capture and /analyze_scene can read the same device concurrently
+_camera_locks = {}
+_init_lock = threading.Lock()
 
-_top_camera = None
+def initialize_camera(name="top"):
+    with _init_lock:
+        if name not in _camera_locks:
+            _open_camera(name)
+            _camera_locks[name] = threading.Lock()
 
-def initialize_top_camera():
-    global _top_camera
-    if _top_camera is not None:
+def _open_camera(name):
+    import cv2
+    from src.config.ports_and_cameras import camera_config, ROBOT_BACKEND
+    if name not in camera_config:
+        raise ValueError(f"{name.capitalize()} camera not configured in ports_and_cameras.py")
+    config = camera_config[name]
+    if ROBOT_BACKEND == "sim":
+        from src.hardware.sim import SimCamera
+        camera = SimCamera(config, name)
+        camera.connect()
+        _cameras[name] = camera
         return
-    if "top" not in camera_config:
-        raise ValueError("Top camera not configured in ports_and_cameras.py")
-    top = camera_config["top"]
-    _top_camera = cv2.VideoCapture(top.index_or_path)
-    if not _top_camera.isOpened():
-        raise RuntimeError("Failed to open top camera")
-    if hasattr(top, "width") and hasattr(top, "height"):
-        _top_camera.set(cv2.CAP_PROP_FRAME_WIDTH, top.width)
-        _top_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, top.height)
+    camera = cv2.VideoCapture(config.index_or_path)
+    if not camera.isOpened():
+        raise RuntimeError(f"Failed to open {name} camera")
+    if hasattr(config, "width") and hasattr(config, "height"):
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+    _cameras[name] = camera
 
-def capture_top_camera_image() -> str:
-    global _top_camera
-    if _top_camera is None:
-        initialize_top_camera()
-    ok, frame = _top_camera.read()
+def initialize_top_camera():
+    initialize_camera("top")
+
+def read_camera_frame(name="top"):
+    # Latest frame of one configured camera ("top", "wrist"), BGR
+    if name not in _camera_locks:
+        initialize_camera(name)
+    import cv2
+    from src.config.ports_and_cameras import ROBOT_BACKEND
+    with _camera_locks[name]:
+        if ROBOT_BACKEND == "sim":
+            return cv2.cvtColor(_cameras[name].async_read(timeout_ms=1000), cv2.COLOR_RGB2BGR)
+        ok, frame = _cameras[name].read()
     if not ok or frame is None:
-        raise RuntimeError("Failed to read from top camera")
+        raise RuntimeError(f"Failed to read from {name} camera")
+    return frame
+
+def read_top_camera_frame():
+    return read_camera_frame("top")
+
+def encode_frame(frame) -> str:
+    import cv2
     ok, buffer = cv2.imencode(".png", frame)  # BGR → PNG
     if not ok:
         raise RuntimeError("Failed to encode frame")
     return base64.b64encode(buffer.tobytes()).decode("utf-8")
 
+def capture_top_camera_image() -> str:
+    return encode_frame(read_top_camera_frame())
+
+def encode_jpeg(frame, max_width=None, quality=85) -> str:
+    # Compressed BGR frame for upstream vision calls, downscaled to max_width if wider
+    import cv2
+    if max_width and frame.shape[1] > max_width:
+        height = round(frame.shape[0] * max_width / frame.shape[1])
+        frame = cv2.resize(frame, (max_width, height), interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError("Failed to encode frame")
+    return base64.b64encode(buffer.tobytes()).decode("utf-8")
+
 def release_camera():
-    global _top_camera
-    if _top_camera is not None:
-        _top_camera.release()
-        _top_camera = None
\ No newline at end of file
+    if not _cameras:
+        return
+    from src.config.ports_and_cameras import ROBOT_BACKEND
+    for camera in _cameras.values():
+        if ROBOT_BACKEND == "sim":
+            camera.disconnect()
+        else:
+            camera.release()
+    _cameras.clear()
+    _camera_locks.clear()
@@ -0,0 +1,240 @@
+import asyncio
+import bisect
+import contextvars
+import itertools
+import time
+import uuid
+
+from src.control.cancel import CancelToken, cancel_scope
+from src.tracing.spans import span
+
+# One job queue per robot cell (CELLS in src/config/ports_and_cameras.py), each drained by its own
+# task so cells run in parallel while jobs on a cell run one at a time. A job is a whole skill or
+# workflow: it is routed once and then keeps its cell until it is done.
+# Queued jobs run highest priority first (FIFO within a priority) and can be reprioritized or
+# dropped; a running job is cancelled through its CancelToken (see src/control/cancel.py).
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class _Job:
+    _seq = itertools.count()
+
+    def __init__(self, label: str, fn, priority: int):
+        loop = asyncio.get_running_loop()
+        self.id = uuid.uuid4().hex[:8]
+        self.label = label
+        self.fn = fn  # fn(cell_name) -> result, run on a worker thread
+        self.priority = priority
+        self.seq = next(self._seq)
+        self.cell = None
+        self.state = "queued"
+        self.token = CancelToken()
+        self.context = contextvars.copy_context()  # trace context of the request that submitted it
+        self.queued_at = time.monotonic()
+        self.started = loop.create_future()
+        self.done = loop.create_future()
+
+    def sort_key(self) -> tuple:
+        return (-self.priority, self.seq)
+
+    def info(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "cell": self.cell,
+            "priority": self.priority,
+            "state": self.state,
+            "waited_s": time.monotonic() - self.queued_at,
+        }
+
+
+class Cell:
+    def __init__(self, name: str):
+        self.name = name
+        self.pending = []  # queued jobs in run order
+        self.wakeup = asyncio.Event()
+        self.lock = asyncio.Lock()  # held while a job drives this cell's arm
+        self.task = None
+        self.running = None
+        self.current_started = None
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.jobs_cancelled = 0
+        self.jobs_started = 0
+        self.busy_s = 0.0
+        self.queue_wait_s = 0.0
+
+    def push(self, job: _Job) -> None:
+        bisect.insort(self.pending, job, key=_Job.sort_key)
+        self.wakeup.set()
+
+    def load(self) -> int:
+        # Jobs queued plus the one running
+        return len(self.pending) + (1 if self.lock.locked() else 0)
+
+    def stats(self, uptime_s: float) -> dict:
+        running_s = time.monotonic() - self.current_started if self.current_started else 0.0
+        jobs = self.jobs_started
+        return {
+            "current": self.running.label if self.running else None,
+            "queued": len(self.pending),
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "jobs_cancelled": self.jobs_cancelled,
+            "utilization": (self.busy_s + running_s) / uptime_s if uptime_s else 0.0,
+            "throughput_per_hour": self.jobs_completed * 3600 / uptime_s if uptime_s else 0.0,
+            "mean_job_s": self.busy_s / jobs if jobs else None,
+            "mean_queue_wait_s": self.queue_wait_s / jobs if jobs else None,
+        }
+
+
+class CellScheduler:
+    def __init__(self):
+        self.cells = {}
+        self.jobs = {}  # queued and running jobs by id
+        self.started_at = None
+
+    def start(self) -> None:
+        self.started_at = time.monotonic()
+
+    def _ensure_cells(self) -> None:
+        # Created on first use, so the lerobot camera config stays off the startup path
+        if self.cells:
+            return
+        from ai_assistant.backend.robot_worker import ROBOT_WORKER
+        from src.config.ports_and_cameras import CELLS, DEFAULT_CELL
+
+        # The robot worker process drives a single arm, the default cell
+        for name in [DEFAULT_CELL] if ROBOT_WORKER == "process" else CELLS:
+            cell = Cell(name)
+            cell.task = asyncio.create_task(self._drain(cell), name=f"cell_{name}")
+            self.cells[name] = cell
+
+    def stop(self) -> None:
+        for job in list(self.jobs.values()):
+            self.cancel(job.id, "backend shutting down")
+        for cell in self.cells.values():
+            cell.task.cancel()
+
+    def route(self, cell_name: str | None = None) -> Cell:
+        # An explicit cell wins; otherwise the idlest cell, ties going to the least used one
+        self._ensure_cells()
+        if cell_name is not None:
+            if cell_name not in self.cells:
+                raise ValueError(f"Unknown cell {cell_name}; configured cells: {', '.join(self.cells)}")
+            return self.cells[cell_name]
+        return min(self.cells.values(), key=lambda c: (c.load(), c.busy_s))
+
+    async def submit(self, label: str, fn, cell_name: str | None = None, priority: int = 0) -> tuple[str, object]:
+        # Queues fn on a cell and returns (cell name, fn's result) once it has run.
+        # Raises JobCancelled if the job is dropped while queued or cancelled while running.
+        cell = self.route(cell_name)
+        job = _Job(label, fn, priority)
+        job.cell = cell.name
+        self.jobs[job.id] = job
+        cell.push(job)
+        try:
+            with span("cell.queue_wait", cell=cell.name, job_id=job.id, priority=priority, queued=len(cell.pending)):
+                await asyncio.shield(job.started)
+            return cell.name, await asyncio.shield(job.done)
+        except asyncio.CancelledError:
+            if job.id in self.jobs:
+                self.cancel(job.id, "request went away")  # the caller cannot see the result any more
+            raise
+
+    def reprioritize(self, job_id: str, priority: int) -> dict:
+        job = self._job(job_id)
+        if job.state != "queued":
+            raise ValueError(f"Job {job_id} is {job.state}; only queued jobs can be reprioritized")
+        cell = self.cells[job.cell]
+        cell.pending.remove(job)
+        job.priority = priority
+        cell.push(job)
+        return job.info()
+
+    def cancel(self, job_id: str, reason: str = "cancelled") -> dict:
+        # Queued: dropped from its cell's queue. Running: its CancelToken stops record_loop at the
+        # next control tick and the skill script releases the gripper and disconnects.
+        job = self._job(job_id)
+        if job.state == "queued":
+            self.cells[job.cell].pending.remove(job)
+            self.cells[job.cell].jobs_cancelled += 1
+            self._finish(job, "cancelled", exception=JobCancelled(f"Job {job_id} dropped: {reason}"))
+            job.started.set_result(None)
+        elif job.state == "running":
+            job.state = "cancelling"
+            job.token.cancel(reason)
+        return job.info()
+
+    def cancel_running(self, cell_name: str | None = None, reason: str = "cancelled") -> list[dict]:
+        return [
+            self.cancel(job.id, reason)
+            for job in list(self.jobs.values())
+            if job.state == "running" and cell_name in (None, job.cell)
+        ]
+
+    def list_jobs(self) -> list[dict]:
+        self._ensure_cells()
+        jobs = [cell.running for cell in self.cells.values() if cell.running]
+        jobs += [job for cell in self.cells.values() for job in cell.pending]
+        return [job.info() for job in jobs]
+
+    def _job(self, job_id: str) -> _Job:
+        if job_id not in self.jobs:
+            raise KeyError(f"No queued or running job {job_id}")
+        return self.jobs[job_id]
+
+    def _finish(self, job: _Job, state: str, result=None, exception: Exception | None = None) -> None:
+        job.state = state
+        self.jobs.pop(job.id, None)
+        if exception is None:
+            job.done.set_result(result)
+        else:
+            job.done.set_exception(exception)
+            job.done.exception()  # mark retrieved: the submitter may have gone away
+
+    def _run(self, job: _Job, cell_name: str):
+        with cancel_scope(job.token):
+            return job.fn(cell_name)
+
+    async def _drain(self, cell: Cell) -> None:
+        while True:
+            while not cell.pending:
+                cell.wakeup.clear()
+                await cell.wakeup.wait()
+            job = cell.pending.pop(0)
+            async with cell.lock:
+                now = time.monotonic()
+                cell.queue_wait_s += now - job.queued_at
+                cell.jobs_started += 1
+                cell.running, cell.current_started = job, now
+                job.state = "running"
+                job.started.set_result(None)
+                try:
+                    result = await asyncio.to_thread(job.context.run, self._run, job, cell.name)
+                    if job.token.cancelled.is_set():
+                        cell.jobs_cancelled += 1
+                        self._finish(job, "cancelled", exception=JobCancelled(f"Job {job.id} cancelled: {job.token.reason}"))
+                    else:
+                        cell.jobs_completed += 1
+                        self._finish(job, "completed", result=result)
+                except Exception as e:
+                    cell.jobs_failed += 1
+                    self._finish(job, "failed", exception=e)
+                finally:
+                    cell.busy_s += time.monotonic() - cell.current_started
+                    cell.running, cell.current_started = None, None
+
+    def stats(self) -> dict:
+        self._ensure_cells()
+        uptime_s = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "uptime_s": uptime_s,
+            "cells": {name: cell.stats(uptime_s) for name, cell in self.cells.items()},
+        }
+
+
+cell_scheduler = CellScheduler()
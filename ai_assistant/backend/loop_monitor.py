@@ -0,0 +1,115 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+# Any stretch where the event loop can't run a callback for longer than this is recorded with a
+# stack sample of what was holding it. 0 disables the monitor.
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+LOOP_LAG_INTERVAL_S = 0.02
+LOOP_STALLS_KEPT = 200
+ENDPOINT_SAMPLES_KEPT = 5000
+
+
+def _percentiles_ms(samples) -> dict:
+    import numpy as np
+
+    if not samples:
+        return {}
+    arr = np.asarray(samples) * 1e3
+    return {
+        "n": len(arr),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+        "max": float(arr.max()),
+    }
+
+
+class LoopLagMonitor:
+    # A heartbeat coroutine ticks every LOOP_LAG_INTERVAL_S and records how late it woke up.
+    # A watchdog thread notices when the heartbeat is overdue by more than the threshold and
+    # samples the loop thread's stack while it is still blocked, so the stall points at the
+    # offending call (cv2.imencode, a sync file write, ...) rather than at the heartbeat.
+
+    def __init__(self, threshold_ms: float = LOOP_LAG_THRESHOLD_MS, interval_s: float = LOOP_LAG_INTERVAL_S):
+        self.threshold_s = threshold_ms / 1000.0
+        self.interval_s = interval_s
+        self.lags = deque(maxlen=ENDPOINT_SAMPLES_KEPT)
+        self.stalls = deque(maxlen=LOOP_STALLS_KEPT)
+        self.endpoint_latencies = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.last_beat = time.perf_counter()
+        self.loop_thread_id = None
+        self.task = None
+        self.thread = None
+        self._open_stall = None
+
+    def start(self) -> None:
+        if self.threshold_s <= 0:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.perf_counter()
+        self.stop_event.clear()
+        self.task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self.thread = threading.Thread(target=self._watchdog, name="loop_lag_watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            with self.lock:
+                self.lags.append(lag)
+                self.last_beat = now
+                if self._open_stall is not None:
+                    self._open_stall["blocked_ms"] = lag * 1e3
+                    self._open_stall = None
+
+    def _watchdog(self) -> None:
+        while not self.stop_event.wait(self.interval_s):
+            with self.lock:
+                overdue = time.perf_counter() - self.last_beat - self.interval_s
+                if overdue < self.threshold_s or self._open_stall is not None:
+                    continue
+                frame = sys._current_frames().get(self.loop_thread_id)
+                stall = {
+                    "datetime": datetime.now().isoformat(),
+                    "blocked_ms": overdue * 1e3,  # updated with the full duration once the loop resumes
+                    "stack": traceback.format_stack(frame) if frame is not None else [],
+                }
+                self.stalls.append(stall)
+                self._open_stall = stall
+            print(f"Event loop blocked > {self.threshold_s * 1e3:.0f} ms in: {stall['stack'][-1].strip() if stall['stack'] else '?'}")
+
+    def record_request(self, path: str, duration_s: float) -> None:
+        with self.lock:
+            self.endpoint_latencies.setdefault(path, deque(maxlen=ENDPOINT_SAMPLES_KEPT)).append(duration_s)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "threshold_ms": self.threshold_s * 1e3,
+                "loop_lag_ms": _percentiles_ms(list(self.lags)),
+                "stalls": list(self.stalls),
+                "endpoints_ms": {path: _percentiles_ms(list(d)) for path, d in self.endpoint_latencies.items()},
+            }
+
+
+loop_monitor = LoopLagMonitor()
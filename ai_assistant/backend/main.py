@@ -1,6 +1,8 @@
 import asyncio
-from typing import Any, Dict
-from fastapi import FastAPI
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import httpx
@@ -8,14 +10,40 @@ from dotenv import load_dotenv
 import os
 from pathlib import Path
 import sys
+import threading
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from ai_assistant.backend.realtime_relay import REALTIME_RELAY, RealtimeRelay
+from ai_assistant.backend.realtime_session import REALTIME_MODEL, SecretMintError, SessionSecretPool
 from ai_assistant.backend.robot_policies import POLICY_FUNCTIONS
-from ai_assistant.backend.vision_logger import save_image_and_analysis, save_master_log
-from ai_assistant.backend.camera_capture import capture_top_camera_image, release_camera
+from ai_assistant.backend.scene_analysis import (
+    SCENE_IMAGE_MAX_WIDTH,
+    SCENE_JPEG_QUALITY,
+    SCENE_VIEWS,
+    build_scene_request,
+    parse_scene_response,
+    parse_views,
+    validate_views,
+)
+from ai_assistant.backend.vision_logger import save_image_and_analysis, save_master_log, save_views_and_analysis
+from ai_assistant.backend.cells import JobCancelled, cell_scheduler
+from ai_assistant.backend.camera_capture import (
+    capture_top_camera_image,
+    encode_frame,
+    encode_jpeg,
+    read_camera_frame,
+    release_camera,
+)
+from ai_assistant.backend.loop_monitor import loop_monitor
+from ai_assistant.backend.production import PRODUCTION_STEP_RETRIES, ProductionRun, production_runs
+from ai_assistant.backend.profiling import profile_request, profile_run
+from ai_assistant.backend.robot_worker import ROBOT_WORKER, robot_worker_client
+from ai_assistant.backend.warmup import start_warmup, warmup_status
+from src.control.cancel import cancel_requested, current_cancel_token
+from src.tracing.spans import current_traceparent, export_span, span, trace_context
 
 # Load environment variables from project root
 env_path = project_root / ".env"
@@ -25,13 +53,14 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     print(" WARNING: OPENAI_API_KEY not found in .env")
 
-REALTIME_MODEL = "gpt-realtime-mini-2025-10-06"
 VISION_MODEL = "gpt-4o"
-OPENAI_API_BASE = "https://api.openai.com/v1"
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
 
 # Demo mode: True → ask once per full cycle; False → ask per step
 DEMO_MODE = True
 
+session_pool = SessionSecretPool(OPENAI_API_BASE, OPENAI_API_KEY, DEMO_MODE)
+
 app = FastAPI()
 app.add_middleware(
     CORSMiddleware,
@@ -48,24 +77,98 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global lock to prevent concurrent robot operations
-policy_lock = asyncio.Lock()
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    t0 = time.perf_counter()
+    if request.url.path == "/trace/spans":
+        return await call_next(request)
+    with (
+        trace_context(request.headers.get("traceparent")),
+        span(f"http {request.method} {request.url.path}"),
+        profile_request(f"{request.method} {request.url.path}"),
+    ):
+        response = await call_next(request)
+    loop_monitor.record_request(f"{request.method} {request.url.path}", time.perf_counter() - t0)
+    return response
 
 
 class PolicyRequest(BaseModel):
     policy_name: str
     params: Dict[str, Any] = {}
+    cell: Optional[str] = None  # None: the scheduler picks an idle cell
+    priority: int = 0  # higher runs first among jobs queued on a cell
+
+
+class WorkflowRequest(BaseModel):
+    steps: List[PolicyRequest]
+    cell: Optional[str] = None  # all steps run on one cell
+    priority: int = 0
+
+
+class SceneRequest(BaseModel):
+    views: Optional[Dict[str, str]] = None  # view → detail level ("low", "high", "auto"); default SCENE_VIEWS
+    prompt: Optional[str] = None
+    return_image: bool = False  # include the first view's JPEG, so the caller needs no separate capture
+
+
+class RelayRequest(BaseModel):
+    call_id: str  # realtime call id, from the Location header of the browser's /realtime/calls answer
+    drain: bool = False  # detach only: wait for running tool calls and return outputs that were not sent
+
+
+class PriorityRequest(BaseModel):
+    priority: int
+
+
+class ProductionRequest(BaseModel):
+    carrots: Optional[int] = None  # None: until the plate is empty or the operator stops
+    cell: Optional[str] = None
+    priority: int = 0
+    max_step_retries: Optional[int] = None
 
 
 @app.get("/")
 def read_root():
-    return {"status": "ok", "message": "GPT‑ACT Server running"}
+    return {"status": "ok", "message": "GPT‑ACT Server running", "warm": warmup_status["done"]}
+
+
+@app.get("/cells")
+async def cells_status():
+    # Per-cell queue, current job, utilization and throughput since startup
+    return cell_scheduler.stats()
+
+
+@app.get("/debug/perf")
+def debug_perf():
+    # Per-endpoint latency percentiles and event-loop stalls (with stack samples) since startup
+    return loop_monitor.stats()
+
+
+@app.post("/trace/spans")
+def ingest_spans(spans: List[Dict[str, Any]]):
+    # Spans recorded by the frontend (tool call, realtime response, HTTP hop), written alongside ours
+    for s in spans:
+        if {"trace_id", "span_id", "name", "start_ns", "end_ns"} <= s.keys():
+            export_span(s)
+    return {"status": "ok"}
+
+
+def _capture_image() -> str:
+    if ROBOT_WORKER == "process":
+        # The worker owns the camera; take the latest frame it published (RGB) from shared memory
+        _, frames, _ = robot_worker_client.latest_observation()
+        frame = frames.get("top")
+        if frame is None:
+            raise RuntimeError("No frame published by the robot worker yet")
+        return encode_frame(frame[:, :, ::-1].copy())
+    return capture_top_camera_image()
 
 
 @app.get("/camera/capture")
 async def capture_camera():
     try:
-        image_base64 = capture_top_camera_image()
+        image_base64 = _capture_image()
         return {"status": "success", "image": image_base64}
     except Exception as e:
         return {"status": "error", "message": f"Camera capture error: {e}"}
@@ -73,239 +176,23 @@ async def capture_camera():
 
 @app.post("/session")
 async def create_realtime_session():
-    tools = [
-        {
-            "type": "function",
-            "name": "capture_scene",
-            "description": (
-                "Capture an image from the robot's top camera to see the current state. "
-                "Use this whenever you need to see what's on the table, where objects are, "
-                "or to verify the result of a robot action. "
-                "In demo mode, set skip_analysis=true for fast capture without GPT-4o analysis."
-            ),
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "skip_analysis": {
-                        "type": "boolean",
-                        "description": "If true, skips GPT-4o analysis for faster capture (demo mode). Default: false",
-                        "default": False
-                    }
-                },
-                "required": []
-            },
-        },
-        {
-            "type": "function",
-            "name": "run_pick_and_place",
-            "description": (
-                "Run the pick and place policy on the SliceX robot. "
-                "Use this when carrots need to be moved from the plate to the cutting board. "
-                "This is typically the first step in the carrot cutting process."
-            ),
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "num_episodes": {"type": "integer", "default": 1, "description": "Number of times to run the policy"},
-                    "episode_time_s": {"type": "number", "default": 25, "description": "Maximum time per episode in seconds"},
-                    "task_description": {"type": "string", "description": "Optional custom task description"},
-                },
-                "required": [],
-            },
-        },
-        {
-            "type": "function",
-            "name": "run_use_slicer",
-            "description": (
-                "Run the slicer policy on the SliceX robot. "
-                "Use this to pick up the slicer from the stand and slice the carrot on the cutting board. "
-                "This is typically the second step, after a carrot has been placed on the cutting board."
-            ),
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "num_episodes": {"type": "integer", "default": 1},
-                    "episode_time_s": {"type": "number", "default": 35},
-                    "task_description": {"type": "string"},
-                },
-                "required": [],
-            },
-        },
-        {
-            "type": "function",
-            "name": "run_transfer_slices",
-            "description": (
-                "Run the transfer slices policy on the SliceX robot. "
-                "Use this to move sliced carrot pieces from the cutting board to the pile plate. "
-                "This is typically the third step, after a carrot has been sliced."
-            ),
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "num_episodes": {"type": "integer", "default": 1},
-                    "episode_time_s": {"type": "number", "default": 25},
-                    "task_description": {"type": "string"},
-                },
-                "required": [],
-            },
-        },
-    ]
-
-    if DEMO_MODE:
-        instructions = (
-            "You are SliceX Maximus, an autonomous voice assistant for a robotic carrot slicing system. "
-            "Your job is to execute the complete three-step workflow autonomously after getting initial confirmation.\n\n"
-            "**The Three-Step Workflow:**\n"
-            "1. **Pick and Place** (run_pick_and_place): Move carrot from plate to cutting board (~25 seconds)\n"
-            "2. **Use Slicer** (run_use_slicer): Pick slicer, slice the carrot, return tool (~35 seconds)\n"
-            "3. **Transfer Slices** (run_transfer_slices): Move sliced pieces to pile plate (~25 seconds)\n\n"
-            "**DEMO MODE - AUTONOMOUS EXECUTION:**\n\n"
-            "**Initial Confirmation (ask ONCE):**\n"
-            "- User: 'Slice a carrot' or 'Help me slice carrots'\n"
-            "- You: Call capture_scene with skip_analysis=true (fast), then say 'I see the workspace. Should I proceed with the full workflow?'\n"
-            "- User: 'Yes' or 'Go ahead'\n"
-            "- Now execute ALL THREE steps without asking again!\n\n"
-            "**Step 1 - Pick and Place:**\n"
-            "- Say: 'Starting pick and place, this will take 25 seconds...'\n"
-            "- Call run_pick_and_place\n"
-            "- WAIT silently for function to return (~25 seconds)\n"
-            "- Get response, then proceed immediately to Step 2\n\n"
-            "**Step 2 - Use Slicer:**\n"
-            "- Say: 'Pick and place complete! Now slicing the carrot, 35 seconds...'\n"
-            "- Call run_use_slicer\n"
-            "- WAIT silently for function to return (~35 seconds)\n"
-            "- Get response, then proceed immediately to Step 3\n\n"
-            "**Step 3 - Transfer Slices:**\n"
-            "- Say: 'Slicing done! Now transferring pieces, 25 seconds...'\n"
-            "- Call run_transfer_slices\n"
-            "- WAIT silently for function to return (~25 seconds)\n"
-            "- Get response, then verify completion\n\n"
-            "**After All Three Steps:**\n"
-            "- Call capture_scene with skip_analysis=true (fast) to verify\n"
-            "- Say: 'Perfect! One carrot fully sliced. Would you like me to do another?'\n"
-            "- WAIT for user confirmation before starting next cycle\n\n"
-            "**CRITICAL RULES:**\n\n"
-            "1. **Ask permission ONLY ONCE at the start of each carrot**\n"
-            "   - Do NOT ask before step 2 (slicing)\n"
-            "   - Do NOT ask before step 3 (transfer)\n"
-            "   - After initial 'yes', execute all three steps automatically\n\n"
-            "2. **ALWAYS wait for each function to complete**\n"
-            "   - Each function takes 25-40 seconds\n"
-            "   - Call function → BE SILENT and WAIT → Get response → Proceed to next step\n"
-            "   - NEVER call the next function until previous one returns\n\n"
-            "3. **Keep user informed between steps**\n"
-            "   - Announce what you're doing: 'Starting pick and place...'\n"
-            "   - Announce completion: 'Pick and place complete! Now slicing...'\n"
-            "   - But DO NOT ask for permission mid-workflow\n\n"
-            "4. **Handle errors and continue**\n"
-            "   - If error says 'motion may have completed', assume success and continue\n"
-            "   - Motor errors at END of motion mean task succeeded\n"
-            "   - Continue to next step in the workflow\n\n"
-            "**CORRECT DEMO EXECUTION:**\n"
-            "User: 'Slice a carrot'\n"
-            "You: [capture_scene(skip_analysis=true)] 'I see the workspace. Should I proceed with the full workflow?'\n"
-            "User: 'Yes'\n"
-            "You: 'Starting pick and place, 25 seconds...' [call run_pick_and_place] [WAIT 25s] [response received]\n"
-            "You: 'Complete! Now slicing, 35 seconds...' [call run_use_slicer] [WAIT 35s] [response received]\n"
-            "You: 'Done! Transferring pieces, 25 seconds...' [call run_transfer_slices] [WAIT 25s] [response received]\n"
-            "You: [capture_scene(skip_analysis=true)] 'Perfect! One carrot done. Another?'\n\n"
-            "**WRONG - DO NOT DO:**\n"
-            "❌ Asking 'Should I slice it now?' after pick and place (NO! Just do it!)\n"
-            "❌ Asking 'Should I transfer?' after slicing (NO! Just do it!)\n"
-            "❌ Calling next function before previous one returns\n"
-            "❌ Calling capture_scene while robot is moving\n"
-            "❌ Calling the same function multiple times\n\n"
-            "Remember: ONE confirmation per carrot, then FULL AUTONOMOUS execution of all three steps!"
-        )
-    else:
-        # Safe operation mode - ask before each action
-        instructions = (
-            "You are SliceX Maximus, a friendly voice assistant for a robotic carrot cutting system. "
-            "Your job is to help cut carrots through a three-step process:\n\n"
-            "1. **Pick and Place** (run_pick_and_place): Move whole carrots from the plate to the cutting board (~25 seconds)\n"
-            "2. **Use Slicer** (run_use_slicer): Pick up the slicer from the stand and slice the carrot (~35 seconds)\n"
-            "3. **Transfer Slices** (run_transfer_slices): Move the sliced pieces to the pile plate (~25 seconds)\n\n"
-            "You can see what's happening by calling capture_scene, which takes a photo from the overhead camera. "
-            "Use vision to understand the current state and decide what to do next.\n\n"
-            "**ABSOLUTELY CRITICAL RULES - YOU MUST FOLLOW THESE:**\n\n"
-            "1. **ALWAYS ask for user permission before running ANY robot policy**\n"
-            "   - NEVER call run_pick_and_place, run_use_slicer, or run_transfer_slices without explicit user confirmation\n"
-            "   - After seeing what needs to be done, ASK: 'Should I proceed with [action]?'\n"
-            "   - WAIT for the user to say 'yes', 'go ahead', 'do it', or similar confirmation\n"
-            "   - If the user says 'no' or 'wait', do NOT call the policy\n\n"
-            "2. **NEVER call more than ONE function at a time**\n"
-            "   - If you call run_pick_and_place, DO NOT call anything else until it returns\n"
-            "   - DO NOT call capture_scene while a robot policy is running\n"
-            "   - WAIT for the function response before doing anything else\n\n"
-            "3. **ALWAYS wait for function responses**\n"
-            "   - Each robot policy takes 25-40 SECONDS to execute\n"
-            "   - The function will NOT return until the robot COMPLETELY FINISHES\n"
-            "   - After calling a policy, tell the user you're waiting, then BE SILENT until the response arrives\n"
-            "   - Only speak again AFTER you receive the function response\n\n"
-            "4. **NEVER assume a task is done early**\n"
-            "   - DO NOT capture a scene until the policy function returns\n"
-            "   - DO NOT say 'the robot is moving' and then immediately call capture_scene\n"
-            "   - WAIT for the completion message before verifying\n\n"
-            "5. **Handle errors gracefully**\n"
-            "   - If you get an error that says 'motion may have completed', assume it DID complete\n"
-            "   - Motor disconnection errors at the END of a motion mean the task succeeded\n"
-            "   - Capture the scene to verify rather than retrying immediately\n\n"
-            "6. **Sequence of operations**\n"
-            "   - Capture scene → Decide action → ASK USER → Wait for 'yes' → Call policy → WAIT → Get response → Capture scene → Repeat\n"
-            "   - NEVER skip the asking step\n"
-            "   - NEVER skip the waiting step\n"
-            "   - NEVER call multiple policies in a row without waiting\n"
-            "   - NEVER call the same policy twice in a row\n\n"
-            "**CORRECT workflow:**\n"
-            "1. User: 'Help me slice carrots'\n"
-            "2. You: 'Sure! Let me see...' → Call capture_scene → WAIT for response\n"
-            "3. You: 'I see carrots on the plate. Should I move one to the cutting board?'\n"
-            "4. User: 'Yes, go ahead'\n"
-            "5. You: 'Moving it now, this will take 25 seconds...'\n"
-            "6. Call run_pick_and_place → WAIT (say nothing for 25 seconds) → Get response\n"
-            "7. You: 'Done! Let me check...' → Call capture_scene → WAIT for response\n"
-            "8. You: 'Perfect! Carrot is on the board. Should I slice it now?'\n"
-            "9. User: 'Yes'\n"
-            "10. You: 'Slicing now, this will take 35 seconds...'\n"
-            "11. Call run_use_slicer → WAIT (say nothing for 35 seconds) → Get response\n"
-            "12. You: 'Slicing complete! Let me verify...' → Call capture_scene → WAIT for response\n"
-            "13. And so on...\n\n"
-            "**WRONG workflow (DO NOT DO THIS):**\n"
-            "❌ Calling robot policies without asking the user first\n"
-            "❌ Calling run_pick_and_place then immediately calling capture_scene\n"
-            "❌ Calling multiple functions at once (run_use_slicer twice, etc.)\n"
-            "❌ Calling the same function multiple times\n"
-            "❌ Talking about what the robot 'is doing' while also calling other functions\n"
-            "❌ Not waiting for function responses\n\n"
-            "Remember: ASK FIRST. ONE function at a time. ALWAYS wait for the response. Be patient!"
-        )
+    # The session config is prebuilt and the secret usually comes from the pool (see realtime_session.py)
+    try:
+        ephemeral_key = await session_pool.get()
+    except SecretMintError as e:
+        return {"error": e.text, "status_code": e.status_code}
+    return {"ephemeral_key": ephemeral_key, "model": REALTIME_MODEL}
 
-    session_config = {
-        "session": {
-            "type": "realtime",
-            "model": REALTIME_MODEL,
-            "audio": {"output": {"voice": "alloy"}},
-            "instructions": instructions,
-            "tools": tools,
-        }
-    }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            f"{OPENAI_API_BASE}/realtime/client_secrets",
-            headers={"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"},
-            json=session_config,
-        )
-    if r.status_code != 200:
-        return {"error": r.text, "status_code": r.status_code}
-    data = r.json()
-    return {"ephemeral_key": data.get("value", ""), "model": REALTIME_MODEL}
+@app.get("/session/pool")
+async def session_pool_status():
+    return session_pool.stats()
 
 
 @app.post("/analyze_image")
 async def analyze_image(request: Dict[str, Any]):
     try:
-        image_base64 = request.get("image") or capture_top_camera_image()
+        image_base64 = request.get("image") or _capture_image()
         async with httpx.AsyncClient(timeout=30.0) as client:
             r = await client.post(
                 f"{OPENAI_API_BASE}/chat/completions",
@@ -334,27 +221,299 @@ async def analyze_image(request: Dict[str, Any]):
         return {"status": "error", "message": str(e)}
 
 
+def _read_view(view: str):
+    # BGR frame of one camera view. A follower held between skills owns its cameras, so read
+    # through it instead of opening the device a second time.
+    from src.hardware.connect import held_robot
+
+    robot = held_robot()
+    if robot is not None and view in robot.cameras:
+        return robot.cameras[view].async_read()[:, :, ::-1].copy()
+    return read_camera_frame(view)
+
+
+@app.post("/analyze_scene")
+async def analyze_scene(req: SceneRequest = SceneRequest()):
+    # Top and wrist views captured together and analysed in one upstream call with a structured answer
+    t0 = time.perf_counter()
+    try:
+        views = req.views or parse_views(SCENE_VIEWS)
+        validate_views(views)
+        if ROBOT_WORKER == "process":
+            # The worker publishes every camera it owns (RGB); a view it has no frame for is an error
+            _, published, _ = robot_worker_client.latest_observation()
+            missing = [view for view in views if view not in published]
+            if missing:
+                raise RuntimeError(f"No frame published by the robot worker yet for {', '.join(missing)}")
+            frames = [published[view][:, :, ::-1].copy() for view in views]
+        else:
+            frames = await asyncio.gather(*(asyncio.to_thread(_read_view, view) for view in views))
+        encoded = await asyncio.to_thread(
+            lambda: [encode_jpeg(frame, SCENE_IMAGE_MAX_WIDTH, SCENE_JPEG_QUALITY) for frame in frames]
+        )
+        images = dict(zip(views, encoded))
+        t_captured = time.perf_counter()
+        with span("vision.analyze_scene", views=list(views)):
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                r = await client.post(
+                    f"{OPENAI_API_BASE}/chat/completions",
+                    headers={"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"},
+                    json=build_scene_request(VISION_MODEL, images, views, req.prompt),
+                )
+        t_answered = time.perf_counter()
+        if r.status_code != 200:
+            return {"status": "error", "message": r.text}
+        data = r.json()
+        result = {
+            "status": "success",
+            "analysis": parse_scene_response(data),
+            "views": views,
+            "latency_ms": {
+                "capture": (t_captured - t0) * 1e3,
+                "upstream": (t_answered - t_captured) * 1e3,
+                "total": (time.perf_counter() - t0) * 1e3,
+            },
+            "usage": data.get("usage", {}),
+            "model": data.get("model", VISION_MODEL),
+        }
+        result["timestamp"] = await asyncio.to_thread(save_views_and_analysis, images, result)
+        if req.return_image:
+            result["image"] = encoded[0]
+        return result
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def _run_skill(policy_name: str, params: Dict[str, Any], cell: str):
+    # Runs on a scheduler thread, inside the submitting request's trace context
+    if ROBOT_WORKER == "process":
+        # The worker runs the skill (and its span / profile); this process only waits for the reply.
+        # Cancelling the job raises the abort flag the worker checks every control tick.
+        current_cancel_token().on_cancel(robot_worker_client.abort)
+        reply = robot_worker_client.run_skill(policy_name, params, current_traceparent())
+        if reply["status"] == "error":
+            raise RuntimeError(reply["message"])
+        return reply["result"]
+    with span(f"skill {policy_name}", params=params, cell=cell), profile_run("skills", policy_name):
+        return POLICY_FUNCTIONS[policy_name](**{**params, "cell": cell})
+
+
 @app.post("/robot/run_policy")
 async def run_policy(req: PolicyRequest):
-    func = POLICY_FUNCTIONS.get(req.policy_name)
-    if not func:
+    if req.policy_name not in POLICY_FUNCTIONS:
         return {"status": "error", "message": f"Unknown policy {req.policy_name}"}
 
-    # Acquire lock to prevent concurrent robot operations
-    async with policy_lock:
-        def _call():
-            return func(**req.params)
+    # Queued on one cell; jobs on the same cell never overlap
+    try:
+        cell, result = await cell_scheduler.submit(
+            req.policy_name, lambda cell: _run_skill(req.policy_name, req.params, cell), req.cell, req.priority
+        )
+        return {"status": "completed", "policy": req.policy_name, "cell": cell, "result": result}
+    except JobCancelled as e:
+        return {"status": "cancelled", "message": str(e)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+@app.post("/robot/run_workflow")
+async def run_workflow(req: WorkflowRequest):
+    # Several skills back to back on the same cell, e.g. pick and place → slice → transfer
+    unknown = [step.policy_name for step in req.steps if step.policy_name not in POLICY_FUNCTIONS]
+    if unknown:
+        return {"status": "error", "message": f"Unknown policies {unknown}"}
+
+    def _run_steps(cell: str):
+        results = []
+        if ROBOT_WORKER == "process":
+            session = nullcontext()
+        else:
+            from src.hardware.connect import robot_session
+
+            # The arm stays connected between steps and blends straight into the next skill's start pose
+            session = robot_session(cell)
+        with session:
+            for step in req.steps:
+                if cancel_requested():
+                    break
+                results.append(_run_skill(step.policy_name, step.params, cell))
+        return results
+
+    label = " → ".join(step.policy_name for step in req.steps)
+    try:
+        cell, results = await cell_scheduler.submit(label, _run_steps, req.cell, req.priority)
+        return {"status": "completed", "cell": cell, "results": results}
+    except JobCancelled as e:
+        return {"status": "cancelled", "message": str(e)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def _relay_capture_scene(args: Dict[str, Any]) -> Dict[str, Any]:
+    if args.get("skip_analysis") is True:
+        await asyncio.to_thread(_capture_image)
+        return {"status": "success", "message": "Image captured"}
+    return await analyze_scene()
+
+
+def _relay_skill(policy_name: str):
+    async def run(args: Dict[str, Any]) -> Dict[str, Any]:
+        return await run_policy(PolicyRequest(policy_name=policy_name, params=args))
+
+    return run
+
+
+# Answers tool calls on the realtime session's sideband connection (see realtime_relay.py)
+realtime_relay = RealtimeRelay(
+    OPENAI_API_BASE,
+    OPENAI_API_KEY,
+    {"capture_scene": _relay_capture_scene, **{name: _relay_skill(name) for name in POLICY_FUNCTIONS}},
+)
+
+
+@app.post("/realtime/attach")
+async def attach_realtime_relay(req: RelayRequest):
+    # The browser calls this once its WebRTC call is up; "attached" (sideband socket connected)
+    # means it must not run tools itself. On any other answer it keeps answering them.
+    if not REALTIME_RELAY:
+        return {"status": "disabled"}
+    call = await realtime_relay.attach(req.call_id)
+    if call["state"] != "connected":
+        await realtime_relay.detach(req.call_id)
+        return {"status": "error", "message": f"Sideband connection failed ({call['state']})", "call": call}
+    return {"status": "attached", "call": call}
+
+
+@app.post("/realtime/detach")
+async def detach_realtime_relay(req: RelayRequest):
+    return {"status": "ok", **await realtime_relay.detach(req.call_id, drain=req.drain)}
+
+
+@app.get("/realtime/relay")
+async def realtime_relay_status():
+    return realtime_relay.stats()
+
+
+@app.get("/realtime/relay/{call_id}")
+async def realtime_relay_call_status(call_id: str):
+    # Polled by the browser while the relay answers its tool calls; any state other than
+    # "connected" makes it detach (drain) and take the tool calls back
+    return realtime_relay.call_info(call_id)
+
+
+# asyncio tasks awaiting each production run's scheduler job, by run id
+_production_tasks = {}
 
-        try:
-            result = await asyncio.to_thread(_call)
-            return {"status": "completed", "policy": req.policy_name, "result": result}
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
+
+def _top_frame(cell: str):
+    # Latest top camera frame (RGB) for the plate check between cycles
+    if ROBOT_WORKER == "process":
+        _, frames, _ = robot_worker_client.latest_observation()
+        return frames.get("top")
+    from src.hardware.connect import held_robot
+
+    robot = held_robot(cell)
+    return None if robot is None else robot.get_observation().get("top")
+
+
+@app.post("/production/start")
+async def start_production(req: ProductionRequest):
+    # Loops pick and place → slice → transfer on one cell as a single job, so the arm stays
+    # connected and no other job interleaves; returns at once, progress is on GET /production
+    retries = PRODUCTION_STEP_RETRIES if req.max_step_retries is None else req.max_step_retries
+    run = ProductionRun(req.carrots, retries)
+    production_runs[run.id] = run
+
+    def _run_production(cell: str):
+        if ROBOT_WORKER == "process":
+            session = nullcontext()
+        else:
+            from src.hardware.connect import robot_session
+
+            session = robot_session(cell)
+        with session:
+            return run.run(cell, lambda step, cell: _run_skill(step, {}, cell), _top_frame)
+
+    task = asyncio.create_task(cell_scheduler.submit(f"production {run.id}", _run_production, req.cell, req.priority))
+
+    def _done(_):
+        _production_tasks.pop(run.id, None)
+        if run.state == "queued":  # dropped before it reached the cell
+            run.state, run.stop_reason = "stopped", "operator stop"
+
+    task.add_done_callback(_done)
+    _production_tasks[run.id] = task
+    return {"status": "started", "run": run.summary()}
+
+
+@app.post("/production/{run_id}/stop")
+async def stop_production(run_id: str, now: bool = False):
+    # Default: stop after the current carrot is transferred. now: cancel the running skill
+    # (or drop the run if still queued) at the next control tick.
+    run = production_runs.get(run_id)
+    if run is None:
+        return {"status": "error", "message": f"Unknown production run {run_id}"}
+    run.stop_after_cycle = True
+    task = _production_tasks.get(run_id)
+    if now and task is not None:
+        task.cancel()
+    return {"status": "ok", "run": run.summary()}
+
+
+@app.get("/production")
+async def production_status():
+    # Live carrots/hour, per-step mean times and failure counts, latest run first
+    return {"runs": [run.summary() for run in reversed(production_runs.values())]}
+
+
+@app.get("/jobs")
+async def list_jobs():
+    # Running jobs first, then each cell's queue in run order
+    return {"jobs": cell_scheduler.list_jobs()}
+
+
+@app.post("/jobs/{job_id}/priority")
+async def set_job_priority(job_id: str, req: PriorityRequest):
+    try:
+        return {"status": "ok", "job": cell_scheduler.reprioritize(job_id, req.priority)}
+    except (KeyError, ValueError) as e:
+        return {"status": "error", "message": str(e.args[0])}
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    # Drops a queued job, or stops a running one at its next control tick
+    try:
+        return {"status": "ok", "job": cell_scheduler.cancel(job_id)}
+    except KeyError as e:
+        return {"status": "error", "message": str(e.args[0])}
+
+
+@app.post("/robot/abort")
+async def abort_policy(cell: Optional[str] = None):
+    # Cancels whatever is running (on one cell, or on all of them); queued jobs stay queued
+    return {"status": "ok", "jobs": cell_scheduler.cancel_running(cell, "aborted")}
+
+
+@app.on_event("startup")
+async def startup_event():
+    loop_monitor.start()
+    session_pool.start()
+    start_warmup()
+    cell_scheduler.start()
+    if ROBOT_WORKER == "process":
+        threading.Thread(target=robot_worker_client.start, name="robot_worker_start", daemon=True).start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    release_camera()
+    loop_monitor.stop()
+    await session_pool.stop()
+    await realtime_relay.stop()
+    cell_scheduler.stop()
+    if ROBOT_WORKER == "process":
+        robot_worker_client.shutdown()
+    else:
+        release_camera()
 
 
 if __name__ == "__main__":
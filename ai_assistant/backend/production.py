@@ -0,0 +1,160 @@
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+from ai_assistant.backend.vision_logger import LOGS_DIR
+from src.control.cancel import cancel_requested
+from src.tracing.spans import span
+
+# Production mode: the three-skill workflow repeated on one cell until a stop condition
+# (target carrot count, plate empty, operator stop or a step that keeps failing), with the arm
+# kept connected and the policies loaded for the whole run.
+PRODUCTION_STEPS = ["run_pick_and_place", "run_use_slicer", "run_transfer_slices"]
+PRODUCTION_STEP_RETRIES = int(os.getenv("PRODUCTION_STEP_RETRIES", "1"))
+PRODUCTION_DIR = LOGS_DIR.parent / "production"
+# Local plate check on the top camera: region of the plate as fractions of the frame,
+# "x0,y0,x1,y1" (empty disables the check), and the share of carrot-orange pixels in it
+# below which the plate counts as empty.
+PLATE_ROI = os.getenv("PLATE_ROI", "")
+PLATE_EMPTY_MAX_FRACTION = float(os.getenv("PLATE_EMPTY_MAX_FRACTION", "0.01"))
+CARROT_HSV_LOW = (5, 120, 90)
+CARROT_HSV_HIGH = (25, 255, 255)
+
+
+def carrot_fraction(frame_rgb) -> float | None:
+    # Share of carrot-coloured pixels inside PLATE_ROI, or None when no ROI is configured
+    if not PLATE_ROI:
+        return None
+    import cv2
+
+    x0, y0, x1, y1 = (float(v) for v in PLATE_ROI.split(","))
+    height, width = frame_rgb.shape[:2]
+    roi = frame_rgb[int(y0 * height) : int(y1 * height), int(x0 * width) : int(x1 * width)]
+    mask = cv2.inRange(cv2.cvtColor(roi, cv2.COLOR_RGB2HSV), CARROT_HSV_LOW, CARROT_HSV_HIGH)
+    return cv2.countNonZero(mask) / max(1, mask.size)
+
+
+class ProductionRun:
+    def __init__(self, target_carrots: int | None = None, step_retries: int = PRODUCTION_STEP_RETRIES):
+        self.id = uuid.uuid4().hex[:8]
+        self.target_carrots = target_carrots
+        self.step_retries = step_retries
+        self.cell = None
+        self.state = "queued"
+        self.stop_after_cycle = False
+        self.stop_reason = None
+        self.started_at = None
+        self.ended_at = None
+        self.carrots = 0
+        self.cycles = []
+        self.step_seconds = {step: [] for step in PRODUCTION_STEPS}
+        self.step_failures = {step: 0 for step in PRODUCTION_STEPS}
+        self.plate_fraction = None
+
+    def _elapsed_s(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.ended_at or time.time()) - self.started_at
+
+    def summary(self) -> dict:
+        elapsed = self._elapsed_s()
+        return {
+            "id": self.id,
+            "cell": self.cell,
+            "state": self.state,
+            "stop_reason": self.stop_reason,
+            "target_carrots": self.target_carrots,
+            "carrots": self.carrots,
+            "elapsed_s": elapsed,
+            "carrots_per_hour": self.carrots * 3600 / elapsed if elapsed else 0.0,
+            "mean_cycle_s": sum(c["seconds"] for c in self.cycles if c["completed"]) / self.carrots if self.carrots else None,
+            "step_mean_s": {s: sum(t) / len(t) if t else None for s, t in self.step_seconds.items()},
+            "step_failures": self.step_failures,
+            "plate_carrot_fraction": self.plate_fraction,
+        }
+
+    def save(self) -> None:
+        # Rewritten after every cycle, so a crash leaves the run record up to the last carrot
+        PRODUCTION_DIR.mkdir(parents=True, exist_ok=True)
+        started = datetime.fromtimestamp(self.started_at or time.time()).strftime("%Y%m%d_%H%M%S")
+        path = PRODUCTION_DIR / f"run_{started}_{self.id}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({**self.summary(), "cycles": self.cycles}, indent=2))
+        tmp.replace(path)
+
+    def _stop(self, reason: str, state: str = "stopped") -> None:
+        self.stop_reason = reason
+        self.state = state
+
+    def run(self, cell: str, run_step, top_frame) -> dict:
+        # Runs on the cell's scheduler thread, as one job. run_step(policy_name, cell) returns the
+        # skill's result string; top_frame(cell) returns the latest top camera frame (RGB) or None.
+        self.cell, self.state, self.started_at = cell, "running", time.time()
+        try:
+            while self.stop_reason is None:
+                self._cycle(cell, run_step)
+                if self.stop_reason is not None:
+                    break
+                if self.target_carrots is not None and self.carrots >= self.target_carrots:
+                    self._stop("target reached")
+                elif self.stop_after_cycle:
+                    self._stop("operator stop")
+                elif self._plate_empty(cell, top_frame):
+                    self._stop("plate empty")
+        finally:
+            if self.stop_reason is None:
+                self._stop("error", "failed")
+            self.ended_at = time.time()
+            self.save()
+        return self.summary()
+
+    def _cycle(self, cell: str, run_step) -> None:
+        cycle = {"index": len(self.cycles), "steps": [], "completed": False}
+        self.cycles.append(cycle)
+        t0 = time.perf_counter()
+        with span("production.cycle", run_id=self.id, cycle=cycle["index"]):
+            for step in PRODUCTION_STEPS:
+                if not self._run_step(step, cell, run_step, cycle):
+                    break
+            else:
+                cycle["completed"] = True
+                self.carrots += 1
+        cycle["seconds"] = time.perf_counter() - t0
+        self.save()
+
+    def _run_step(self, step: str, cell: str, run_step, cycle: dict) -> bool:
+        for attempt in range(1 + self.step_retries):
+            if cancel_requested():
+                self._stop("operator stop")
+                return False
+            t0 = time.perf_counter()
+            try:
+                result = str(run_step(step, cell))
+            except Exception as e:
+                result = f"ERROR: {e}"
+            seconds = time.perf_counter() - t0
+            ok = not result.startswith("ERROR") and not cancel_requested()
+            cycle["steps"].append({"step": step, "attempt": attempt, "seconds": seconds, "ok": ok, "result": result})
+            if ok:
+                self.step_seconds[step].append(seconds)
+                return True
+            if cancel_requested():
+                self._stop("operator stop")
+                return False
+            self.step_failures[step] += 1
+        self._stop(f"{step} failed {1 + self.step_retries} times", "failed")
+        return False
+
+    def _plate_empty(self, cell: str, top_frame) -> bool:
+        if not PLATE_ROI:
+            return False
+        frame = top_frame(cell)
+        if frame is None:
+            return False
+        self.plate_fraction = carrot_fraction(frame)
+        return self.plate_fraction < PLATE_EMPTY_MAX_FRACTION
+
+
+production_runs = {}
@@ -0,0 +1,119 @@
+import cProfile
+import os
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from ai_assistant.backend.vision_logger import LOGS_DIR
+
+# off: no overhead. cprofile: deterministic, stdlib, writes .prof (snakeviz, flameprof, gprof2dot).
+# pyinstrument: sampling (lower overhead, async aware), writes speedscope JSON; needs `pip install pyinstrument`.
+PROFILE_MODE = os.getenv("PROFILE_MODE", "off")
+PROFILE_TARGETS = set(os.getenv("PROFILE_TARGETS", "skills").split(","))  # skills, endpoints
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_S", "0.001"))  # pyinstrument sampling interval
+PROFILES_DIR = LOGS_DIR.parent / "profiles"
+
+_active = threading.local()
+_requests_in_flight = 0  # only touched on the event loop thread
+
+
+def profiling_enabled(target: str) -> bool:
+    return PROFILE_MODE != "off" and target in PROFILE_TARGETS
+
+
+def _prune(keep: int) -> None:
+    profiles = sorted(PROFILES_DIR.glob("*_*"), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:-keep] if keep > 0 else []:
+        old.unlink(missing_ok=True)
+
+
+def _start(mode: str):
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+
+            profiler = Profiler(interval=PROFILE_INTERVAL_S, async_mode="enabled")
+            profiler.start()
+            return profiler
+        except ImportError:
+            print("PROFILE_MODE=pyinstrument but pyinstrument is not installed; using cProfile")
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _stop(profiler) -> None:
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    else:
+        profiler.stop()
+
+
+def _save(profiler, stem: str):
+    if isinstance(profiler, cProfile.Profile):
+        path = PROFILES_DIR / f"{stem}.prof"
+        profiler.dump_stats(path)
+        return path
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    path = PROFILES_DIR / f"{stem}.speedscope.json"
+    path.write_text(profiler.output(renderer=SpeedscopeRenderer()))
+    return path
+
+
+@contextmanager
+def profile_run(target: str, name: str):
+    # Profiles the enclosed block and writes <target>_<name>_<timestamp>_<run id> into PROFILES_DIR,
+    # keeping the newest PROFILE_KEEP files. Yields the run id (None when not profiling).
+    # Both profilers allow one active session per thread; a nested block runs unprofiled.
+    if not profiling_enabled(target) or getattr(_active, "profiling", False):
+        yield None
+        return
+    _active.profiling = True
+    _active.discard = False
+    try:
+        profiler = _start(PROFILE_MODE)
+    except (ValueError, RuntimeError):
+        _active.profiling = False
+        yield None
+        return
+    run_id = uuid.uuid4().hex[:8]
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = f"{target}_{re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-') or 'root'}_{ts}_{run_id}"
+    try:
+        yield run_id
+    finally:
+        _active.profiling = False
+        _stop(profiler)
+        if _active.discard:
+            print(f"Profile {stem} discarded: another request overlapped it")
+        else:
+            PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+            path = _save(profiler, stem)
+            _prune(PROFILE_KEEP)
+            print(f"Profile written: {path}")
+
+
+@contextmanager
+def profile_request(name: str):
+    # Endpoint profiles run on the event loop thread around `await call_next()`, so the profiler
+    # sees every coroutine the loop runs meanwhile, not only this request's. A request is only
+    # profiled when it starts with no other request in flight, and its profile is discarded if
+    # another request starts before it finishes; under concurrent load, profile skills instead.
+    global _requests_in_flight
+    if not profiling_enabled("endpoints"):
+        yield None
+        return
+    _requests_in_flight += 1
+    try:
+        if _requests_in_flight > 1:
+            _active.discard = True  # the profile in progress (if any) would include this request
+            yield None
+        else:
+            with profile_run("endpoints", name) as run_id:
+                yield run_id
+    finally:
+        _requests_in_flight -= 1
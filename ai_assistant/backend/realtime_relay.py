@@ -0,0 +1,191 @@
+import asyncio
+import contextvars
+import json
+import os
+import time
+
+from src.tracing.spans import span
+
+# REALTIME_RELAY=1: once the browser has opened its WebRTC call it hands the call id to the
+# backend, which joins the same realtime session over a server-side WebSocket (the "sideband"
+# connection) and answers the model's tool calls itself. The browser keeps audio and display only,
+# so a stalled or throttled tab no longer delays robot actions.
+REALTIME_RELAY = os.getenv("REALTIME_RELAY", "1") == "1"
+RELAY_RECONNECT_S = 1.0
+RELAY_MAX_RECONNECTS = 3
+# How long /realtime/attach waits for the sideband socket before telling the browser to answer
+# tool calls itself
+RELAY_CONNECT_TIMEOUT_S = float(os.getenv("RELAY_CONNECT_TIMEOUT_S", "5"))
+
+
+def sideband_url(api_base: str, call_id: str) -> str:
+    # https://api.openai.com/v1 → wss://api.openai.com/v1/realtime?call_id=...
+    return f"{api_base.replace('https://', 'wss://', 1).replace('http://', 'ws://', 1)}/realtime?call_id={call_id}"
+
+
+class RealtimeRelay:
+    # handlers: tool name → async fn(args) returning the JSON-serializable function output
+
+    def __init__(self, api_base: str, api_key: str, handlers: dict):
+        self.api_base = api_base
+        self.api_key = api_key
+        self.handlers = handlers
+        self.calls = {}  # realtime call id → {"task", "socket", "ready", "tool_calls", "handled", "running", ...}
+        self.tool_calls = 0
+        self.tool_failures = 0
+        self.undelivered = 0
+
+    async def attach(self, call_id: str, timeout_s: float = RELAY_CONNECT_TIMEOUT_S) -> dict:
+        # Returns once the sideband socket is connected, has failed for good, or timeout_s passed;
+        # the caller checks state == "connected" before leaving tool calls to the backend.
+        call = self.calls.get(call_id)
+        if call is None or call["task"].done():
+            call = {
+                "socket": None,
+                "ready": asyncio.Event(),  # set on the first connect, or when _run ends
+                "tool_calls": 0,
+                "handled": set(),
+                "running": set(),
+                "undelivered": [],
+                "started_at": time.time(),
+                "state": "connecting",
+            }
+            # Started from a fresh context: tool calls begin their own traces, not the attach request's
+            call["task"] = contextvars.Context().run(asyncio.get_running_loop().create_task, self._run(call_id, call))
+            # _run ended (gave up, call closed or crashed): attach stops waiting; state keeps the reason
+            call["task"].add_done_callback(lambda _: call["ready"].set())
+            self.calls[call_id] = call
+        try:
+            await asyncio.wait_for(call["ready"].wait(), timeout_s)
+        except asyncio.TimeoutError:
+            call["state"] = f"error: not connected after {timeout_s:g}s"
+        return self._info(call_id, call)
+
+    async def detach(self, call_id: str, drain: bool = False) -> dict:
+        # drain: wait for the tool calls still running. Returns the ids of the tool calls the backend
+        # took and every output it could not send ([{"call_id", "output"}]), so the browser knows
+        # which calls are still unanswered when it takes over.
+        call = self.calls.pop(call_id, None)
+        if call is None:
+            return {"handled": [], "undelivered": []}
+        call["task"].cancel()
+        try:
+            await call["task"]
+        except asyncio.CancelledError:
+            pass
+        if drain and call["running"]:
+            await asyncio.gather(*call["running"], return_exceptions=True)
+        return {"handled": sorted(call["handled"]), "undelivered": call["undelivered"]}
+
+    async def stop(self) -> None:
+        for call_id in list(self.calls):
+            await self.detach(call_id)
+
+    async def _run(self, call_id: str, call: dict) -> None:
+        import websockets
+        from websockets.asyncio.client import connect
+
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        for _ in range(1 + RELAY_MAX_RECONNECTS):
+            try:
+                async with connect(sideband_url(self.api_base, call_id), additional_headers=headers) as ws:
+                    call["socket"], call["state"] = ws, "connected"
+                    call["ready"].set()
+                    print(f"✓ Realtime relay attached to {call_id}")
+                    async for message in ws:
+                        self._on_event(call, json.loads(message))
+                call["state"] = "closed"  # the call ended
+                return
+            except websockets.ConnectionClosedOK:
+                call["state"] = "closed"
+                return
+            except (OSError, websockets.WebSocketException) as e:
+                call["state"] = f"error: {e}"
+                print(f"⚠️  Realtime relay for {call_id}: {e}")
+                await asyncio.sleep(RELAY_RECONNECT_S)
+            finally:
+                call["socket"] = None
+
+    def _on_event(self, call: dict, event: dict) -> None:
+        # Function calls show up both as response.function_call_arguments.done and inside
+        # response.done; call_id dedupes them
+        if event.get("type") == "response.function_call_arguments.done":
+            items = [event]
+        elif event.get("type") == "response.done":
+            items = [o for o in event.get("response", {}).get("output", []) if o.get("type") == "function_call"]
+        else:
+            return
+        for item in items:
+            if item.get("call_id") in call["handled"]:
+                continue
+            call["handled"].add(item["call_id"])
+            # Own task (and trace) per tool call, so events keep being read while a skill runs
+            task = asyncio.get_running_loop().create_task(self._tool_call(call, item))
+            call["running"].add(task)
+            task.add_done_callback(call["running"].discard)
+
+    async def _tool_call(self, call: dict, item: dict) -> None:
+        name = item.get("name")
+        try:
+            args = json.loads(item.get("arguments") or "{}")
+        except json.JSONDecodeError:
+            args = {}
+        self.tool_calls += 1
+        call["tool_calls"] += 1
+        with span(f"tool_call {name}", call_id=item["call_id"], relay="backend"):
+            handler = self.handlers.get(name)
+            if handler is None:
+                output = {"status": "error", "message": f"Unknown tool {name}"}
+            else:
+                try:
+                    output = await handler(args)
+                except Exception as e:
+                    output = {"status": "error", "message": str(e)}
+            if output.get("status") == "error":
+                self.tool_failures += 1
+            delivered = await self._send(call, {
+                "type": "conversation.item.create",
+                "item": {"type": "function_call_output", "call_id": item["call_id"], "output": json.dumps(output)},
+            })
+            if not delivered:
+                # Kept for the browser, which sends it once it takes the tool calls back (detach with drain)
+                call["undelivered"].append({"call_id": item["call_id"], "output": json.dumps(output)})
+                self.undelivered += 1
+                return
+            await self._send(call, {"type": "response.create"})
+
+    async def _send(self, call: dict, event: dict) -> bool:
+        ws = call["socket"]
+        if ws is None:
+            print(f"⚠️  Realtime relay: connection gone, could not send {event['type']}")
+            return False
+        try:
+            await ws.send(json.dumps(event))
+        except Exception as e:
+            print(f"⚠️  Realtime relay: could not send {event['type']}: {e}")
+            return False
+        return True
+
+    def call_info(self, call_id: str) -> dict:
+        call = self.calls.get(call_id)
+        if call is None:
+            return {"call_id": call_id, "state": "detached"}
+        return self._info(call_id, call)
+
+    def _info(self, call_id: str, call: dict) -> dict:
+        return {
+            "call_id": call_id,
+            "state": call["state"],
+            "tool_calls": call["tool_calls"],
+            "undelivered": len(call["undelivered"]),
+            "attached_s": time.time() - call["started_at"],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "enabled": REALTIME_RELAY,
+            "tool_calls": self.tool_calls,
+            "tool_failures": self.tool_failures,
+            "undelivered": self.undelivered,
+            "calls": [self._info(call_id, call) for call_id, call in self.calls.items()],
+        }
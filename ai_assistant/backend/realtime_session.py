@@ -0,0 +1,367 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+
+import httpx
+
+REALTIME_MODEL = "gpt-realtime-mini-2025-10-06"
+# Ephemeral client secrets are minted ahead of time, per session mode, so POST /session hands
+# one out without a round trip to OpenAI. A pooled secret is dropped REALTIME_SECRET_REFRESH_MARGIN_S
+# before it expires (the browser still needs time to open its connection) and a new one minted.
+REALTIME_SECRET_POOL_SIZE = int(os.getenv("REALTIME_SECRET_POOL_SIZE", "2"))
+REALTIME_SECRET_TTL_S = int(os.getenv("REALTIME_SECRET_TTL_S", "600"))
+REALTIME_SECRET_REFRESH_MARGIN_S = float(os.getenv("REALTIME_SECRET_REFRESH_MARGIN_S", "120"))
+MINT_RETRY_S = 5.0
+
+REALTIME_TOOLS = [
+    {
+        "type": "function",
+        "name": "capture_scene",
+        "description": (
+            "Capture an image from the robot's top camera to see the current state. "
+            "Use this whenever you need to see what's on the table, where objects are, "
+            "or to verify the result of a robot action. "
+            "Without skip_analysis, the overhead and wrist views are analysed together and you get "
+            "scene_state, next_step and confidence. "
+            "In demo mode, set skip_analysis=true for fast capture without GPT-4o analysis."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "skip_analysis": {
+                    "type": "boolean",
+                    "description": "If true, skips GPT-4o analysis for faster capture (demo mode). Default: false",
+                    "default": False
+                }
+            },
+            "required": []
+        },
+    },
+    {
+        "type": "function",
+        "name": "run_pick_and_place",
+        "description": (
+            "Run the pick and place policy on the SliceX robot. "
+            "Use this when carrots need to be moved from the plate to the cutting board. "
+            "This is typically the first step in the carrot cutting process."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "num_episodes": {"type": "integer", "default": 1, "description": "Number of times to run the policy"},
+                "episode_time_s": {"type": "number", "default": 25, "description": "Maximum time per episode in seconds"},
+                "task_description": {"type": "string", "description": "Optional custom task description"},
+            },
+            "required": [],
+        },
+    },
+    {
+        "type": "function",
+        "name": "run_use_slicer",
+        "description": (
+            "Run the slicer policy on the SliceX robot. "
+            "Use this to pick up the slicer from the stand and slice the carrot on the cutting board. "
+            "This is typically the second step, after a carrot has been placed on the cutting board."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "num_episodes": {"type": "integer", "default": 1},
+                "episode_time_s": {"type": "number", "default": 35},
+                "task_description": {"type": "string"},
+            },
+            "required": [],
+        },
+    },
+    {
+        "type": "function",
+        "name": "run_transfer_slices",
+        "description": (
+            "Run the transfer slices policy on the SliceX robot. "
+            "Use this to move sliced carrot pieces from the cutting board to the pile plate. "
+            "This is typically the third step, after a carrot has been sliced."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "num_episodes": {"type": "integer", "default": 1},
+                "episode_time_s": {"type": "number", "default": 25},
+                "task_description": {"type": "string"},
+            },
+            "required": [],
+        },
+    },
+]
+
+DEMO_INSTRUCTIONS = (
+    "You are SliceX Maximus, an autonomous voice assistant for a robotic carrot slicing system. "
+    "Your job is to execute the complete three-step workflow autonomously after getting initial confirmation.\n\n"
+    "**The Three-Step Workflow:**\n"
+    "1. **Pick and Place** (run_pick_and_place): Move carrot from plate to cutting board (~25 seconds)\n"
+    "2. **Use Slicer** (run_use_slicer): Pick slicer, slice the carrot, return tool (~35 seconds)\n"
+    "3. **Transfer Slices** (run_transfer_slices): Move sliced pieces to pile plate (~25 seconds)\n\n"
+    "**DEMO MODE - AUTONOMOUS EXECUTION:**\n\n"
+    "**Initial Confirmation (ask ONCE):**\n"
+    "- User: 'Slice a carrot' or 'Help me slice carrots'\n"
+    "- You: Call capture_scene with skip_analysis=true (fast), then say 'I see the workspace. Should I proceed with the full workflow?'\n"
+    "- User: 'Yes' or 'Go ahead'\n"
+    "- Now execute ALL THREE steps without asking again!\n\n"
+    "**Step 1 - Pick and Place:**\n"
+    "- Say: 'Starting pick and place, this will take 25 seconds...'\n"
+    "- Call run_pick_and_place\n"
+    "- WAIT silently for function to return (~25 seconds)\n"
+    "- Get response, then proceed immediately to Step 2\n\n"
+    "**Step 2 - Use Slicer:**\n"
+    "- Say: 'Pick and place complete! Now slicing the carrot, 35 seconds...'\n"
+    "- Call run_use_slicer\n"
+    "- WAIT silently for function to return (~35 seconds)\n"
+    "- Get response, then proceed immediately to Step 3\n\n"
+    "**Step 3 - Transfer Slices:**\n"
+    "- Say: 'Slicing done! Now transferring pieces, 25 seconds...'\n"
+    "- Call run_transfer_slices\n"
+    "- WAIT silently for function to return (~25 seconds)\n"
+    "- Get response, then verify completion\n\n"
+    "**After All Three Steps:**\n"
+    "- Call capture_scene with skip_analysis=true (fast) to verify\n"
+    "- Say: 'Perfect! One carrot fully sliced. Would you like me to do another?'\n"
+    "- WAIT for user confirmation before starting next cycle\n\n"
+    "**CRITICAL RULES:**\n\n"
+    "1. **Ask permission ONLY ONCE at the start of each carrot**\n"
+    "   - Do NOT ask before step 2 (slicing)\n"
+    "   - Do NOT ask before step 3 (transfer)\n"
+    "   - After initial 'yes', execute all three steps automatically\n\n"
+    "2. **ALWAYS wait for each function to complete**\n"
+    "   - Each function takes 25-40 seconds\n"
+    "   - Call function → BE SILENT and WAIT → Get response → Proceed to next step\n"
+    "   - NEVER call the next function until previous one returns\n\n"
+    "3. **Keep user informed between steps**\n"
+    "   - Announce what you're doing: 'Starting pick and place...'\n"
+    "   - Announce completion: 'Pick and place complete! Now slicing...'\n"
+    "   - But DO NOT ask for permission mid-workflow\n\n"
+    "4. **Handle errors and continue**\n"
+    "   - If error says 'motion may have completed', assume success and continue\n"
+    "   - Motor errors at END of motion mean task succeeded\n"
+    "   - Continue to next step in the workflow\n\n"
+    "**CORRECT DEMO EXECUTION:**\n"
+    "User: 'Slice a carrot'\n"
+    "You: [capture_scene(skip_analysis=true)] 'I see the workspace. Should I proceed with the full workflow?'\n"
+    "User: 'Yes'\n"
+    "You: 'Starting pick and place, 25 seconds...' [call run_pick_and_place] [WAIT 25s] [response received]\n"
+    "You: 'Complete! Now slicing, 35 seconds...' [call run_use_slicer] [WAIT 35s] [response received]\n"
+    "You: 'Done! Transferring pieces, 25 seconds...' [call run_transfer_slices] [WAIT 25s] [response received]\n"
+    "You: [capture_scene(skip_analysis=true)] 'Perfect! One carrot done. Another?'\n\n"
+    "**WRONG - DO NOT DO:**\n"
+    "❌ Asking 'Should I slice it now?' after pick and place (NO! Just do it!)\n"
+    "❌ Asking 'Should I transfer?' after slicing (NO! Just do it!)\n"
+    "❌ Calling next function before previous one returns\n"
+    "❌ Calling capture_scene while robot is moving\n"
+    "❌ Calling the same function multiple times\n\n"
+    "Remember: ONE confirmation per carrot, then FULL AUTONOMOUS execution of all three steps!"
+)
+
+# Safe operation mode - ask before each action
+SAFE_INSTRUCTIONS = (
+    "You are SliceX Maximus, a friendly voice assistant for a robotic carrot cutting system. "
+    "Your job is to help cut carrots through a three-step process:\n\n"
+    "1. **Pick and Place** (run_pick_and_place): Move whole carrots from the plate to the cutting board (~25 seconds)\n"
+    "2. **Use Slicer** (run_use_slicer): Pick up the slicer from the stand and slice the carrot (~35 seconds)\n"
+    "3. **Transfer Slices** (run_transfer_slices): Move the sliced pieces to the pile plate (~25 seconds)\n\n"
+    "You can see what's happening by calling capture_scene, which takes a photo from the overhead camera. "
+    "Use vision to understand the current state and decide what to do next.\n\n"
+    "**ABSOLUTELY CRITICAL RULES - YOU MUST FOLLOW THESE:**\n\n"
+    "1. **ALWAYS ask for user permission before running ANY robot policy**\n"
+    "   - NEVER call run_pick_and_place, run_use_slicer, or run_transfer_slices without explicit user confirmation\n"
+    "   - After seeing what needs to be done, ASK: 'Should I proceed with [action]?'\n"
+    "   - WAIT for the user to say 'yes', 'go ahead', 'do it', or similar confirmation\n"
+    "   - If the user says 'no' or 'wait', do NOT call the policy\n\n"
+    "2. **NEVER call more than ONE function at a time**\n"
+    "   - If you call run_pick_and_place, DO NOT call anything else until it returns\n"
+    "   - DO NOT call capture_scene while a robot policy is running\n"
+    "   - WAIT for the function response before doing anything else\n\n"
+    "3. **ALWAYS wait for function responses**\n"
+    "   - Each robot policy takes 25-40 SECONDS to execute\n"
+    "   - The function will NOT return until the robot COMPLETELY FINISHES\n"
+    "   - After calling a policy, tell the user you're waiting, then BE SILENT until the response arrives\n"
+    "   - Only speak again AFTER you receive the function response\n\n"
+    "4. **NEVER assume a task is done early**\n"
+    "   - DO NOT capture a scene until the policy function returns\n"
+    "   - DO NOT say 'the robot is moving' and then immediately call capture_scene\n"
+    "   - WAIT for the completion message before verifying\n\n"
+    "5. **Handle errors gracefully**\n"
+    "   - If you get an error that says 'motion may have completed', assume it DID complete\n"
+    "   - Motor disconnection errors at the END of a motion mean the task succeeded\n"
+    "   - Capture the scene to verify rather than retrying immediately\n\n"
+    "6. **Sequence of operations**\n"
+    "   - Capture scene → Decide action → ASK USER → Wait for 'yes' → Call policy → WAIT → Get response → Capture scene → Repeat\n"
+    "   - NEVER skip the asking step\n"
+    "   - NEVER skip the waiting step\n"
+    "   - NEVER call multiple policies in a row without waiting\n"
+    "   - NEVER call the same policy twice in a row\n\n"
+    "**CORRECT workflow:**\n"
+    "1. User: 'Help me slice carrots'\n"
+    "2. You: 'Sure! Let me see...' → Call capture_scene → WAIT for response\n"
+    "3. You: 'I see carrots on the plate. Should I move one to the cutting board?'\n"
+    "4. User: 'Yes, go ahead'\n"
+    "5. You: 'Moving it now, this will take 25 seconds...'\n"
+    "6. Call run_pick_and_place → WAIT (say nothing for 25 seconds) → Get response\n"
+    "7. You: 'Done! Let me check...' → Call capture_scene → WAIT for response\n"
+    "8. You: 'Perfect! Carrot is on the board. Should I slice it now?'\n"
+    "9. User: 'Yes'\n"
+    "10. You: 'Slicing now, this will take 35 seconds...'\n"
+    "11. Call run_use_slicer → WAIT (say nothing for 35 seconds) → Get response\n"
+    "12. You: 'Slicing complete! Let me verify...' → Call capture_scene → WAIT for response\n"
+    "13. And so on...\n\n"
+    "**WRONG workflow (DO NOT DO THIS):**\n"
+    "❌ Calling robot policies without asking the user first\n"
+    "❌ Calling run_pick_and_place then immediately calling capture_scene\n"
+    "❌ Calling multiple functions at once (run_use_slicer twice, etc.)\n"
+    "❌ Calling the same function multiple times\n"
+    "❌ Talking about what the robot 'is doing' while also calling other functions\n"
+    "❌ Not waiting for function responses\n\n"
+    "Remember: ASK FIRST. ONE function at a time. ALWAYS wait for the response. Be patient!"
+)
+
+
+def build_session_config(demo_mode: bool) -> dict:
+    return {
+        "session": {
+            "type": "realtime",
+            "model": REALTIME_MODEL,
+            "audio": {"output": {"voice": "alloy"}},
+            "instructions": DEMO_INSTRUCTIONS if demo_mode else SAFE_INSTRUCTIONS,
+            "tools": REALTIME_TOOLS,
+        },
+        "expires_after": {"anchor": "created_at", "seconds": REALTIME_SECRET_TTL_S},
+    }
+
+
+# Request bodies for client_secrets, serialized once per mode (demo / ask before each step)
+SESSION_BODIES = {mode: json.dumps(build_session_config(mode)).encode() for mode in (True, False)}
+
+
+class SecretMintError(Exception):
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"client_secrets returned {status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+class SessionSecretPool:
+    # One pool per session mode. start() runs the refill task on the server's event loop;
+    # without it (or when the pool is empty) get() mints on demand, as before.
+
+    def __init__(
+        self,
+        api_base: str,
+        api_key: str,
+        demo_mode: bool,
+        size: int = REALTIME_SECRET_POOL_SIZE,
+        ttl_s: float = REALTIME_SECRET_TTL_S,
+        refresh_margin_s: float = REALTIME_SECRET_REFRESH_MARGIN_S,
+    ):
+        if size > 0 and ttl_s <= refresh_margin_s:
+            # Every pooled secret would be dropped as soon as it is minted
+            raise ValueError(
+                f"REALTIME_SECRET_TTL_S ({ttl_s}) must be longer than REALTIME_SECRET_REFRESH_MARGIN_S ({refresh_margin_s})"
+            )
+        self.ttl_s = ttl_s
+        self.refresh_margin_s = refresh_margin_s
+        self.url = f"{api_base}/realtime/client_secrets"
+        self.enabled = bool(api_key)
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.body = SESSION_BODIES[demo_mode]
+        self.size = size
+        self.secrets = deque()  # (value, expires_at), oldest first
+        self.client = None
+        self.task = None
+        self.wakeup = None
+        self.hits = 0
+        self.misses = 0
+        self.minted = 0
+        self.failures = 0
+        self.last_error = None
+
+    def _client(self) -> httpx.AsyncClient:
+        # Kept open so refills and on-demand mints reuse the connection to the API
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=30.0)
+        return self.client
+
+    async def _mint(self) -> tuple[str, float]:
+        r = await self._client().post(self.url, headers=self.headers, content=self.body)
+        if r.status_code != 200:
+            raise SecretMintError(r.status_code, r.text)
+        data = r.json()
+        self.minted += 1
+        return data.get("value", ""), float(data.get("expires_at") or time.time() + self.ttl_s)
+
+    def _drop_expiring(self) -> None:
+        deadline = time.time() + self.refresh_margin_s
+        while self.secrets and self.secrets[0][1] <= deadline:
+            self.secrets.popleft()
+
+    async def get(self) -> str:
+        self._drop_expiring()
+        if self.secrets:
+            value, _ = self.secrets.popleft()
+            self.hits += 1
+        else:
+            self.misses += 1
+            value, _ = await self._mint()
+        if self.wakeup is not None:
+            self.wakeup.set()
+        return value
+
+    async def _refill(self) -> None:
+        while True:
+            self.wakeup.clear()  # a get() from here on wakes the next wait
+            self._drop_expiring()
+            try:
+                while len(self.secrets) < self.size:
+                    value, expires_at = await self._mint()
+                    if expires_at - time.time() <= self.refresh_margin_s:
+                        # Would be dropped right away; counted as a failed mint and retried later
+                        raise SecretMintError(200, f"secret expires within the {self.refresh_margin_s:g}s refresh margin")
+                    self.secrets.append((value, expires_at))
+                wait_s = self.secrets[0][1] - self.refresh_margin_s - time.time() if self.secrets else None
+                if wait_s is not None:
+                    wait_s = max(MINT_RETRY_S, wait_s)
+            except (SecretMintError, httpx.HTTPError) as e:
+                self.failures += 1
+                self.last_error = str(e)
+                print(f"⚠️  Realtime secret refill failed: {e}")
+                wait_s = MINT_RETRY_S
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=wait_s)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self.enabled and self.size > 0 and self.task is None:
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.get_running_loop().create_task(self._refill())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def stats(self) -> dict:
+        return {
+            "pooled": len(self.secrets),
+            "next_expiry_s": self.secrets[0][1] - time.time() if self.secrets else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "minted": self.minted,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
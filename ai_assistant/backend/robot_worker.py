@@ -0,0 +1,267 @@
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# ROBOT_WORKER=process runs skills in a separate, higher-priority process that owns the robot and
+# cameras. The API process sends control messages over a local socket and reads observations from
+# shared memory, so request handling, PNG encoding and logging never share a GIL with the control loop.
+# numpy (via shared_state) is imported on first use, keeping this module off the backend's import path.
+ROBOT_WORKER = os.getenv("ROBOT_WORKER", "off")
+ROBOT_WORKER_ADDRESS = ("127.0.0.1", int(os.getenv("ROBOT_WORKER_PORT", "6011")))
+ROBOT_WORKER_AUTHKEY = os.getenv("ROBOT_WORKER_AUTHKEY", "gpt-act-robot-worker").encode()
+ROBOT_WORKER_NICE = int(os.getenv("ROBOT_WORKER_NICE", "-10"))
+# > 0 asks for SCHED_FIFO at this priority (Linux, needs CAP_SYS_NICE); 0 only renices
+ROBOT_WORKER_RT_PRIORITY = int(os.getenv("ROBOT_WORKER_RT_PRIORITY", "0"))
+ROBOT_WORKER_START_TIMEOUT_S = 60.0
+OBS_SHM_NAME = "gptact_robot_obs"
+CMD_SHM_NAME = "gptact_robot_cmd"
+PREVIEW_HZ = 10  # frames published while idle, and while a skill runs (joints go every tick)
+
+
+def _raise_priority() -> str:
+    if ROBOT_WORKER_RT_PRIORITY > 0 and hasattr(os, "sched_setscheduler"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(ROBOT_WORKER_RT_PRIORITY))
+            return f"SCHED_FIFO {ROBOT_WORKER_RT_PRIORITY}"
+        except PermissionError:
+            print("Robot worker: no permission for SCHED_FIFO, falling back to nice")
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, ROBOT_WORKER_NICE)
+        return f"nice {ROBOT_WORKER_NICE}"
+    except PermissionError:
+        print(f"Robot worker: no permission for nice {ROBOT_WORKER_NICE}, running at default priority")
+        return "default"
+
+
+class RobotWorker:
+    # Main thread: runs skills one at a time (the control loop lives here).
+    # Control thread(s): accept socket connections and queue jobs / answer status.
+    # Preview thread: while idle, publishes every camera's frames so /camera/capture and
+    # /analyze_scene keep working.
+
+    def __init__(self):
+        from ai_assistant.backend.shared_state import CommandBlock, ObservationBuffer
+
+        self.obs = ObservationBuffer(OBS_SHM_NAME, create=True)
+        self.cmd = CommandBlock(CMD_SHM_NAME, create=True)
+        self.jobs = queue.Queue()
+        self.camera_lock = threading.Lock()
+        self.busy = threading.Event()
+        self.stop_event = threading.Event()
+        self.priority = "default"
+        self.current = None
+        self.token = None  # CancelToken of the running skill
+        self.completed = 0
+        self.last_frame_t = 0.0
+
+    def publish(self, observation: dict) -> None:
+        # Observation hook, called on the control thread after every get_observation()
+        if self.cmd.abort_requested() and self.token is not None:
+            self.token.cancel("aborted by the API")
+        joints = [float(v) for k, v in observation.items() if k.endswith(".pos")]
+        frames = {k: v for k, v in observation.items() if getattr(v, "ndim", 0) == 3}
+        now = time.perf_counter()
+        if frames and now - self.last_frame_t >= 1.0 / PREVIEW_HZ:
+            self.last_frame_t = now
+            self.obs.write(frames, joints)
+        else:
+            self.obs.write(None, joints)
+
+    def _preview_loop(self) -> None:
+        import cv2
+        from ai_assistant.backend.camera_capture import read_camera_frame
+        from src.config.ports_and_cameras import camera_config
+
+        while not self.stop_event.is_set():
+            if not self.busy.is_set():
+                with self.camera_lock:
+                    try:
+                        frames = {name: cv2.cvtColor(read_camera_frame(name), cv2.COLOR_BGR2RGB) for name in camera_config}
+                        self.obs.write(frames)
+                    except Exception as e:
+                        print(f"Robot worker preview: {e}")
+                        time.sleep(1.0)
+            time.sleep(1.0 / PREVIEW_HZ)
+
+    def _handle(self, conn) -> None:
+        with conn:
+            msg = conn.recv()
+            cmd = msg.get("cmd")
+            if cmd == "run_skill":
+                job = {**msg, "done": threading.Event(), "reply": None}
+                self.jobs.put(job)
+                job["done"].wait()
+                conn.send(job["reply"])
+            elif cmd == "status":
+                conn.send(
+                    {
+                        "busy": self.busy.is_set(),
+                        "current": self.current,
+                        "completed": self.completed,
+                        "priority": self.priority,
+                        "pid": os.getpid(),
+                    }
+                )
+            elif cmd == "shutdown":
+                self.stop_event.set()
+                self.jobs.put(None)
+                conn.send({"status": "ok"})
+            else:
+                conn.send({"status": "error", "message": f"Unknown command {cmd}"})
+
+    def _accept_loop(self, listener) -> None:
+        while not self.stop_event.is_set():
+            try:
+                conn = listener.accept()
+            except Exception:
+                continue
+            threading.Thread(target=self._handle, args=(conn,), name="robot_worker_conn", daemon=True).start()
+
+    def _run_job(self, job: dict) -> dict:
+        from ai_assistant.backend.camera_capture import release_camera
+        from ai_assistant.backend.profiling import profile_run
+        from ai_assistant.backend.robot_policies import POLICY_FUNCTIONS
+        from src.control.cancel import CancelToken, cancel_scope
+        from src.tracing.spans import span, trace_context
+
+        func = POLICY_FUNCTIONS.get(job["name"])
+        if func is None:
+            return {"status": "error", "message": f"Unknown policy {job['name']}"}
+        self.busy.set()
+        self.current = job["name"]
+        try:
+            # Hand the cameras over to the robot for the duration of the skill
+            with self.camera_lock:
+                release_camera()
+            self.cmd.set_abort(False)
+            self.token = CancelToken()
+            with trace_context(job.get("traceparent")), span(f"skill {job['name']}", params=job["params"], worker=True):
+                with profile_run("skills", job["name"]), cancel_scope(self.token):
+                    result = func(**job["params"])
+            if self.token.cancelled.is_set():
+                return {"status": "cancelled", "policy": job["name"], "result": result}
+            return {"status": "completed", "policy": job["name"], "result": result}
+        except Exception as e:
+            traceback.print_exc()
+            return {"status": "error", "message": str(e)}
+        finally:
+            self.current = None
+            self.token = None
+            self.completed += 1
+            self.busy.clear()
+
+    def run(self) -> None:
+        from ai_assistant.backend.camera_capture import release_camera
+        from ai_assistant.backend.robot_policies import SKILL_LOADERS
+        from src.hardware.connect import add_observation_hook
+
+        self.priority = _raise_priority()
+        add_observation_hook(self.publish)
+        for load in SKILL_LOADERS:
+            load()
+        listener = Listener(ROBOT_WORKER_ADDRESS, authkey=ROBOT_WORKER_AUTHKEY)
+        threading.Thread(target=self._preview_loop, name="robot_worker_preview", daemon=True).start()
+        threading.Thread(target=self._accept_loop, args=(listener,), name="robot_worker_accept", daemon=True).start()
+        print(f"✓ Robot worker {os.getpid()} ready on {ROBOT_WORKER_ADDRESS[0]}:{ROBOT_WORKER_ADDRESS[1]} ({self.priority})")
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                job["reply"] = self._run_job(job)
+                job["done"].set()
+        finally:
+            self.stop_event.set()
+            listener.close()
+            with self.camera_lock:
+                release_camera()
+            self.obs.close()
+            self.cmd.close()
+
+
+def serve() -> None:
+    RobotWorker().run()
+
+
+class RobotWorkerClient:
+    # Used by the API process. start() spawns the worker (or reuses one already listening).
+
+    def __init__(self):
+        self.process = None
+        self.obs = None
+        self.cmd = None
+        self.ready = threading.Event()
+
+    def _request(self, msg: dict) -> dict:
+        with Client(ROBOT_WORKER_ADDRESS, authkey=ROBOT_WORKER_AUTHKEY) as conn:
+            conn.send(msg)
+            return conn.recv()
+
+    def start(self) -> None:
+        try:
+            self._request({"cmd": "status"})
+        except OSError:
+            self.process = mp.get_context("spawn").Process(target=serve, name="robot_worker")
+            self.process.start()
+        deadline = time.monotonic() + ROBOT_WORKER_START_TIMEOUT_S
+        while True:
+            try:
+                self._request({"cmd": "status"})
+                break
+            except OSError:
+                if time.monotonic() > deadline or (self.process is not None and not self.process.is_alive()):
+                    raise RuntimeError("Robot worker did not start")
+                time.sleep(0.1)
+        from ai_assistant.backend.shared_state import CommandBlock, ObservationBuffer
+
+        self.obs = ObservationBuffer(OBS_SHM_NAME)
+        self.cmd = CommandBlock(CMD_SHM_NAME)
+        self.ready.set()
+
+    def wait_ready(self, timeout_s: float = ROBOT_WORKER_START_TIMEOUT_S) -> None:
+        if not self.ready.wait(timeout_s):
+            raise RuntimeError("Robot worker is not ready")
+
+    def run_skill(self, name: str, params: dict, traceparent: str | None = None) -> dict:
+        self.wait_ready()
+        return self._request({"cmd": "run_skill", "name": name, "params": params, "traceparent": traceparent})
+
+    def status(self) -> dict:
+        self.wait_ready()
+        return self._request({"cmd": "status"})
+
+    def abort(self) -> None:
+        self.wait_ready()
+        self.cmd.set_abort(True)
+
+    def latest_observation(self) -> tuple:
+        # (timestamp, {camera name: RGB frame}, joint positions), see ObservationBuffer.read
+        self.wait_ready()
+        return self.obs.read()
+
+    def shutdown(self) -> None:
+        if self.obs is not None:
+            self.obs.close()
+            self.cmd.close()
+        try:
+            self._request({"cmd": "shutdown"})
+        except OSError:
+            pass
+        if self.process is not None:
+            self.process.join(timeout=10)
+
+
+robot_worker_client = RobotWorkerClient()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,75 @@
+import json
+import os
+
+# One vision call for several camera views: each view is attached as its own JPEG with its own
+# detail level ("low" is a fixed ~85 tokens at 512px, "high" tiles the image at full detail), and
+# the model answers with SCENE_SCHEMA instead of free text.
+# SCENE_VIEWS: "view:detail,..." in the order the images are attached.
+SCENE_VIEWS = os.getenv("SCENE_VIEWS", "top:high,wrist:low")
+SCENE_IMAGE_MAX_WIDTH = int(os.getenv("SCENE_IMAGE_MAX_WIDTH", "1024"))
+SCENE_JPEG_QUALITY = int(os.getenv("SCENE_JPEG_QUALITY", "80"))
+DETAIL_LEVELS = ("low", "high", "auto")
+NEXT_STEPS = ["run_pick_and_place", "run_use_slicer", "run_transfer_slices", "none"]
+
+VIEW_CAPTIONS = {
+    "top": "Overhead camera: the whole workspace (plate, cutting board, slicer stand, pile plate).",
+    "wrist": "Wrist camera on the gripper: close-up of what the gripper is holding or about to grasp.",
+}
+
+SCENE_PROMPT = (
+    "You see the carrot slicing workspace of the SliceX robot from the camera views below. "
+    "The workflow per carrot is: run_pick_and_place (carrot from plate to cutting board), "
+    "run_use_slicer (slice the carrot on the board), run_transfer_slices (slices to the pile plate). "
+    "Describe the scene state, pick the next step (none if nothing is left to do or the scene is unclear), "
+    "and give your confidence between 0 and 1."
+)
+
+SCENE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scene_state": {"type": "string", "description": "What is where: carrots on the plate, board, slices, gripper"},
+        "next_step": {"type": "string", "enum": NEXT_STEPS},
+        "confidence": {"type": "number"},
+    },
+    "required": ["scene_state", "next_step", "confidence"],
+    "additionalProperties": False,
+}
+
+
+def parse_views(spec: str) -> dict:
+    views = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        view, _, detail = part.partition(":")
+        views[view] = detail or "auto"
+    return views
+
+
+def validate_views(views: dict) -> None:
+    bad = {view: detail for view, detail in views.items() if detail not in DETAIL_LEVELS}
+    if bad:
+        raise ValueError(f"Unknown detail level {bad}; use one of {DETAIL_LEVELS}")
+
+
+def build_scene_request(model: str, images: dict, views: dict, prompt: str | None = None) -> dict:
+    # images: view → base64 JPEG, attached in views order with each view's detail level
+    content = [{"type": "text", "text": prompt or SCENE_PROMPT}]
+    for view, image_base64 in images.items():
+        content.append({"type": "text", "text": VIEW_CAPTIONS.get(view, f"{view} camera.")})
+        content.append(
+            {
+                "type": "image_url",
+                "image_url": {"url": f"data:image/jpeg;base64,{image_base64}", "detail": views[view]},
+            }
+        )
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": content}],
+        "response_format": {"type": "json_schema", "json_schema": {"name": "scene_analysis", "strict": True, "schema": SCENE_SCHEMA}},
+        "max_tokens": 400,
+    }
+
+
+def parse_scene_response(data: dict) -> dict:
+    analysis = json.loads(data["choices"][0]["message"]["content"])
+    analysis["confidence"] = min(1.0, max(0.0, float(analysis["confidence"])))
+    return analysis
@@ -0,0 +1,139 @@
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Shared memory between the API process and the robot worker process.
+#
+# Observation block (written by the worker, read by the API):
+#   header: seq (u64), timestamp (f64), num_joints (u32), pad (u32)
+#   joints: f64 x MAX_JOINTS
+#   MAX_VIEWS view headers: camera name (16 bytes, empty for an unused slot), height, width (u32 x2)
+#   MAX_VIEWS frames, RGB uint8 height x width x 3, each in its own MAX_FRAME_SHAPE slot.
+# Every configured camera gets a slot, so the API sees the same views as the robot (top, wrist).
+# seq is a seqlock: odd while the worker is writing, readers retry until they see the same even
+# value before and after their copy. No locks, so the control thread never waits on the API.
+#
+# Command block (written by the API, polled by the worker every control tick):
+#   seq (u64), abort (u32), pad (u32)
+
+OBS_HEADER = struct.Struct("<QdII")
+VIEW_HEADER = struct.Struct("<16sII")
+CMD_HEADER = struct.Struct("<QII")
+MAX_JOINTS = 8
+MAX_VIEWS = 4
+MAX_FRAME_SHAPE = (1080, 1920, 3)
+FRAME_BYTES = int(np.prod(MAX_FRAME_SHAPE))
+JOINTS_OFFSET = OBS_HEADER.size
+VIEWS_OFFSET = JOINTS_OFFSET + 8 * MAX_JOINTS
+FRAMES_OFFSET = VIEWS_OFFSET + VIEW_HEADER.size * MAX_VIEWS
+OBS_SIZE = FRAMES_OFFSET + FRAME_BYTES * MAX_VIEWS
+READ_RETRIES = 100
+
+
+def _attach(name: str, size: int, create: bool) -> shared_memory.SharedMemory:
+    if create:
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    shm = shared_memory.SharedMemory(name=name)
+    # Only the creating process (the worker) owns the segment; don't let this process's
+    # resource tracker unlink it on exit.
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class ObservationBuffer:
+    def __init__(self, name: str, create: bool = False):
+        self.shm = _attach(name, OBS_SIZE, create)
+        self.owner = create
+        self.buf = self.shm.buf
+        if create:
+            OBS_HEADER.pack_into(self.buf, 0, 0, 0.0, 0, 0)
+            for slot in range(MAX_VIEWS):
+                VIEW_HEADER.pack_into(self.buf, VIEWS_OFFSET + slot * VIEW_HEADER.size, b"", 0, 0)
+
+    def _views(self) -> dict:
+        # camera name → (slot, height, width) for the slots in use
+        views = {}
+        for slot in range(MAX_VIEWS):
+            name, height, width = VIEW_HEADER.unpack_from(self.buf, VIEWS_OFFSET + slot * VIEW_HEADER.size)
+            name = name.rstrip(b"\0").decode()
+            if name:
+                views[name] = (slot, height, width)
+        return views
+
+    def write(self, frames: dict | None = None, joints: list[float] | None = None) -> None:
+        # frames: camera name → RGB frame; cameras not given keep their previous frame
+        seq, _, num_joints, _ = OBS_HEADER.unpack_from(self.buf, 0)
+        struct.pack_into("<Q", self.buf, 0, seq + 1)
+        views = self._views()
+        for name, frame in (frames or {}).items():
+            if name in views:
+                slot = views[name][0]
+            elif len(views) < MAX_VIEWS:
+                slot = len(views)
+            else:
+                continue
+            height, width = frame.shape[:2]
+            if height * width * 3 > FRAME_BYTES:
+                height, width = 0, 0
+            else:
+                np.ndarray(frame.shape, np.uint8, self.buf, FRAMES_OFFSET + slot * FRAME_BYTES)[:] = frame
+            VIEW_HEADER.pack_into(self.buf, VIEWS_OFFSET + slot * VIEW_HEADER.size, name.encode()[:16], height, width)
+            views[name] = (slot, height, width)
+        if joints is not None:
+            num_joints = min(len(joints), MAX_JOINTS)
+            np.ndarray((num_joints,), np.float64, self.buf, JOINTS_OFFSET)[:] = joints[:num_joints]
+        OBS_HEADER.pack_into(self.buf, 0, seq + 2, time.time(), num_joints, 0)
+
+    def read(self) -> tuple[float, dict, np.ndarray]:
+        # (timestamp, {camera name: frame copy}, joints copy)
+        for _ in range(READ_RETRIES):
+            seq, ts, num_joints, _ = OBS_HEADER.unpack_from(self.buf, 0)
+            if seq % 2:
+                time.sleep(0.0005)
+                continue
+            frames = {
+                name: np.ndarray((height, width, 3), np.uint8, self.buf, FRAMES_OFFSET + slot * FRAME_BYTES).copy()
+                for name, (slot, height, width) in self._views().items()
+                if height
+            }
+            joints = np.ndarray((num_joints,), np.float64, self.buf, JOINTS_OFFSET).copy()
+            if struct.unpack_from("<Q", self.buf, 0)[0] == seq:
+                return ts, frames, joints
+        raise TimeoutError("Robot worker observation buffer stayed busy")
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class CommandBlock:
+    def __init__(self, name: str, create: bool = False):
+        self.shm = _attach(name, CMD_HEADER.size, create)
+        self.owner = create
+        if create:
+            CMD_HEADER.pack_into(self.shm.buf, 0, 0, 0, 0)
+
+    def set_abort(self, abort: bool) -> None:
+        seq, _, _ = CMD_HEADER.unpack_from(self.shm.buf, 0)
+        CMD_HEADER.pack_into(self.shm.buf, 0, seq + 1, int(abort), 0)
+
+    def abort_requested(self) -> bool:
+        return bool(CMD_HEADER.unpack_from(self.shm.buf, 0)[1])
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -28,18 +28,48 @@ def save_image_and_analysis(image_base64: str, analysis_result: dict) -> str:
     return ts
 
 def save_master_log(timestamp: str, analysis_result: dict, policy_executed: str = None):
+    _append_master_log(
+        {
+            "timestamp": timestamp,
+            "datetime": datetime.now().isoformat(),
+            "image_file": f"image_{timestamp}.png",
+            "analysis_file": f"analysis_{timestamp}.json",
+            "description_preview": (analysis_result.get("description", "") or "")[:100] + "...",
+            "policy_executed": policy_executed,
+        }
+    )
+
+def _append_master_log(entry: dict):
     master = LOGS_DIR / "master_log.jsonl"
     with open(master, "a") as f:
-        f.write(
-            json.dumps(
-                {
-                    "timestamp": timestamp,
-                    "datetime": datetime.now().isoformat(),
-                    "image_file": f"image_{timestamp}.png",
-                    "analysis_file": f"analysis_{timestamp}.json",
-                    "description_preview": (analysis_result.get("description", "") or "")[:100] + "...",
-                    "policy_executed": policy_executed,
-                }
-            )
-            + "\n"
-        )
\ No newline at end of file
+        f.write(json.dumps(entry) + "\n")
+
+
+def save_views_and_analysis(images_base64: dict, analysis_result: dict) -> str:
+    # Multi-view analyses (see scene_analysis.py): one JPEG per view plus the structured answer,
+    # its latency and token usage
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    image_files = {}
+    for view, image_base64 in images_base64.items():
+        img_path = LOGS_DIR / f"image_{ts}_{view}.jpg"
+        with open(img_path, "wb") as f:
+            f.write(base64.b64decode(image_base64))
+        image_files[view] = img_path.name
+    json_path = LOGS_DIR / f"analysis_{ts}.json"
+    with open(json_path, "w") as f:
+        json.dump(
+            {"timestamp": ts, "datetime": datetime.now().isoformat(), "image_files": image_files, **analysis_result},
+            f,
+            indent=2,
+        )
+    _append_master_log(
+        {
+            "timestamp": ts,
+            "datetime": datetime.now().isoformat(),
+            "image_files": image_files,
+            "analysis_file": json_path.name,
+            "description_preview": (analysis_result.get("analysis", {}).get("scene_state", "") or "")[:100] + "...",
+            "policy_executed": None,
+        }
+    )
+    return ts
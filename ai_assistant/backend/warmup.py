@@ -0,0 +1,37 @@
+import importlib
+import os
+import threading
+import time
+
+# Heavy modules the first capture / skill call would otherwise import on the request path.
+# "1" imports them on a background thread right after startup, "0" leaves them to first use.
+BACKEND_WARMUP = os.getenv("BACKEND_WARMUP", "1") == "1"
+WARMUP_MODULES = ["cv2", "numpy", "src.config.ports_and_cameras"]
+
+warmup_status = {"done": False, "seconds": None, "errors": []}
+
+
+def _warm() -> None:
+    from ai_assistant.backend.robot_policies import SKILL_LOADERS
+    from ai_assistant.backend.robot_worker import ROBOT_WORKER
+
+    t0 = time.perf_counter()
+    for name in WARMUP_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            warmup_status["errors"].append(f"{name}: {e}")
+    # With a robot worker process the skills are loaded (and warmed) there, not here
+    loaders = [] if ROBOT_WORKER == "process" else SKILL_LOADERS
+    for load in loaders:
+        try:
+            load()
+        except Exception as e:
+            warmup_status["errors"].append(f"{load.__name__}: {e}")
+    warmup_status.update(done=True, seconds=time.perf_counter() - t0)
+    print(f"✓ Backend warm-up finished in {warmup_status['seconds']:.1f}s")
+
+
+def start_warmup() -> None:
+    if BACKEND_WARMUP:
+        threading.Thread(target=_warm, name="backend_warmup", daemon=True).start()
@@ -11,6 +11,12 @@ const BACKEND_URL = "http://localhost:8000";
 let pc = null;
 let dataChannel = null;
 let localStream = null;
+let responseStartedNs = null;
+// Set when the backend answers tool calls on its sideband connection to this call
+let relayCallId = null;
+let relayPoll = null;
+const relayedCalls = new Map(); // call_id → function call event, until its output shows up
+const RELAY_POLL_MS = 2000;
 
 function log(msg, obj) {
   const line = document.createElement("div");
@@ -29,14 +35,47 @@ function setStatus(text) {
   log(text);
 }
 
-async function captureAndDisplayRobotImage() {
-  const resp = await fetch(`${BACKEND_URL}/camera/capture`);
+// Minimal span tracing: tool-call spans are posted to the backend, which writes them with its own
+// spans to traces/spans.jsonl (TRACE_EXPORT=jsonl). The traceparent header links backend spans to the frontend ones.
+function randomHex(bytes) {
+  return Array.from(crypto.getRandomValues(new Uint8Array(bytes)), (b) => b.toString(16).padStart(2, "0")).join("");
+}
+
+function nowNs() {
+  return Math.round((performance.timeOrigin + performance.now()) * 1e6);
+}
+
+function startSpan(name, traceId, parentId, attributes = {}, startNs = null) {
+  return { trace_id: traceId, span_id: randomHex(8), parent_id: parentId, name, start_ns: startNs ?? nowNs(), attributes };
+}
+
+function endSpan(span, status = "ok", endNs = null) {
+  span.end_ns = endNs ?? nowNs();
+  span.status = status;
+  fetch(`${BACKEND_URL}/trace/spans`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify([span]),
+  }).catch(() => {});
+}
+
+function traceparent(span) {
+  return `00-${span.trace_id}-${span.span_id}-01`;
+}
+
+async function captureAndDisplayRobotImage(parentSpan = null) {
+  const headers = parentSpan ? { traceparent: traceparent(parentSpan) } : {};
+  const resp = await fetch(`${BACKEND_URL}/camera/capture`, { headers });
   const data = await resp.json();
   if (data.status !== "success") throw new Error(data.message || "capture failed");
-  cameraImg.src = `data:image/png;base64,${data.image}`;
+  displayRobotImage(`data:image/png;base64,${data.image}`);
+  return data.image;
+}
+
+function displayRobotImage(src) {
+  cameraImg.src = src;
   cameraImg.style.display = "block";
   placeholder.style.display = "none";
-  return data.image;
 }
 
 function sendEvent(ev) {
@@ -44,23 +83,32 @@ function sendEvent(ev) {
   dataChannel.send(JSON.stringify(ev));
 }
 
-async function sendSceneImageToModel() {
-  const base64 = await captureAndDisplayRobotImage();
-  const resp = await fetch(`${BACKEND_URL}/analyze_image`, {
+// Top and wrist views are captured and analysed by the backend in one call, which also returns the
+// frame to display, so no separate capture is needed. Returns the /analyze_scene response.
+async function sendSceneImageToModel(parentSpan = null) {
+  const headers = { "Content-Type": "application/json" };
+  if (parentSpan) headers.traceparent = traceparent(parentSpan);
+  const resp = await fetch(`${BACKEND_URL}/analyze_scene`, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ image: base64 }),
+    headers,
+    body: JSON.stringify({ return_image: true }),
   });
   const data = await resp.json();
   if (data.status !== "success") {
     log("Analysis failed", data);
-    return;
+    return data;
   }
+  if (data.image) displayRobotImage(`data:image/jpeg;base64,${data.image}`);
+  const { scene_state, next_step, confidence } = data.analysis;
+  log(`Scene analysed in ${Math.round(data.latency_ms.total)} ms, ${data.usage.total_tokens ?? "?"} tokens`);
+  const confidenceText = typeof confidence === "number" ? confidence.toFixed(2) : "?";
+  const text = `${scene_state}\nNext step: ${next_step} (confidence ${confidenceText})`;
   sendEvent({
     type: "conversation.item.create",
-    item: { type: "message", role: "user", content: [{ type: "input_text", text: data.description }] },
+    item: { type: "message", role: "user", content: [{ type: "input_text", text }] },
   });
   sendEvent({ type: "response.create" });
+  return data;
 }
 
 async function startMedia() {
@@ -91,6 +139,11 @@ async function startRealtime() {
   dataChannel.onmessage = (m) => {
     try {
       const d = JSON.parse(m.data);
+      if (d.type === "response.created") responseStartedNs = nowNs();
+      if (relayCallId) {
+        handleRelayedEvent(d);
+        return;
+      }
       if (d.type === "response.function_call_arguments.done") handleFunctionCallEvent(d);
       if (d.type === "response.done") {
         const out = d.response?.output?.[0];
@@ -113,6 +166,7 @@ async function startRealtime() {
     const answerSdp = await resp.text();
     await pc.setRemoteDescription({ type: "answer", sdp: answerSdp });
     log("✓ WebRTC connection established!");
+    await attachRelay(resp.headers.get("Location"));
   };
 
   const offer = await pc.createOffer();
@@ -120,7 +174,103 @@ async function startRealtime() {
   log("✓ Local offer created");
 }
 
+// The call id is the last segment of the answer's Location header. If it is not readable, the
+// backend has the relay off or its sideband connection did not come up, tool calls stay in
+// handleFunctionCallEvent below.
+async function attachRelay(location) {
+  const callId = location?.split("/").pop();
+  if (!callId) return;
+  try {
+    const resp = await fetch(`${BACKEND_URL}/realtime/attach`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ call_id: callId }),
+    });
+    const data = await resp.json();
+    if (data.status === "attached") {
+      relayCallId = callId;
+      relayPoll = setInterval(checkRelay, RELAY_POLL_MS);
+      log("✓ Backend answers tool calls for this session");
+    } else if (data.status === "error") {
+      log(`Relay unavailable (${data.message}), tool calls run from the browser`);
+    }
+  } catch (e) {
+    log("Relay unavailable, tool calls run from the browser");
+  }
+}
+
+// While the relay answers tool calls, its sideband state is polled; once it is no longer connected
+// the browser takes the tool calls back.
+async function checkRelay() {
+  if (!relayCallId) return;
+  let state;
+  try {
+    const resp = await fetch(`${BACKEND_URL}/realtime/relay/${relayCallId}`);
+    state = (await resp.json()).state;
+  } catch (e) {
+    state = `unreachable (${e.message})`;
+  }
+  if (relayCallId && state !== "connected") await takeBackToolCalls(state);
+}
+
+async function takeBackToolCalls(state) {
+  const callId = relayCallId;
+  relayCallId = null; // from here on new tool calls go to handleFunctionCallEvent
+  clearInterval(relayPoll);
+  relayPoll = null;
+  log(`Relay ${state}, tool calls run from the browser`);
+  let handled = [];
+  let undelivered = [];
+  try {
+    // Waits for the backend's running tool calls, then returns what it could not send
+    const resp = await fetch(`${BACKEND_URL}/realtime/detach`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ call_id: callId, drain: true }),
+    });
+    ({ handled = [], undelivered = [] } = await resp.json());
+  } catch (e) {}
+  for (const { call_id, output } of undelivered) {
+    relayedCalls.delete(call_id);
+    sendEvent({ type: "conversation.item.create", item: { type: "function_call_output", call_id, output } });
+  }
+  if (undelivered.length) sendEvent({ type: "response.create" });
+  // Calls the backend never saw (its socket was down) are answered here
+  const pending = [...relayedCalls.values()].filter((call) => !handled.includes(call.call_id));
+  relayedCalls.clear();
+  for (const call of pending) await handleFunctionCallEvent(call);
+}
+
+function handleRelayedEvent(d) {
+  const call = d.type === "response.function_call_arguments.done" ? d : null;
+  if (call && !relayedCalls.has(call.call_id)) {
+    relayedCalls.set(call.call_id, call);
+    let args = {};
+    try { args = call.arguments ? JSON.parse(call.arguments) : {}; } catch {}
+    log(`Function call (backend): ${call.name}`, args);
+  }
+  const item = d.item;
+  if ((d.type === "conversation.item.added" || d.type === "conversation.item.created") && item?.type === "function_call_output") {
+    relayedCalls.delete(item.call_id);
+    let output = item.output;
+    try { output = JSON.parse(item.output); } catch {}
+    log("Function output (backend)", output);
+    captureAndDisplayRobotImage().catch(() => {});
+  }
+}
+
 function stopRealtime() {
+  clearInterval(relayPoll);
+  relayPoll = null;
+  if (relayCallId) {
+    fetch(`${BACKEND_URL}/realtime/detach`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ call_id: relayCallId }),
+    }).catch(() => {});
+    relayCallId = null;
+    relayedCalls.clear();
+  }
   if (pc) pc.close();
   pc = null;
   if (localStream) {
@@ -142,29 +292,49 @@ async function handleFunctionCallEvent(ev) {
   try { args = argsJson ? JSON.parse(argsJson) : {}; } catch {}
   log(`Function call: ${name}`, args);
 
+  // One trace per tool call, from the start of the model response that produced it to the
+  // function output being sent back.
+  const decidedNs = nowNs();
+  const root = startSpan(`tool_call ${name}`, randomHex(16), null, { call_id }, responseStartedNs ?? decidedNs);
+  responseStartedNs = null;
+  endSpan(startSpan("realtime.response", root.trace_id, root.span_id, {}, root.start_ns), "ok", decidedNs);
+
   if (name === "capture_scene") {
     const skip = args.skip_analysis === true;
-    await captureAndDisplayRobotImage();
-    if (!skip) await sendSceneImageToModel();
+    if (skip) await captureAndDisplayRobotImage(root);
+    else await sendSceneImageToModel(root);
+    endSpan(root);
     return;
   }
 
   if (name === "run_pick_and_place" || name === "run_use_slicer" || name === "run_transfer_slices") {
-    const resp = await fetch(`${BACKEND_URL}/robot/run_policy`, {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ policy_name: name, params: args }),
-    });
-    const data = await resp.json();
+    const request = startSpan("http /robot/run_policy", root.trace_id, root.span_id);
+    let data;
+    try {
+      const resp = await fetch(`${BACKEND_URL}/robot/run_policy`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json", traceparent: traceparent(request) },
+        body: JSON.stringify({ policy_name: name, params: args }),
+      });
+      data = await resp.json();
+      endSpan(request);
+    } catch (e) {
+      endSpan(request, `error: ${e.message}`);
+      endSpan(root, `error: ${e.message}`);
+      throw e;
+    }
     log(`Policy finished: ${name}`, data);
+    const capture = startSpan("capture_after_skill", root.trace_id, root.span_id);
     try {
-      await captureAndDisplayRobotImage();
+      await captureAndDisplayRobotImage(capture);
     } catch (e) {}
+    endSpan(capture);
     sendEvent({
       type: "conversation.item.create",
       item: { type: "function_call_output", call_id: call_id, output: JSON.stringify(data) },
     });
     sendEvent({ type: "response.create" });
+    endSpan(root);
     return;
   }
 }
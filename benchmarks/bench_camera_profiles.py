@@ -0,0 +1,72 @@
+import json
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, '.')
+
+from src.config.ports_and_cameras import CAMERA_PROFILES, CAMERA_INDICES, FPS
+
+NUM_TICKS = 100
+
+
+def _stage_bytes(capture: tuple, output: tuple) -> dict:
+    capture_w, capture_h = capture
+    out_w, out_h = output
+    capture_bytes = capture_w * capture_h * 3
+    out_bytes = out_w * out_h * 3
+    stages = {
+        "decode_bgr": capture_bytes,
+        "bgr_to_rgb": capture_bytes,
+        "resize": out_bytes if output != capture else 0,
+        "observation_copy": out_bytes,
+        "rerun_log": out_bytes,
+        "preprocessor_float32": out_bytes * 4,
+        "normalize_float32": out_bytes * 4,
+    }
+    stages["total"] = sum(stages.values())
+    return stages
+
+
+def _time_capture_path(capture: tuple, output: tuple, num_ticks: int) -> float:
+    capture_w, capture_h = capture
+    frame = np.random.randint(0, 255, (capture_h, capture_w, 3), dtype=np.uint8)
+    t0 = time.perf_counter()
+    for _ in range(num_ticks):
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if output != capture:
+            rgb = cv2.resize(rgb, output, interpolation=cv2.INTER_AREA)
+        tensor = rgb.astype(np.float32) / 255.0
+        _ = (tensor - 0.5) / 0.25
+    return (time.perf_counter() - t0) / num_ticks * 1000
+
+
+def bench_camera_profiles(num_ticks: int | None = None) -> dict:
+    ticks = num_ticks or NUM_TICKS
+    num_cameras = len(CAMERA_INDICES)
+    results = {}
+    for name, spec in CAMERA_PROFILES.items():
+        stages = _stage_bytes(spec["capture"], spec["output"])
+        per_camera_ms = _time_capture_path(spec["capture"], spec["output"], ticks)
+        results[name] = {
+            "capture": list(spec["capture"]),
+            "output": list(spec["output"]),
+            "bytes_per_tick": {k: v * num_cameras for k, v in stages.items()},
+            "mb_per_s": stages["total"] * num_cameras * FPS / 1e6,
+            "cpu_ms_per_tick": per_camera_ms * num_cameras,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    results = bench_camera_profiles()
+    print(f"{'profile':<12} {'capture':>10} {'output':>10} {'MB/tick':>9} {'MB/s':>8} {'ms/tick':>8}")
+    for name, r in results.items():
+        capture = "x".join(map(str, r["capture"]))
+        output = "x".join(map(str, r["output"]))
+        mb_tick = r["bytes_per_tick"]["total"] / 1e6
+        print(f"{name:<12} {capture:>10} {output:>10} {mb_tick:>9.1f} {r['mb_per_s']:>8.0f} {r['cpu_ms_per_tick']:>8.2f}")
+    if "--json" in sys.argv:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,124 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+from benchmarks.openai_stub import _free_port, start_openai_stub
+
+BACKEND_MODULE = "ai_assistant.backend.main"
+# Must not be imported by the backend at module load; they belong to warmup.py or first use
+HEAVY_MODULES = ["torch", "lerobot", "cv2", "numpy", "rerun", "av", "transformers"]
+IMPORT_BUDGET_MS = 400
+SERVE_BUDGET_MS = 1500  # process start -> first 200 from "/", includes interpreter start
+TOP_N = 15
+
+
+def importtime_report(module: str = BACKEND_MODULE) -> dict:
+    # Parses `python -X importtime` output: "import time: self [us] | cumulative | imported package",
+    # where nesting is shown by indentation of the package name.
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "BACKEND_WARMUP": "0"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append(
+            {
+                "module": name.strip(),
+                "depth": depth,
+                "self_ms": int(self_us) / 1e3,
+                "cumulative_ms": int(cumulative_us) / 1e3,
+            }
+        )
+    top_level = [e for e in entries if e["depth"] == 0]
+    loaded = {e["module"].split(".")[0] for e in entries}
+    return {
+        "total_ms": sum(e["cumulative_ms"] for e in top_level),
+        "top": sorted(top_level, key=lambda e: -e["cumulative_ms"])[:TOP_N],
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in loaded],
+        "modules": len(entries),
+    }
+
+
+def time_to_serving() -> dict:
+    port = _free_port()
+    env = {**os.environ, "OPENAI_API_BASE": start_openai_stub(), "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-stub")}
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{BACKEND_MODULE}:app", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root,
+        env=env,
+    )
+    result = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30.0) as client:
+            while time.perf_counter() - t0 < 60:
+                try:
+                    if client.get("/").status_code == 200:
+                        result["root_ms"] = (time.perf_counter() - t0) * 1e3
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            t1 = time.perf_counter()
+            r = client.post("/session")
+            result["session_ms"] = (time.perf_counter() - t0) * 1e3
+            result["session_request_ms"] = (time.perf_counter() - t1) * 1e3
+            result["session_ok"] = r.status_code == 200 and "ephemeral_key" in r.json()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return result
+
+
+def bench_import_time() -> dict:
+    return {
+        "benchmark": "import_time",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "import": importtime_report(),
+        "serving": time_to_serving(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend import time and time to first response")
+    parser.add_argument("--max-import-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--max-serve-ms", type=float, default=SERVE_BUDGET_MS)
+    args = parser.parse_args()
+
+    results = bench_import_time()
+    report, serving = results["import"], results["serving"]
+    print(f"import {BACKEND_MODULE}: {report['total_ms']:.0f} ms, {report['modules']} modules")
+    for e in report["top"]:
+        print(f"  {e['cumulative_ms']:>8.1f} ms  {e['module']}")
+    print(f"process start -> GET / 200: {serving.get('root_ms', float('nan')):.0f} ms")
+    print(f"process start -> POST /session done: {serving.get('session_ms', float('nan')):.0f} ms (ok={serving.get('session_ok')})")
+    print(f"Results: {write_results(results, 'import_time')}")
+
+    failures = []
+    if report["heavy_loaded"]:
+        failures.append(f"heavy modules imported at backend load: {', '.join(report['heavy_loaded'])}")
+    if report["total_ms"] > args.max_import_ms:
+        failures.append(f"import {report['total_ms']:.0f} ms > budget {args.max_import_ms:.0f} ms")
+    if serving.get("root_ms", float("inf")) > args.max_serve_ms:
+        failures.append(f"first response {serving.get('root_ms', float('inf')):.0f} ms > budget {args.max_serve_ms:.0f} ms")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
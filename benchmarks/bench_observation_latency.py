@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("ROBOT_BACKEND", "sim")
+os.environ["OBS_PARALLEL"] = "1"
+
+from benchmarks._results import write_results
+
+NUM_TICKS = 300
+
+
+def _percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _measure(get_observation, num_ticks: int, fps: int) -> dict:
+    # Paced like record_loop, so cameras deliver at their own rate between ticks
+    latencies = []
+    next_t = time.perf_counter()
+    for _ in range(num_ticks):
+        t0 = time.perf_counter()
+        get_observation()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        next_t += 1.0 / fps
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+    return {
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+        "max_ms": max(latencies),
+    }
+
+
+def bench_observation_latency(num_ticks: int = NUM_TICKS, profile: str = "infer-fast") -> dict:
+    from src.config.ports_and_cameras import FPS, ROBOT_BACKEND, cameras_for_profile
+    from src.hardware.connect import make_robot
+
+    robot = make_robot(cameras_for_profile(profile))
+    robot.connect()
+    try:
+        aggregator = robot.observation_aggregator
+        sequential = _measure(aggregator.sequential_get_observation, num_ticks, FPS)
+        parallel = _measure(robot.get_observation, num_ticks, FPS)
+        stale = aggregator.stale
+    finally:
+        robot.disconnect()
+    return {
+        "benchmark": "observation_latency",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "backend": ROBOT_BACKEND,
+        "profile": profile,
+        "cameras": len(robot.cameras),
+        "ticks": num_ticks,
+        "sequential": sequential,
+        "parallel": parallel,
+        "parallel_stale": stale,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follower get_observation latency: sequential vs parallel reads")
+    parser.add_argument("--ticks", type=int, default=NUM_TICKS)
+    parser.add_argument("--profile", default="infer-fast", help="camera profile from ports_and_cameras.py")
+    args = parser.parse_args()
+
+    results = bench_observation_latency(args.ticks, args.profile)
+    print(f"{results['backend']} follower, {results['cameras']} cameras ({results['profile']}), {results['ticks']} ticks")
+    for mode in ("sequential", "parallel"):
+        r = results[mode]
+        print(f"  {mode:<10} mean {r['mean_ms']:6.1f} ms   p50 {r['p50_ms']:6.1f}   p95 {r['p95_ms']:6.1f}   max {r['max_ms']:6.1f}")
+    print(f"  stale parallel observations: {results['parallel_stale']}")
+    print(f"Results: {write_results(results, 'observation_latency')}")
@@ -0,0 +1,257 @@
+import argparse
+import importlib
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+
+# Policies referenced by the inference scripts: name -> (policy type, script module)
+POLICY_SCRIPTS = {
+    "act_pick_and_place": ("act", "scripts.run_inference_pick_and_place"),
+    "act_use_slicer": ("act", "scripts.run_inference_use_slicer"),
+    "act_transfer_slices": ("act", "scripts.run_inference_transfer_slices"),
+    "smolvla_pick_and_place": ("smolvla", "scripts.run_inference_smolvla_pick_and_place"),
+    "smolvla_use_slicer": ("smolvla", "scripts.run_inference_smolvla_use_slicer"),
+    "smolvla_transfer_slices": ("smolvla", "scripts.run_inference_smolvla_transfer_slices"),
+}
+NUM_CHUNKS = 10  # chunk-boundary samples per policy
+WARMUP_CHUNKS = 1
+SCALING_CHUNKS = 3
+THREAD_COUNTS = [1, 2, 4, os.cpu_count() or 1]
+TASK = "Pick carrot from plate and place on cutting board"
+MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
+
+
+def model_id_for(script_module: str) -> str:
+    module = importlib.import_module(script_module)
+    return getattr(module, "HF_MODEL_ID_DEFAULT", None) or module.HF_MODEL_ID
+
+
+def _random_config(policy_type: str, model_id: str):
+    # Same config as the checkpoint when it can be resolved (cache or hub), otherwise the
+    # default config with this robot's features at the configured camera resolution.
+    from lerobot.configs.policies import PreTrainedConfig
+    from lerobot.configs.types import FeatureType, PolicyFeature
+    from lerobot.policies.factory import make_policy_config
+    from src.config.ports_and_cameras import camera_config
+
+    try:
+        return PreTrainedConfig.from_pretrained(model_id)
+    except Exception:
+        pass
+    cfg = make_policy_config(policy_type, device="cpu")
+    cfg.input_features = {
+        "observation.state": PolicyFeature(type=FeatureType.STATE, shape=(len(MOTOR_NAMES),)),
+        **{
+            f"observation.images.{name}": PolicyFeature(type=FeatureType.VISUAL, shape=(3, cam.height, cam.width))
+            for name, cam in camera_config.items()
+        },
+    }
+    cfg.output_features = {"action": PolicyFeature(type=FeatureType.ACTION, shape=(len(MOTOR_NAMES),))}
+    return cfg
+
+
+def _load(policy_type: str, model_id: str, offline: bool):
+    import torch
+    from lerobot.policies.factory import get_policy_class, make_pre_post_processors
+
+    policy_cls = get_policy_class(policy_type)
+    if offline:
+        cfg = _random_config(policy_type, model_id)
+        cfg.device = "cpu"
+        policy = policy_cls(cfg)
+        preprocessor, postprocessor = make_pre_post_processors(policy_cfg=cfg, dataset_stats=None)
+    else:
+        from src.models.store import resolve_model
+
+        model_path = resolve_model(model_id)
+        policy = policy_cls.from_pretrained(model_path)
+        policy.config.device = "cpu"
+        preprocessor, postprocessor = make_pre_post_processors(
+            policy_cfg=policy.config,
+            pretrained_path=model_path,
+            preprocessor_overrides={"device_processor": {"device": "cpu"}},
+        )
+    policy.to(torch.device("cpu"))
+    policy.eval()
+    return policy, preprocessor, postprocessor
+
+
+def _synthetic_observation(policy, rng) -> dict:
+    obs = {"observation.state": rng.uniform(-50, 50, len(MOTOR_NAMES)).astype(np.float32)}
+    for key, feature in policy.config.image_features.items():
+        _, height, width = feature.shape
+        obs[key] = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return obs
+
+
+def _percentiles_ms(samples: list) -> dict:
+    if not samples:
+        return {}
+    arr = np.asarray(samples) * 1e3
+    return {
+        "n": len(samples),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+    }
+
+
+def _run_steps(policy, preprocessor, postprocessor, num_chunks: int, rng) -> tuple[list, list]:
+    import torch
+    from lerobot.utils.control_utils import predict_action
+
+    cfg = policy.config
+    every_step_is_boundary = getattr(cfg, "temporal_ensemble_coeff", None) is not None
+    steps_per_chunk = 1 if every_step_is_boundary else cfg.n_action_steps
+    policy.reset()
+    preprocessor.reset()
+    postprocessor.reset()
+
+    boundary, cached = [], []
+    for step in range(num_chunks * steps_per_chunk):
+        obs = _synthetic_observation(policy, rng)
+        t0 = time.perf_counter()
+        predict_action(
+            observation=obs,
+            policy=policy,
+            device=torch.device("cpu"),
+            preprocessor=preprocessor,
+            postprocessor=postprocessor,
+            use_amp=False,
+            task=TASK,
+            robot_type="so101_follower",
+        )
+        dt = time.perf_counter() - t0
+        (boundary if step % steps_per_chunk == 0 else cached).append(dt)
+    return boundary, cached
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def _bench_one(name: str, policy_type: str, model_id: str, offline: bool, num_chunks: int) -> dict:
+    import torch
+
+    rng = np.random.default_rng(0)
+    t0 = time.perf_counter()
+    policy, preprocessor, postprocessor = _load(policy_type, model_id, offline)
+    load_s = time.perf_counter() - t0
+
+    default_threads = torch.get_num_threads()
+    _run_steps(policy, preprocessor, postprocessor, WARMUP_CHUNKS, rng)
+    boundary, cached = _run_steps(policy, preprocessor, postprocessor, num_chunks, rng)
+
+    scaling = {}
+    for n in sorted(set(THREAD_COUNTS)):
+        torch.set_num_threads(n)
+        b, _ = _run_steps(policy, preprocessor, postprocessor, SCALING_CHUNKS, rng)
+        scaling[str(n)] = _percentiles_ms(b)
+    torch.set_num_threads(default_threads)
+
+    return {
+        "policy": name,
+        "model_id": model_id,
+        "weights": "random" if offline else "pretrained",
+        "image_shapes": {k: list(f.shape) for k, f in policy.config.image_features.items()},
+        "n_action_steps": policy.config.n_action_steps,
+        "load_s": load_s,
+        "threads": default_threads,
+        "chunk_boundary_ms": _percentiles_ms(boundary),
+        "cached_chunk_ms": _percentiles_ms(cached),
+        "thread_scaling_boundary_ms": scaling,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _worker(args: tuple, queue) -> None:
+    try:
+        queue.put(_bench_one(*args))
+    except Exception as e:
+        queue.put({"policy": args[0], "error": repr(e)})
+
+
+def bench_policy_inference(names: list | None = None, offline: bool = False, num_chunks: int | None = None) -> dict:
+    # Each policy runs in a fresh process so peak RSS and thread pools don't leak between them
+    ctx = mp.get_context("spawn")
+    results = {}
+    for name in names or list(POLICY_SCRIPTS):
+        policy_type, script = POLICY_SCRIPTS[name]
+        queue = ctx.Queue()
+        args = (name, policy_type, model_id_for(script), offline, num_chunks or NUM_CHUNKS)
+        proc = ctx.Process(target=_worker, args=(args, queue))
+        proc.start()
+        results[name] = queue.get()
+        proc.join()
+        print(_format_row(results[name]))
+    return {
+        "benchmark": "policy_inference",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "policies": results,
+    }
+
+
+def _format_row(r: dict) -> str:
+    if "error" in r:
+        return f"{r['policy']:<26} ERROR {r['error']}"
+    b, c = r["chunk_boundary_ms"], r["cached_chunk_ms"]
+    cached = f"{c['p50']:.1f}/{c['p95']:.1f}/{c['p99']:.1f}" if c else "n/a"
+    return (
+        f"{r['policy']:<26} boundary p50/p95/p99 {b['p50']:.1f}/{b['p95']:.1f}/{b['p99']:.1f} ms   "
+        f"cached {cached} ms   peak RSS {r['peak_rss_mb']:.0f} MB"
+    )
+
+
+def check_regressions(results: dict, max_boundary_p95_ms: float | None, baseline: dict | None, tolerance: float) -> list:
+    failures = []
+    for name, r in results["policies"].items():
+        if "error" in r:
+            failures.append(f"{name}: {r['error']}")
+            continue
+        p95 = r["chunk_boundary_ms"]["p95"]
+        if max_boundary_p95_ms is not None and p95 > max_boundary_p95_ms:
+            failures.append(f"{name}: boundary p95 {p95:.1f} ms > limit {max_boundary_p95_ms:.1f} ms")
+        base = (baseline or {}).get("policies", {}).get(name)
+        if base and "chunk_boundary_ms" in base:
+            for key in ("chunk_boundary_ms", "cached_chunk_ms"):
+                if not r[key] or not base[key]:
+                    continue
+                limit = base[key]["p95"] * (1 + tolerance)
+                if r[key]["p95"] > limit:
+                    failures.append(f"{name}: {key} p95 {r[key]['p95']:.1f} ms > baseline limit {limit:.1f} ms")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-step policy inference latency on CPU")
+    parser.add_argument("--policies", nargs="*", choices=list(POLICY_SCRIPTS), help="default: all")
+    parser.add_argument("--offline", action="store_true", help="random weights with the checkpoint's config")
+    parser.add_argument("--num-chunks", type=int, default=NUM_CHUNKS)
+    parser.add_argument("--max-boundary-p95-ms", type=float, help="fail if any chunk-boundary p95 exceeds this")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 increase over baseline")
+    args = parser.parse_args()
+
+    results = bench_policy_inference(args.policies, args.offline, args.num_chunks)
+    print(f"Results: {write_results(results, 'policy_inference')}")
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    failures = check_regressions(results, args.max_boundary_p95_ms, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+
+REQUESTS = 10
+INTERVAL_S = 1.0  # between "Connect and Start" clicks, so the pool can refill
+
+
+async def _measure(pool, requests: int, interval_s: float) -> dict:
+    latencies = []
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        await pool.get()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(interval_s)
+    return {"mean_ms": statistics.fmean(latencies), "max_ms": max(latencies), **pool.stats()}
+
+
+async def _run(base_url: str, requests: int, interval_s: float, ttl_s: float) -> dict:
+    from ai_assistant.backend.realtime_session import SessionSecretPool
+
+    results = {}
+    for mode in ("on_demand", "pooled"):
+        pool = SessionSecretPool(base_url, "sk-stub", demo_mode=True, size=0 if mode == "on_demand" else 2)
+        pool.start()
+        await asyncio.sleep(0.5)  # startup: the pool fills before the first click
+        try:
+            results[mode] = await _measure(pool, requests, interval_s)
+            if mode == "pooled" and ttl_s:
+                # Idle past several expiries: the pool must still hold secrets that are not about to expire
+                await asyncio.sleep(3 * ttl_s)
+                stats = pool.stats()
+                results["after_idle"] = stats
+                results["refreshed_before_expiry"] = stats["pooled"] > 0 and stats["next_expiry_s"] > 0
+        finally:
+            await pool.stop()
+    return results
+
+
+def bench_session_pool(requests: int = REQUESTS, interval_s: float = INTERVAL_S, ttl_s: int = 0) -> dict:
+    if ttl_s:
+        # Short-lived stub secrets, refreshed a third of their lifetime before expiry
+        os.environ["STUB_SECRET_TTL_S"] = str(ttl_s)
+        os.environ["REALTIME_SECRET_REFRESH_MARGIN_S"] = str(ttl_s / 3)
+    from benchmarks.openai_stub import STUB_SECRET_LATENCY_S, start_openai_stub, stub_stats
+
+    results = asyncio.run(_run(start_openai_stub(), requests, interval_s, ttl_s))
+    return {
+        "benchmark": "session_pool",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"requests": requests, "interval_s": interval_s, "ttl_s": ttl_s, "stub_latency_s": STUB_SECRET_LATENCY_S},
+        **results,
+        "stub_calls": dict(stub_stats),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="POST /session secret latency: minted on demand vs pooled, against openai_stub.py")
+    parser.add_argument("--requests", type=int, default=REQUESTS)
+    parser.add_argument("--interval", type=float, default=INTERVAL_S)
+    parser.add_argument("--ttl", type=int, default=0, help="stub secret lifetime in seconds; also checks refresh before expiry")
+    args = parser.parse_args()
+
+    results = bench_session_pool(args.requests, args.interval, args.ttl)
+    for mode in ("on_demand", "pooled"):
+        r = results[mode]
+        print(f"{mode:<10} mean {r['mean_ms']:6.1f} ms   max {r['max_ms']:6.1f} ms   hits {r['hits']}  misses {r['misses']}")
+    if "refreshed_before_expiry" in results:
+        print(f"refreshed before expiry: {results['refreshed_before_expiry']}")
+    print(f"Results: {write_results(results, 'session_pool')}")
@@ -0,0 +1,93 @@
+import argparse
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+
+MODEL_ID = "sangam-101/act_so101_pick_and_place_carrot_policy"
+POLICY_TYPE = "act"
+NUM_WORKERS = 4
+
+
+def _worker(mode: str, model_id: str, policy_type: str, ready, done, queue) -> None:
+    import torch
+    from lerobot.policies.factory import get_policy_class
+
+    from src.models.shared_weights import WEIGHTS_FILE, local_model_dir, load_policy_shared, memory_report
+
+    torch.set_num_threads(1)
+    policy_cls = get_policy_class(policy_type)
+    path = local_model_dir(model_id)
+    if mode == "shared":
+        policy = load_policy_shared(policy_cls, model_id)
+    else:
+        policy = policy_cls.from_pretrained(path)
+        policy.to(torch.device("cpu"))
+        policy.eval()
+    # Touch every parameter, as a forward pass would
+    with torch.inference_mode():
+        checksum = float(sum(p.float().sum() for p in policy.parameters()))
+    ready.set()
+    done.wait()  # measure while all workers are alive, so shared pages are split between them
+    queue.put({"checksum": checksum, **memory_report(weights_path=path / WEIGHTS_FILE)})
+
+
+def run_workers(mode: str, num_workers: int, model_id: str, policy_type: str) -> dict:
+    ctx = mp.get_context("spawn")
+    queue, done = ctx.Queue(), ctx.Event()
+    readies = [ctx.Event() for _ in range(num_workers)]
+    procs = [
+        ctx.Process(target=_worker, args=(mode, model_id, policy_type, readies[i], done, queue))
+        for i in range(num_workers)
+    ]
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    for ready in readies:
+        ready.wait()
+    load_s = time.perf_counter() - t0
+    done.set()
+    reports = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return {
+        "workers": num_workers,
+        "load_s": load_s,
+        "total_pss_mb": sum(r.get("pss_mb", 0) for r in reports),
+        "total_private_mb": sum(r.get("private_mb", 0) for r in reports),
+        "weights_pss_mb": sum(r.get("weights_mapping", {}).get("pss_mb", 0) for r in reports),
+        "per_worker": reports,
+    }
+
+
+def bench_shared_weights(num_workers: int = NUM_WORKERS, model_id: str = MODEL_ID, policy_type: str = POLICY_TYPE) -> dict:
+    results = {mode: run_workers(mode, num_workers, model_id, policy_type) for mode in ("private", "shared")}
+    return {
+        "benchmark": "shared_weights",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "model_id": model_id,
+        **results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory of N policy workers: private copies vs shared mmap weights")
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS)
+    parser.add_argument("--model-id", default=MODEL_ID)
+    parser.add_argument("--policy-type", default=POLICY_TYPE)
+    args = parser.parse_args()
+
+    results = bench_shared_weights(args.workers, args.model_id, args.policy_type)
+    for mode in ("private", "shared"):
+        r = results[mode]
+        print(
+            f"{mode:<8} {r['workers']} workers: total PSS {r['total_pss_mb']:.0f} MB, "
+            f"private {r['total_private_mb']:.0f} MB, weights file PSS {r['weights_pss_mb']:.0f} MB, "
+            f"load {r['load_s']:.1f}s"
+        )
+    print(f"Results: {write_results(results, 'shared_weights')}")
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+from benchmarks.openai_stub import start_openai_stub, stub_stats
+
+SKILLS = ["run_pick_and_place", "run_use_slicer", "run_transfer_slices"]
+ROUNDS = 3  # first round is cold (script import, from_pretrained, connect), the rest are warm
+EPISODE_TIME_S = 3.0
+
+# Filled by the send_action hook: one entry per /robot/run_policy call
+_action_marks = {"first": None, "last": None, "count": 0}
+
+
+def _instrument_send_action() -> None:
+    from src.hardware.sim import SimSO101Follower
+
+    original = SimSO101Follower.send_action
+
+    def send_action(self, action):
+        sent = original(self, action)
+        now = time.perf_counter()
+        if _action_marks["first"] is None:
+            _action_marks["first"] = now
+        _action_marks["last"] = now
+        _action_marks["count"] += 1
+        return sent
+
+    SimSO101Follower.send_action = send_action
+
+
+def _summary(values: list) -> dict:
+    if not values:
+        return {}
+    return {
+        "n": len(values),
+        "mean": statistics.fmean(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+async def _timed(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> tuple[float, dict]:
+    t0 = time.perf_counter()
+    r = await client.request(method, url, **kwargs)
+    return time.perf_counter() - t0, r.json()
+
+
+async def _run(rounds: int, episode_time_s: float) -> dict:
+    from ai_assistant.backend.main import app
+
+    results = {"endpoints": {}, "skills": {}, "gaps_s": [], "errors": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600.0) as client:
+        dt, data = await _timed(client, "POST", "/session")
+        results["endpoints"]["session"] = dt
+        if "error" in data:
+            results["errors"].append({"endpoint": "/session", "response": data})
+
+        dt, data = await _timed(client, "GET", "/camera/capture")
+        results["endpoints"]["camera_capture_cold"] = dt
+        image = data.get("image")
+        dt, data = await _timed(client, "GET", "/camera/capture")
+        results["endpoints"]["camera_capture_warm"] = dt
+
+        dt, data = await _timed(client, "POST", "/analyze_image", json={"image": image})
+        results["endpoints"]["analyze_image"] = dt
+        if data.get("status") != "success":
+            results["errors"].append({"endpoint": "/analyze_image", "response": data})
+
+        dt, data = await _timed(client, "POST", "/analyze_scene", json={})
+        results["endpoints"]["analyze_scene"] = dt
+        results["analyze_scene_usage"] = data.get("usage")
+        if data.get("status") != "success":
+            results["errors"].append({"endpoint": "/analyze_scene", "response": data})
+
+        prev_last_action = None
+        for round_idx in range(rounds):
+            for skill in SKILLS:
+                _action_marks.update(first=None, last=None, count=0)
+                t0 = time.perf_counter()
+                r = await client.post(
+                    "/robot/run_policy",
+                    json={"policy_name": skill, "params": {"episode_time_s": episode_time_s}},
+                )
+                wall = time.perf_counter() - t0
+                data = r.json()
+                result = str(data.get("result", ""))
+                if data.get("status") != "completed" or result.startswith("ERROR"):
+                    results["errors"].append({"skill": skill, "round": round_idx, "response": data})
+
+                entry = results["skills"].setdefault(skill, {"cold": [], "warm": []})
+                first = _action_marks["first"]
+                entry["cold" if round_idx == 0 else "warm"].append(
+                    {
+                        "wall_s": wall,
+                        "first_action_s": first - t0 if first is not None else None,
+                        "actions": _action_marks["count"],
+                    }
+                )
+                if prev_last_action is not None and first is not None:
+                    results["gaps_s"].append(first - prev_last_action)
+                prev_last_action = _action_marks["last"]
+
+                # The frontend captures a frame between skills; keep that in the gap
+                await client.get("/camera/capture")
+    return results
+
+
+def bench_skill_latency(rounds: int | None = None, episode_time_s: float | None = None) -> dict:
+    rounds = rounds or ROUNDS
+    episode_time_s = episode_time_s or EPISODE_TIME_S
+
+    os.environ["ROBOT_BACKEND"] = "sim"
+    os.environ.setdefault("VIZ_MODE", "off")
+    os.environ["OPENAI_API_BASE"] = start_openai_stub()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-stub")
+    _instrument_send_action()
+
+    raw = asyncio.run(_run(rounds, episode_time_s))
+
+    summary = {"endpoints_s": raw["endpoints"], "skills": {}, "inter_skill_gap_s": _summary(raw["gaps_s"])}
+    for skill, runs in raw["skills"].items():
+        summary["skills"][skill] = {}
+        for phase in ("cold", "warm"):
+            first = [r["first_action_s"] for r in runs[phase] if r["first_action_s"] is not None]
+            summary["skills"][skill][phase] = {
+                "first_action_s": _summary(first),
+                "wall_s": _summary([r["wall_s"] for r in runs[phase]]),
+            }
+    return {
+        "benchmark": "skill_latency",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"rounds": rounds, "episode_time_s": episode_time_s, "skills": SKILLS},
+        "summary": summary,
+        "raw": raw,
+        "stub_calls": dict(stub_stats),
+    }
+
+
+if __name__ == "__main__":
+    results = bench_skill_latency()
+    for skill, phases in results["summary"]["skills"].items():
+        for phase, s in phases.items():
+            first = s["first_action_s"].get("mean")
+            wall = s["wall_s"].get("mean")
+            first_str = f"{first:.2f}s" if first is not None else "n/a"
+            print(f"{skill:<22} {phase:<5} first action {first_str:>7}   wall {wall:.2f}s")
+    gap = results["summary"]["inter_skill_gap_s"].get("mean")
+    if gap is not None:
+        print(f"inter-skill gap (mean): {gap:.2f}s")
+    if results["raw"]["errors"]:
+        print(f"{len(results['raw']['errors'])} errors, see JSON")
+    print(f"Results: {write_results(results, 'skill_latency')}")
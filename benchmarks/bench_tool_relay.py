@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+from benchmarks.load_backend import start_backend
+from benchmarks.openai_stub import stub_sideband_log, stub_stats, stub_tool_calls
+
+TIMEOUT_S = 300.0
+
+
+def bench_tool_relay(timeout_s: float = TIMEOUT_S) -> dict:
+    # The backend (sim robot) attaches to the stub's sideband socket and answers stub_tool_calls;
+    # the stub times each call from sending it to receiving its function_call_output
+    os.environ["REALTIME_RELAY"] = "1"
+    base_url = start_backend()
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        attach = client.post("/realtime/attach", json={"call_id": "rtc_stub"}).json()
+        deadline = time.perf_counter() + timeout_s
+        while len(stub_sideband_log) < len(stub_tool_calls) and time.perf_counter() < deadline:
+            time.sleep(0.1)
+        relay = client.get("/realtime/relay").json()
+    return {
+        "benchmark": "tool_relay",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "attach": attach,
+        "calls": list(stub_sideband_log),
+        "complete": len(stub_sideband_log) == len(stub_tool_calls),
+        "answered_once": stub_stats["sideband_outputs"] == stub_stats["sideband_tool_calls"],
+        "relay": relay,
+        "stub_calls": dict(stub_stats),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend tool-call relay over the realtime sideband connection, against openai_stub.py")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_S)
+    args = parser.parse_args()
+
+    results = bench_tool_relay(args.timeout)
+    for call in results["calls"]:
+        print(f"  {call['name']:<22} {call['seconds'] * 1000:8.0f} ms   {call['output'].get('status')}")
+    print(f"all calls answered: {results['complete']}   each answered once: {results['answered_once']}")
+    print(f"Results: {write_results(results, 'tool_relay')}")
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks._results import write_results
+from benchmarks.openai_stub import _free_port, start_openai_stub
+
+# Concurrent clients per endpoint. "/" is a probe: on a healthy loop it answers in ~1 ms, so its
+# tail latency is how long the UI would have been frozen.
+CONCURRENCY = {
+    "GET /": 1,
+    "GET /camera/capture": 4,
+    "POST /analyze_image": 2,
+    "POST /session": 2,
+    "POST /robot/run_policy": 1,
+}
+DURATION_S = 30.0
+PROBE_INTERVAL_S = 0.05
+EPISODE_TIME_S = 3.0
+SKILLS = ["run_pick_and_place", "run_use_slicer", "run_transfer_slices"]
+
+
+def _percentiles_ms(samples: list) -> dict:
+    if not samples:
+        return {}
+    arr = np.asarray(samples) * 1e3
+    return {
+        "n": len(arr),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+        "max": float(arr.max()),
+    }
+
+
+def start_backend(port: int | None = None) -> str:
+    # Runs the real backend app under uvicorn on a background thread (sim robot, OpenAI stub),
+    # so startup/shutdown events and the loop monitor behave as in production.
+    import uvicorn
+
+    os.environ["ROBOT_BACKEND"] = "sim"
+    os.environ.setdefault("VIZ_MODE", "off")
+    os.environ["OPENAI_API_BASE"] = start_openai_stub()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-stub")
+    from ai_assistant.backend.main import app
+
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="backend", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+async def _client(client: httpx.AsyncClient, endpoint: str, worker: int, deadline: float, image: str, samples: dict) -> None:
+    method, path = endpoint.split(" ", 1)
+    i = worker
+    while time.perf_counter() < deadline:
+        kwargs = {}
+        if path == "/analyze_image":
+            kwargs["json"] = {"image": image}
+        elif path == "/robot/run_policy":
+            kwargs["json"] = {"policy_name": SKILLS[i % len(SKILLS)], "params": {"episode_time_s": EPISODE_TIME_S}}
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            r = await client.request(method, path, **kwargs)
+            ok = r.status_code == 200 and r.json().get("status") not in ("error",) and "error" not in r.json()
+        except Exception:
+            ok = False
+        samples[endpoint]["latency"].append(time.perf_counter() - t0)
+        if not ok:
+            samples[endpoint]["errors"] += 1
+        if path == "/":
+            await asyncio.sleep(PROBE_INTERVAL_S)
+
+
+async def _run(base_url: str, concurrency: dict, duration_s: float) -> dict:
+    samples = {endpoint: {"latency": [], "errors": 0} for endpoint in concurrency}
+    async with httpx.AsyncClient(base_url=base_url, timeout=600.0) as client:
+        image = (await client.get("/camera/capture")).json().get("image")
+        deadline = time.perf_counter() + duration_s
+        await asyncio.gather(
+            *(
+                _client(client, endpoint, worker, deadline, image, samples)
+                for endpoint, n in concurrency.items()
+                for worker in range(n)
+            )
+        )
+        server_stats = (await client.get("/debug/perf")).json()
+    return {
+        "client_ms": {
+            endpoint: {**_percentiles_ms(s["latency"]), "errors": s["errors"]} for endpoint, s in samples.items()
+        },
+        "server": server_stats,
+    }
+
+
+def load_backend(url: str | None = None, concurrency: dict | None = None, duration_s: float | None = None) -> dict:
+    concurrency = concurrency or CONCURRENCY
+    duration_s = duration_s or DURATION_S
+    base_url = url or start_backend()
+    raw = asyncio.run(_run(base_url, concurrency, duration_s))
+    return {
+        "benchmark": "load_backend",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"url": url or "in-process (sim)", "concurrency": concurrency, "duration_s": duration_s},
+        **raw,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load on the backend with event-loop stall report")
+    parser.add_argument("--url", help="running backend, e.g. http://127.0.0.1:8000 (default: start one with the sim robot)")
+    parser.add_argument("--duration-s", type=float, default=DURATION_S)
+    args = parser.parse_args()
+
+    results = load_backend(args.url, duration_s=args.duration_s)
+    print(f"{'endpoint':<26} {'n':>5} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (client ms)")
+    for endpoint, s in results["client_ms"].items():
+        if s.get("n"):
+            print(
+                f"{endpoint:<26} {s['n']:>5} {s['errors']:>4} "
+                f"{s['p50']:>8.1f} {s['p95']:>8.1f} {s['p99']:>8.1f} {s['max']:>8.1f}"
+            )
+    server = results["server"]
+    lag = server.get("loop_lag_ms", {})
+    if lag:
+        print(f"loop lag p50/p95/p99/max {lag['p50']:.1f}/{lag['p95']:.1f}/{lag['p99']:.1f}/{lag['max']:.1f} ms")
+    stalls = server.get("stalls", [])
+    print(f"{len(stalls)} loop stalls > {server.get('threshold_ms', 0):.0f} ms")
+    for stall in sorted(stalls, key=lambda s: -s["blocked_ms"])[:5]:
+        where = stall["stack"][-1].strip().splitlines()[0] if stall["stack"] else "?"
+        print(f"  {stall['blocked_ms']:7.1f} ms  {where}")
+    print(f"Results: {write_results(results, 'load_backend')}")
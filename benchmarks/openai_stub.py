@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket
+
+# Local stand-in for the OpenAI endpoints the backend calls. Latencies are configurable so
+# benchmarks can model the upstream instead of measuring the internet.
+STUB_SECRET_LATENCY_S = float(os.getenv("STUB_SECRET_LATENCY_S", "0.15"))
+STUB_VISION_LATENCY_S = float(os.getenv("STUB_VISION_LATENCY_S", "1.5"))
+STUB_SECRET_TTL_S = int(os.getenv("STUB_SECRET_TTL_S", "600"))
+
+stub_app = FastAPI()
+stub_stats = {"client_secrets": 0, "chat_completions": 0, "sideband_tool_calls": 0, "sideband_outputs": 0}
+# Tool calls the sideband stub issues, in order, each after the previous one's output arrived
+stub_tool_calls = [
+    ("capture_scene", {"skip_analysis": True}),
+    ("capture_scene", {}),
+    ("run_pick_and_place", {"episode_time_s": 3}),
+]
+# One entry per tool call: name, seconds from sending the call to receiving its output, output
+stub_sideband_log = []
+
+
+@stub_app.post("/v1/realtime/client_secrets")
+async def client_secrets(request: Request):
+    await request.json()
+    stub_stats["client_secrets"] += 1
+    await asyncio.sleep(STUB_SECRET_LATENCY_S)
+    return {"value": f"ek_stub_{uuid.uuid4().hex}", "expires_at": int(time.time()) + STUB_SECRET_TTL_S}
+
+
+@stub_app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stub_stats["chat_completions"] += 1
+    await asyncio.sleep(STUB_VISION_LATENCY_S)
+    images = [
+        part["image_url"]
+        for message in body.get("messages", [])
+        for part in (message.get("content") if isinstance(message.get("content"), list) else [])
+        if part.get("type") == "image_url"
+    ]
+    # Roughly what the API bills: 85 tokens for a low-detail image, 765 for a 1024px high-detail one
+    image_tokens = sum(85 if image.get("detail") == "low" else 765 for image in images)
+    if body.get("response_format", {}).get("type") == "json_schema":
+        content = json.dumps(
+            {"scene_state": "Stub: one carrot on the plate, cutting board empty, gripper open.", "next_step": "run_pick_and_place", "confidence": 0.9}
+        )
+    else:
+        content = "Stub analysis: one carrot on the plate, cutting board empty. Next step: pick and place."
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:8]}",
+        "model": body.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": content,
+                },
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 85 + image_tokens, "completion_tokens": 24, "total_tokens": 109 + image_tokens},
+    }
+
+
+@stub_app.websocket("/v1/realtime")
+async def realtime_sideband(websocket: WebSocket, call_id: str):
+    # Stands in for a realtime call's sideband connection: plays the model's side of stub_tool_calls
+    await websocket.accept()
+    await websocket.send_json({"type": "session.created", "session": {"id": f"sess_stub_{call_id}"}})
+    for name, args in stub_tool_calls:
+        tool_call_id = f"call_{uuid.uuid4().hex[:12]}"
+        item = {"type": "function_call", "name": name, "call_id": tool_call_id, "arguments": json.dumps(args)}
+        sent = time.perf_counter()
+        await websocket.send_json({"type": "response.function_call_arguments.done", **item})
+        # The real API repeats the call in response.done; the relay must answer it once
+        await websocket.send_json({"type": "response.done", "response": {"output": [item]}})
+        stub_stats["sideband_tool_calls"] += 1
+        output = None
+        while True:
+            event = await websocket.receive_json()
+            if event.get("type") == "conversation.item.create" and event["item"].get("type") == "function_call_output":
+                stub_stats["sideband_outputs"] += 1
+            if event.get("type") == "conversation.item.create" and event["item"].get("call_id") == tool_call_id:
+                output = json.loads(event["item"]["output"])
+                stub_sideband_log.append({"name": name, "seconds": time.perf_counter() - sent, "output": output})
+            elif event.get("type") == "response.create" and output is not None:
+                break
+    await websocket.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_openai_stub(port: int | None = None) -> str:
+    # Runs the stub on a background thread and returns its base URL (use as OPENAI_API_BASE)
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="openai_stub", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}/v1"
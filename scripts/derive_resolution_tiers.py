@@ -0,0 +1,129 @@
+import shutil
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import av
+import numpy as np
+from lerobot.datasets.compute_stats import RunningQuantileStats, aggregate_stats
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+from lerobot.datasets.utils import load_info, load_stats, write_info, write_stats
+from lerobot.utils.constants import HF_LEROBOT_HOME
+
+# Change these to the dataset and resolutions you want to derive
+SOURCE_REPO_ID = "sangam-101/so101-pick-and-place-carrot"
+TIERS = [(640, 360), (320, 180)]
+NUM_WORKERS = 4
+STATS_FRAME_STRIDE = 10  # decode every Nth frame when recomputing image stats
+
+FFMPEG_ENCODERS = {"av1": "libsvtav1", "h264": "libx264", "hevc": "libx265"}
+
+
+def derived_repo_id(source_repo_id: str, width: int, height: int) -> str:
+    return f"{source_repo_id}-{width}x{height}"
+
+
+def _transcode_video(src_path: str, dst_path: str, width: int, height: int, codec: str, pix_fmt: str) -> dict:
+    Path(dst_path).parent.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-i", src_path,
+        "-vf", f"scale={width}:{height}:flags=area",
+        # Keep every frame and its original timestamp; episode from/to timestamps point into these files
+        "-fps_mode", "passthrough",
+        "-c:v", FFMPEG_ENCODERS.get(codec, "libsvtav1"),
+        "-pix_fmt", pix_fmt,
+        "-g", "2",
+        "-crf", "30",
+        "-an",
+        dst_path,
+    ]
+    subprocess.run(cmd, check=True)
+
+    # Recompute per-channel image stats on the downscaled frames, same layout as compute_episode_stats
+    running = RunningQuantileStats()
+    num_frames = 0
+    with av.open(dst_path) as container:
+        for i, frame in enumerate(container.decode(video=0)):
+            if i % STATS_FRAME_STRIDE:
+                continue
+            pixels = frame.to_ndarray(format="rgb24").reshape(-1, 3).astype(np.float32) / 255.0
+            running.update(pixels)
+            num_frames += 1
+    stats = running.get_statistics()
+    return {
+        k: np.array([num_frames]) if k == "count" else v.reshape(3, 1, 1)
+        for k, v in stats.items()
+    }
+
+
+def _transcode_job(job: tuple) -> tuple[str, dict]:
+    video_key, src_path, dst_path, width, height, codec, pix_fmt = job
+    return video_key, _transcode_video(src_path, dst_path, width, height, codec, pix_fmt)
+
+
+def derive_resolution_dataset(
+    source_repo_id: str | None = None,
+    width: int = 640,
+    height: int = 360,
+    num_workers: int | None = None,
+) -> str:
+    src_repo_id = source_repo_id or SOURCE_REPO_ID
+    workers = num_workers if num_workers is not None else NUM_WORKERS
+    dst_repo_id = derived_repo_id(src_repo_id, width, height)
+
+    meta = LeRobotDatasetMetadata(src_repo_id)
+    src_root = meta.root
+    if not (src_root / "videos").exists():
+        print(f"Downloading {src_repo_id} videos...")
+        meta.pull_from_repo()
+
+    dst_root = HF_LEROBOT_HOME / dst_repo_id
+    if dst_root.exists():
+        shutil.rmtree(dst_root)
+    # Parquet data and episode metadata are resolution independent, copy them as is
+    shutil.copytree(src_root, dst_root, ignore=shutil.ignore_patterns("videos", "images"))
+
+    jobs = []
+    for video_key in meta.video_keys:
+        video_info = meta.features[video_key].get("info", {})
+        codec = video_info.get("video.codec", "av1")
+        pix_fmt = video_info.get("video.pix_fmt", "yuv420p")
+        for src_path in sorted((src_root / "videos" / video_key).glob("chunk-*/file-*.mp4")):
+            dst_path = dst_root / src_path.relative_to(src_root)
+            jobs.append((video_key, str(src_path), str(dst_path), width, height, codec, pix_fmt))
+
+    print(f"Re-encoding {len(jobs)} video files to {width}x{height} with {workers} workers...")
+    stats_by_key = defaultdict(list)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for video_key, file_stats in pool.map(_transcode_job, jobs):
+            stats_by_key[video_key].append({video_key: file_stats})
+
+    info = load_info(dst_root)
+    for video_key in meta.video_keys:
+        feature = info["features"][video_key]
+        names = feature.get("names") or ["height", "width", "channels"]
+        channels = feature["shape"][names.index("channels")]
+        dims = {"height": height, "width": width, "channels": channels}
+        feature["shape"] = [dims[name] for name in names]
+        if "info" in feature:
+            feature["info"]["video.height"] = height
+            feature["info"]["video.width"] = width
+    # Training copies these feature shapes into the policy config's input_features,
+    # which is what inference reads to pick its capture resolution.
+    info["derived_from"] = {"repo_id": src_repo_id, "width": width, "height": height}
+    write_info(info, dst_root)
+
+    stats = load_stats(dst_root) or {}
+    for video_key, per_file in stats_by_key.items():
+        stats.update(aggregate_stats(per_file))
+    write_stats(stats, dst_root)
+
+    print(f"✓ Derived {dst_repo_id} at {dst_root}")
+    return dst_repo_id
+
+
+if __name__ == "__main__":
+    for tier_width, tier_height in TIERS:
+        derive_resolution_dataset(width=tier_width, height=tier_height)
@@ -0,0 +1,269 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import av
+import cv2
+import numpy as np
+import pyarrow.parquet as pq
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+
+sys.path.insert(0, '.')
+
+# Skill -> (recorded dataset, default checkpoint, task). Pass --model-id to evaluate a new checkpoint.
+EVAL_SETS = {
+    "pick_and_place": (
+        "sangam-101/so101-pick-and-place-carrot",
+        "sangam-101/act_so101_pick_and_place_carrot_policy",
+        "Pick carrot from plate and place on cutting board",
+    ),
+    "use_slicer": (
+        "sangam-101/so101-slicer-to-slice-carrot",
+        "sangam-101/act_so101_slicer_to_slice_carrot_policy",
+        "pick slicer from stand, slice carrot and return it",
+    ),
+    "transfer_slices": (
+        "sangam-101/so101-transfer-slices-to-pile",
+        "sangam-101/act_so101_transfer_slices_to_pile",
+        "pick the sliced carrots and transfer them to the pile",
+    ),
+}
+NUM_WORKERS = 4
+BATCH_SIZE = 16  # timesteps per policy forward pass
+GRIPPER_KEY = "gripper.pos"
+
+# Set once per worker process by _init_worker
+_worker_state = {}
+
+
+def _init_worker(model_id: str, policy_type: str | None, threads: int) -> None:
+    import torch
+    from lerobot.configs.policies import PreTrainedConfig
+    from lerobot.policies.factory import get_policy_class, make_pre_post_processors
+    from src.models.shared_weights import load_policy_shared, local_model_dir
+
+    torch.set_num_threads(threads)
+    # All workers map the same weights file instead of each holding a private copy
+    model_id = str(local_model_dir(model_id))
+    policy_type = policy_type or PreTrainedConfig.from_pretrained(model_id).type
+    policy = load_policy_shared(get_policy_class(policy_type), model_id)
+    preprocessor, postprocessor = make_pre_post_processors(
+        policy_cfg=policy.config,
+        pretrained_path=model_id,
+        preprocessor_overrides={"device_processor": {"device": "cpu"}},
+    )
+    _worker_state.update(policy=policy, preprocessor=preprocessor, postprocessor=postprocessor)
+
+
+def _episode_frames(meta, episode_index: int) -> tuple[np.ndarray, np.ndarray]:
+    ep = meta.episodes[episode_index]
+    table = pq.read_table(meta.root / meta.get_data_file_path(episode_index), columns=["index", "action", "observation.state"])
+    frames = table.to_pandas()
+    frames = frames[(frames["index"] >= ep["dataset_from_index"]) & (frames["index"] < ep["dataset_to_index"])]
+    return np.stack(frames["observation.state"].to_numpy()), np.stack(frames["action"].to_numpy())
+
+
+def _episode_images(meta, episode_index: int, video_key: str, wanted: set, size: tuple[int, int]) -> dict:
+    # Decodes the episode's segment of the multi-episode video once, front to back, and keeps
+    # only the sampled frames (resized to the policy's input resolution).
+    ep = meta.episodes[episode_index]
+    from_ts = ep[f"videos/{video_key}/from_timestamp"]
+    to_ts = ep[f"videos/{video_key}/to_timestamp"]
+    width, height = size
+    images = {}
+    with av.open(str(meta.root / meta.get_video_file_path(episode_index, video_key))) as container:
+        stream = container.streams.video[0]
+        container.seek(int(from_ts / stream.time_base), stream=stream, backward=True)
+        for frame in container.decode(stream):
+            if frame.time < from_ts - 1e-4:
+                continue
+            if frame.time >= to_ts - 1e-4 or len(images) == len(wanted):
+                break
+            idx = round((frame.time - from_ts) * meta.fps)
+            if idx in wanted:
+                image = frame.to_ndarray(format="rgb24")
+                if image.shape[:2] != (height, width):
+                    image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+                images[idx] = image
+    return images
+
+
+def _predict_chunks(batch_states: np.ndarray, batch_images: dict, task: str) -> np.ndarray:
+    import torch
+
+    policy = _worker_state["policy"]
+    observation = {"observation.state": torch.from_numpy(batch_states).float()}
+    for key, images in batch_images.items():
+        observation[key] = torch.from_numpy(np.stack(images)).permute(0, 3, 1, 2).float() / 255.0
+    observation["task"] = [task] * len(batch_states)
+    with torch.inference_mode():
+        observation = _worker_state["preprocessor"](observation)
+        chunks = policy.predict_action_chunk(observation)
+        chunks = _worker_state["postprocessor"](chunks)
+    return chunks.cpu().numpy()
+
+
+def _gripper_events(gripper: np.ndarray, threshold: float) -> list[tuple[int, int]]:
+    # (frame, direction) for each crossing of the open/close threshold; +1 opening, -1 closing
+    above = gripper > threshold
+    crossings = np.flatnonzero(above[1:] != above[:-1]) + 1
+    return [(int(i), 1 if above[i] else -1) for i in crossings]
+
+
+def _gripper_timing(recorded: np.ndarray, predicted: np.ndarray, fps: int) -> dict:
+    if not len(recorded):
+        return {"recorded_events": 0, "predicted_events": 0, "missed_events": 0, "mean_abs_timing_error_s": None}
+    threshold = (recorded.min() + recorded.max()) / 2
+    rec_events = _gripper_events(recorded, threshold)
+    pred_events = _gripper_events(predicted, threshold)
+    errors, missed = [], 0
+    for frame, direction in rec_events:
+        candidates = [abs(p - frame) for p, d in pred_events if d == direction]
+        if candidates:
+            errors.append(min(candidates) / fps)
+        else:
+            missed += 1
+    return {
+        "recorded_events": len(rec_events),
+        "predicted_events": len(pred_events),
+        "missed_events": missed,
+        "mean_abs_timing_error_s": float(np.mean(errors)) if errors else None,
+    }
+
+
+def _evaluate_episode(job: tuple) -> dict:
+    repo_id, episode_index, task, batch_size = job
+    t0 = time.perf_counter()
+    policy = _worker_state["policy"]
+    cfg = policy.config
+    meta = LeRobotDatasetMetadata(repo_id)
+    names = meta.features["action"]["names"]
+    states, actions = _episode_frames(meta, episode_index)
+    num_frames = len(actions)
+
+    # One chunk every n_action_steps frames: the executed prefixes tile the episode, which is
+    # what the robot would do open loop. Each chunk is scored against the recorded actions.
+    starts = list(range(0, num_frames, cfg.n_action_steps))
+    images = {}
+    for key, feature in cfg.image_features.items():
+        _, height, width = feature.shape
+        images[key] = _episode_images(meta, episode_index, key, set(starts), (width, height))
+    starts = [t for t in starts if all(t in images[key] for key in images)]
+
+    chunks = []
+    for i in range(0, len(starts), batch_size):
+        batch = starts[i : i + batch_size]
+        batch_images = {key: [images[key][t] for t in batch] for key in images}
+        chunks.append(_predict_chunks(states[batch], batch_images, task))
+    chunks = np.concatenate(chunks) if chunks else np.zeros((0, cfg.chunk_size, len(names)))
+
+    chunk_err, executed_err = [], []
+    stitched = np.full_like(actions, np.nan)
+    for t, chunk in zip(starts, chunks):
+        horizon = min(len(chunk), num_frames - t)
+        err = np.abs(chunk[:horizon] - actions[t : t + horizon])
+        chunk_err.append(err)
+        executed = min(cfg.n_action_steps, horizon)
+        executed_err.append(err[:executed])
+        stitched[t : t + executed] = chunk[:executed]
+
+    chunk_err = np.concatenate(chunk_err) if chunk_err else np.zeros((0, len(names)))
+    executed_err = np.concatenate(executed_err) if executed_err else np.zeros((0, len(names)))
+    valid = ~np.isnan(stitched).any(axis=1)
+    gripper_idx = names.index(GRIPPER_KEY)
+    return {
+        "episode_index": episode_index,
+        "frames": num_frames,
+        "chunks": len(starts),
+        "chunk_mae": dict(zip(names, chunk_err.mean(axis=0).tolist())),
+        "executed_mae": dict(zip(names, executed_err.mean(axis=0).tolist())),
+        "gripper": _gripper_timing(actions[valid, gripper_idx], stitched[valid, gripper_idx], meta.fps),
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def evaluate_open_loop(
+    skill: str,
+    model_id: str | None = None,
+    repo_id: str | None = None,
+    episodes: list[int] | None = None,
+    num_workers: int | None = None,
+    batch_size: int | None = None,
+    policy_type: str | None = None,
+) -> dict:
+    default_repo_id, default_model_id, task = EVAL_SETS[skill]
+    model_id = model_id or default_model_id
+    repo_id = repo_id or default_repo_id
+    workers = num_workers if num_workers is not None else NUM_WORKERS
+    batch_size = batch_size or BATCH_SIZE
+
+    meta = LeRobotDatasetMetadata(repo_id)
+    if not any((meta.root / "videos").glob("*/chunk-*/file-*.mp4")):
+        print(f"Downloading {repo_id} data and videos...")
+        meta.pull_from_repo(allow_patterns=["data/", "videos/"])
+    episodes = episodes if episodes is not None else list(range(meta.total_episodes))
+
+    t0 = time.perf_counter()
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"Evaluating {model_id} on {len(episodes)} episodes of {repo_id} ({workers} workers x {threads} threads)...")
+    per_episode = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_id, policy_type, threads),
+    ) as pool:
+        for result in pool.map(_evaluate_episode, [(repo_id, ep, task, batch_size) for ep in episodes]):
+            per_episode.append(result)
+            print(
+                f"  episode {result['episode_index']:>3}: executed MAE "
+                f"{np.mean(list(result['executed_mae'].values())):.2f}, "
+                f"gripper timing {result['gripper']['mean_abs_timing_error_s']}"
+            )
+
+    names = list(per_episode[0]["chunk_mae"]) if per_episode else []
+    weights = np.array([r["frames"] for r in per_episode], dtype=float)
+    timing = [r["gripper"]["mean_abs_timing_error_s"] for r in per_episode if r["gripper"]["mean_abs_timing_error_s"] is not None]
+    return {
+        "skill": skill,
+        "model_id": model_id,
+        "repo_id": repo_id,
+        "episodes": len(per_episode),
+        "seconds": time.perf_counter() - t0,
+        "chunk_mae": {n: float(np.average([r["chunk_mae"][n] for r in per_episode], weights=weights)) for n in names},
+        "executed_mae": {n: float(np.average([r["executed_mae"][n] for r in per_episode], weights=weights)) for n in names},
+        "gripper_mean_abs_timing_error_s": float(np.mean(timing)) if timing else None,
+        "gripper_missed_events": sum(r["gripper"]["missed_events"] for r in per_episode),
+        "per_episode": per_episode,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Open-loop policy evaluation against recorded episodes (CPU)")
+    parser.add_argument("skill", choices=list(EVAL_SETS))
+    parser.add_argument("--model-id", help="checkpoint to evaluate (default: the skill's current policy)")
+    parser.add_argument("--repo-id", help="dataset to evaluate on (e.g. a derived resolution tier)")
+    parser.add_argument("--episodes", type=int, nargs="*")
+    parser.add_argument("--num-workers", type=int, default=NUM_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--output", type=Path, help="write the full results JSON here")
+    args = parser.parse_args()
+
+    results = evaluate_open_loop(
+        args.skill, args.model_id, args.repo_id, args.episodes, args.num_workers, args.batch_size
+    )
+    print(f"\n✓ {results['episodes']} episodes in {results['seconds']:.0f}s")
+    for name in results["executed_mae"]:
+        print(f"  {name:<18} executed MAE {results['executed_mae'][name]:7.2f}   chunk MAE {results['chunk_mae'][name]:7.2f}")
+    print(
+        f"  gripper timing error {results['gripper_mean_abs_timing_error_s']} s, "
+        f"{results['gripper_missed_events']} missed open/close events"
+    )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results: {args.output}")
@@ -0,0 +1,102 @@
+import argparse
+import json
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+
+import sys
+sys.path.insert(0, '.')
+
+from scripts.evaluate_open_loop import EVAL_SETS, _episode_frames
+from src.control.completion import COMPLETION_DETECTORS_FILE, GRIPPER_KEY, CompletionDetector, load_detector_params
+
+# Recorded episodes end once the demonstrator has finished and let go, so their last FIT_TAIL_S
+# seconds show what "done" looks like for each skill: the rest pose, and how still the arm,
+# gripper and (recorded) actions are there. Thresholds are the 95th percentile of that, times MARGIN.
+FIT_TAIL_S = 1.0
+MARGIN = 1.5
+# Floors, in normalized position units (joints -100..100, gripper 0..100) and units/s
+MIN_TOLERANCE = 3.0
+MIN_VELOCITY = 2.0
+MIN_ACTION_DELTA = 0.5
+# Never stop before this fraction of the shortest recorded episode
+MIN_EPISODE_FRACTION = 0.5
+
+
+def _fit(episodes: list[tuple[np.ndarray, np.ndarray]], names: list[str], fps: int) -> dict:
+    tail = max(2, round(FIT_TAIL_S * fps))
+    finals = np.stack([states[-1] for states, _ in episodes])
+    rest = np.median(finals, axis=0)
+    tolerance = np.maximum(MIN_TOLERANCE, MARGIN * np.percentile(np.abs(finals - rest), 95, axis=0))
+    speeds = np.concatenate([np.abs(np.diff(states[-tail:], axis=0)).max(axis=1) * fps for states, _ in episodes])
+    deltas = np.concatenate([np.abs(np.diff(actions[-tail:], axis=0)).max(axis=1) for _, actions in episodes])
+    gripper = names.index(GRIPPER_KEY)
+    return {
+        "rest_pose": dict(zip(names, rest.tolist())),
+        "rest_tolerance": dict(zip(names, tolerance.tolist())),
+        "velocity_threshold": max(MIN_VELOCITY, MARGIN * float(np.percentile(speeds, 95))),
+        "gripper_open_min": float(np.percentile(finals[:, gripper], 5) - tolerance[gripper]),
+        "action_delta_threshold": max(MIN_ACTION_DELTA, MARGIN * float(np.percentile(deltas, 95))),
+        "min_episode_s": MIN_EPISODE_FRACTION * min(len(states) for states, _ in episodes) / fps,
+    }
+
+
+def _replay(skill: str, params: dict, states: np.ndarray, actions: np.ndarray, names: list[str], fps: int) -> float | None:
+    # When the detector would have ended this recorded episode (seconds), or None
+    duration = len(states) / fps
+    events = {"exit_early": False}
+    detector = CompletionDetector(skill, events, duration, params)
+    detector.start_episode(now=0.0)
+    for t in range(len(states)):
+        detector.observe(dict(zip(names, states[t])), now=t / fps)
+        if events["exit_early"]:
+            return detector.stopped_at
+        detector.on_action(dict(zip(names, actions[t])))
+    return None
+
+
+def fit_completion_detectors(skills: list[str], max_episodes: int | None = None) -> dict:
+    fitted = {}
+    for skill in skills:
+        repo_id = EVAL_SETS[skill][0]
+        meta = LeRobotDatasetMetadata(repo_id)
+        if not any((meta.root / "data").glob("chunk-*/file-*.parquet")):
+            print(f"Downloading {repo_id} data...")
+            meta.pull_from_repo(allow_patterns=["data/"])
+        names = meta.features["observation.state"]["names"]
+        indices = list(range(meta.total_episodes))[:max_episodes]
+        episodes = [_episode_frames(meta, i) for i in indices]
+        params = _fit(episodes, names, meta.fps)
+
+        fired = [_replay(skill, params, states, actions, names, meta.fps) for states, actions in episodes]
+        durations = [len(states) / meta.fps for states, _ in episodes]
+        early = [at / d for at, d in zip(fired, durations) if at is not None]
+        params["fit"] = {
+            "repo_id": repo_id,
+            "episodes": len(episodes),
+            "median_episode_s": float(np.median(durations)),
+            "replay_fired": len(early),
+            "replay_median_fraction": float(np.median(early)) if early else None,
+        }
+        fitted[skill] = params
+        print(
+            f"{skill}: {len(episodes)} episodes, median {params['fit']['median_episode_s']:.1f}s; detector fires in "
+            f"{len(early)}/{len(episodes)} replays, median at {params['fit']['replay_median_fraction']} of the episode"
+        )
+    return fitted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit per-skill early-stop detectors from the recorded datasets")
+    parser.add_argument("skills", nargs="*", help=f"default: all of {', '.join(EVAL_SETS)}")
+    parser.add_argument("--max-episodes", type=int)
+    args = parser.parse_args()
+    unknown = [skill for skill in args.skills if skill not in EVAL_SETS]
+    if unknown:
+        parser.error(f"unknown skills {unknown}; choose from {list(EVAL_SETS)}")
+    skills = args.skills or list(EVAL_SETS)
+
+    params = load_detector_params()
+    params.update(fit_completion_detectors(skills, args.max_episodes))
+    COMPLETION_DETECTORS_FILE.write_text(json.dumps(params, indent=2) + "\n")
+    print(f"Detectors: {COMPLETION_DETECTORS_FILE}")
@@ -0,0 +1,54 @@
+import argparse
+import json
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+
+import sys
+sys.path.insert(0, '.')
+
+from scripts.evaluate_open_loop import EVAL_SETS, _episode_frames
+from src.control.transitions import SKILL_START_POSES_FILE, load_start_poses
+
+# Start pose = per-joint median of the first recorded state of each episode; spread = the
+# SPREAD_PERCENTILE of the distance from it, so the band holds most recorded starts.
+SPREAD_PERCENTILE = 80
+MIN_SPREAD = 1.0  # normalized position units
+
+
+def fit_start_poses(skills: list[str], max_episodes: int | None = None) -> dict:
+    fitted = {}
+    for skill in skills:
+        repo_id = EVAL_SETS[skill][0]
+        meta = LeRobotDatasetMetadata(repo_id)
+        if not any((meta.root / "data").glob("chunk-*/file-*.parquet")):
+            print(f"Downloading {repo_id} data...")
+            meta.pull_from_repo(allow_patterns=["data/"])
+        names = meta.features["observation.state"]["names"]
+        indices = list(range(meta.total_episodes))[:max_episodes]
+        starts = np.stack([_episode_frames(meta, i)[0][0] for i in indices])
+        pose = np.median(starts, axis=0)
+        spread = np.maximum(MIN_SPREAD, np.percentile(np.abs(starts - pose), SPREAD_PERCENTILE, axis=0))
+        fitted[skill] = {
+            "start_pose": dict(zip(names, pose.tolist())),
+            "start_spread": dict(zip(names, spread.tolist())),
+            "fit": {"repo_id": repo_id, "episodes": len(indices)},
+        }
+        print(f"{skill}: " + ", ".join(f"{n} {p:.1f}±{s:.1f}" for n, p, s in zip(names, pose, spread)))
+    return fitted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit each skill's start-pose distribution from its recorded dataset")
+    parser.add_argument("skills", nargs="*", help=f"default: all of {', '.join(EVAL_SETS)}")
+    parser.add_argument("--max-episodes", type=int)
+    args = parser.parse_args()
+    unknown = [skill for skill in args.skills if skill not in EVAL_SETS]
+    if unknown:
+        parser.error(f"unknown skills {unknown}; choose from {list(EVAL_SETS)}")
+    skills = args.skills or list(EVAL_SETS)
+
+    poses = load_start_poses()
+    poses.update(fit_start_poses(skills, args.max_episodes))
+    SKILL_START_POSES_FILE.write_text(json.dumps(poses, indent=2) + "\n")
+    print(f"Start poses: {SKILL_START_POSES_FILE}")
@@ -0,0 +1,60 @@
+import argparse
+import sys
+
+sys.path.insert(0, '.')
+
+from src.models.store import MODEL_LOCK_FILE, MODEL_SNAPSHOTS, load_lock, pin, prefetch, snapshot_path, verify
+
+
+def _repo_ids(names: list[str] | None) -> list[str]:
+    if not names:
+        return list(MODEL_SNAPSHOTS.values())
+    return [MODEL_SNAPSHOTS.get(name, name) for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pinned model snapshots for the skills")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="show configured models and their pinned revisions")
+    p = sub.add_parser("pin", help="pin models to a revision (default: current main) and record checksums")
+    p.add_argument("names", nargs="*", help="names from MODEL_SNAPSHOTS or repo ids (default: all)")
+    p.add_argument("--revision", help="branch, tag or commit sha to pin (single model)")
+    p = sub.add_parser("prefetch", help="download every pinned snapshot and verify sha256 (run before a shift)")
+    p.add_argument("names", nargs="*")
+    p = sub.add_parser("verify", help="re-hash local snapshots against the lock file")
+    p.add_argument("names", nargs="*")
+    args = parser.parse_args()
+
+    lock = load_lock()
+    if args.command == "list":
+        for name, repo_id in MODEL_SNAPSHOTS.items():
+            entry = lock.get(repo_id)
+            pinned = f"{entry['revision'][:12]} ({entry['pinned_at']})" if entry else "not pinned"
+            print(f"{name:<26} {repo_id:<55} {pinned}")
+    elif args.command == "pin":
+        repo_ids = _repo_ids(args.names)
+        if args.revision and len(repo_ids) != 1:
+            parser.error("--revision needs exactly one model")
+        for repo_id in repo_ids:
+            entry = pin(repo_id, args.revision)
+            size_mb = sum(f["size"] for f in entry["files"].values()) / 1e6
+            print(f"✓ {repo_id} pinned at {entry['revision'][:12]} ({len(entry['files'])} files, {size_mb:.0f} MB)")
+        print(f"Lock file: {MODEL_LOCK_FILE} (commit it)")
+    elif args.command == "prefetch":
+        repo_ids = [r for r in _repo_ids(args.names) if r in lock]
+        for repo_id, path in prefetch(repo_ids).items():
+            print(f"✓ {repo_id}@{lock[repo_id]['revision'][:12]} verified at {path}")
+        missing = [r for r in _repo_ids(args.names) if r not in lock]
+        if missing:
+            print(f"Not pinned (skipped): {', '.join(missing)}")
+    elif args.command == "verify":
+        failed = False
+        for repo_id in [r for r in _repo_ids(args.names) if r in lock]:
+            problems = verify(repo_id, snapshot_path(repo_id, verify_level="off"))
+            failed |= bool(problems)
+            print(f"{'✓' if not problems else '✗'} {repo_id}" + "".join(f"\n    {p}" for p in problems))
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,6 @@ from lerobot.policies.smolvla.modeling_smolvla import SmolVLAPolicy
 from lerobot.policies.smolvla.processor_smolvla import make_smolvla_pre_post_processors
 from lerobot.processor.factory import make_default_processors
 from lerobot.processor import RenameObservationsProcessorStep
-from lerobot.utils.control_utils import init_keyboard_listener
-from lerobot.utils.visualization_utils import init_rerun
 from lerobot.utils.utils import log_say
 from lerobot.scripts.lerobot_record import record_loop
 from lerobot.datasets.pipeline_features import aggregate_pipeline_dataset_features, create_initial_features
@@ -11,10 +9,16 @@ from lerobot.datasets.utils import combine_feature_dicts
 
 import sys
 sys.path.insert(0, '.')
-import time
 
-from src.hardware.connect import connect_both
-from src.config.ports_and_cameras import FPS
+from src.hardware.connect import acquire_robot, release_robot
+from src.visualization.rerun_sink import start_visualization, stop_visualization
+from src.tracing.spans import span
+from src.control.cancel import cancel_requested, control_events
+from src.control.completion import completion_detector
+from src.control.transitions import transition_to_start
+from src.models.store import resolve_model
+from src.models.shared_weights import shared_policy
+from src.config.ports_and_cameras import DEFAULT_CELL, FPS, camera_config_for_policy
 
 HF_MODEL_ID_DEFAULT = "sangam-101/smolvla_so101_pick_and_place_carrot"
 TASK_DESCRIPTION_DEFAULT = "Pick carrot from plate and place on cutting board"
@@ -32,6 +36,7 @@ def run_smolvla_pick_and_place(
     num_episodes: int | None = None,
     episode_time_s: int | float | None = None,
     task_description: str | None = None,
+    cell: str | None = None,
 ) -> None:
     hf_model_id = model_id or HF_MODEL_ID_DEFAULT
     task_description = task_description or TASK_DESCRIPTION_DEFAULT
@@ -39,11 +44,14 @@ def run_smolvla_pick_and_place(
     episode_time_s = episode_time_s if episode_time_s is not None else EPISODE_TIME_SEC_DEFAULT
 
     print(f"Loading SmolVLA policy from {hf_model_id}...")
-    policy = SmolVLAPolicy.from_pretrained(hf_model_id)
+    with span("from_pretrained", model_id=hf_model_id):
+        model_path = resolve_model(hf_model_id)
+        policy = shared_policy(SmolVLAPolicy, model_path)
     print("✓ SmolVLA policy loaded!")
 
     print("Connecting robots...")
-    robot, _ = connect_both()
+    with span("connect_both"):
+        robot = acquire_robot(cameras=camera_config_for_policy(policy.config, cell), cell=cell)
     print("✓ Robots connected!")
 
     teleop_action_processor, robot_action_processor, robot_observation_processor = make_default_processors()
@@ -74,7 +82,8 @@ def run_smolvla_pick_and_place(
 
     print("Loading dataset statistics...")
     from lerobot.datasets.lerobot_dataset import LeRobotDataset
-    training_dataset = LeRobotDataset("sangam-101/so101-pick-and-place-carrot")
+    with span("load_dataset_stats"):
+        training_dataset = LeRobotDataset("sangam-101/so101-pick-and-place-carrot")
     dataset_stats = training_dataset.meta.stats
 
     preprocessor, postprocessor = make_smolvla_pre_post_processors(
@@ -86,8 +95,13 @@ def run_smolvla_pick_and_place(
         if hasattr(step, "device"):
             step.device = "mps"
 
-    _, events = init_keyboard_listener()
-    init_rerun(session_name="inference_smolvla_pick_place")
+    events = control_events()
+    completion = completion_detector("pick_and_place", events, episode_time_s)
+    completion.attach(robot)
+    # One rerun viewer per host: only the default cell is visualized
+    visualize = cell in (None, DEFAULT_CELL)
+    if visualize:
+        start_visualization(session_name="inference_smolvla_pick_place", robot=robot)
 
     print("\n" + "=" * 60)
     print("SMOLVLA INFERENCE MODE - Robot controlled by VLA policy!")
@@ -95,44 +109,44 @@ def run_smolvla_pick_and_place(
     print(f"Task: {task_description}")
     print(f"Running {num_episodes} test episodes")
 
+    finished = False
     try:
+        # Blend from wherever the arm is (e.g. the previous skill's end) into this skill's start pose
+        transition_to_start(robot, "pick_and_place", FPS)
         for episode_idx in range(num_episodes):
             log_say(f"Running SmolVLA inference episode {episode_idx + 1} of {num_episodes}", play_sounds=False)
 
-            record_loop(
-                robot=robot,
-                events=events,
-                fps=FPS,
-                teleop_action_processor=teleop_action_processor,
-                robot_action_processor=robot_action_processor,
-                robot_observation_processor=robot_observation_processor,
-                dataset=inference_dataset,
-                policy=policy,
-                preprocessor=preprocessor,
-                postprocessor=postprocessor,
-                control_time_s=episode_time_s,
-                single_task=task_description,
-                display_data=True,
-            )
+            completion.start_episode()
+            with span("control_loop", episode=episode_idx):
+                record_loop(
+                    robot=robot,
+                    events=events,
+                    fps=FPS,
+                    teleop_action_processor=teleop_action_processor,
+                    robot_action_processor=robot_action_processor,
+                    robot_observation_processor=robot_observation_processor,
+                    dataset=inference_dataset,
+                    policy=policy,
+                    preprocessor=preprocessor,
+                    postprocessor=postprocessor,
+                    control_time_s=episode_time_s,
+                    single_task=task_description,
+                    display_data=False,
+                )
+            completion.end_episode(episode_idx)
 
             if events["stop_recording"]:
                 break
 
+        finished = True
     finally:
-        try:
-            robot.send_action({"gripper.pos": 0})
-            time.sleep(0.3)
-        except Exception:
-            pass
-        try:
-            robot.disconnect()
-        except RuntimeError:
-            try:
-                robot.config.disable_torque_on_disconnect = False
-                robot.disconnect()
-            except Exception:
-                pass
-        print("✓ Disconnected safely")
+        if visualize:
+            stop_visualization()
+        completion.detach(robot)
+        with span("disconnect"):
+            # Inside a workflow the arm stays connected for the next skill, unless this one was
+            # cancelled or failed (a follower that raised is reconnected, not reused)
+            release_robot(robot, cell, keep=finished and not cancel_requested())
 
 
 if __name__ == "__main__":
@@ -1,4 +1,9 @@
+import time
+
 from src.hardware.connect import connect_both, disconnect_both
+from src.hardware.teleop_engine import TeleopEngine
+
+REPORT_EVERY_S = 5
 
 
 def teleop_no_camera() -> None:
@@ -9,17 +14,18 @@ def teleop_no_camera() -> None:
     print("\nMove the leader arm to control the follower (no camera UI).")
     print("Press Ctrl+C to stop.\n")
 
+    engine = TeleopEngine(robot, teleop_device).start()
     try:
         while True:
-            # Get action from leader
-            action = teleop_device.get_action()
-
-            # Send action to follower
-            robot.send_action(action)
+            time.sleep(REPORT_EVERY_S)
+            engine.check()
+            print(engine.report())
     finally:
+        engine.stop()
+        print(engine.report())
         disconnect_both(robot, teleop_device)
         print("\n Disconnected safely")
 
 
 if __name__ == "__main__":
-    teleop_no_camera()
\ No newline at end of file
+    teleop_no_camera()
@@ -1,37 +1,50 @@
-from lerobot.utils.visualization_utils import init_rerun, log_rerun_data
+import time
+
 from src.hardware.connect import connect_both, disconnect_both
+from src.hardware.teleop_engine import TeleopEngine
+from src.config.ports_and_cameras import cameras_for_profile
+from src.visualization.rerun_sink import start_visualization, stop_visualization
+
+REPORT_EVERY_S = 5
 
 
 def teleop_with_cameras() -> None:
     print("Connecting robots...")
-    robot, teleop_device = connect_both()
+    robot, teleop_device = connect_both(cameras=cameras_for_profile("preview"))
     print(" Robots connected")
 
     print("Initializing Rerun viewer...")
-    init_rerun(session_name="teleop_view")
+    viz = start_visualization(session_name="teleop_view")
     print(" Rerun initialized - check your browser!")
     print("\nMove the leader arm to control the follower.")
     print("Press Ctrl+C to stop.\n")
 
+    # Leader → follower runs at a fixed rate on the engine thread; this loop only
+    # waits on camera frames and feeds the visualization.
+    engine = TeleopEngine(robot, teleop_device, read_follower=True).start()
+    last_report = time.perf_counter()
     try:
         while True:
-            # Get observation (includes camera feeds)
-            observation = robot.get_observation()
+            engine.check()
 
-            # Get action from leader
-            action = teleop_device.get_action()
+            # Camera feeds come from each camera's own read thread
+            observation = engine.latest_follower_state()
+            for cam_key, cam in robot.cameras.items():
+                observation[cam_key] = cam.async_read()
 
-            # Send action to follower
-            robot.send_action(action)
+            # Log observation (camera feeds) to Rerun, off the control thread
+            viz.log(observation=observation, action=engine.latest_action())
 
-            # Log observation (camera feeds) to Rerun
-            log_rerun_data(observation=observation, action=action)
+            if time.perf_counter() - last_report >= REPORT_EVERY_S:
+                print(engine.report())
+                last_report = time.perf_counter()
     finally:
+        engine.stop()
+        print(engine.report())
+        stop_visualization()
         disconnect_both(robot, teleop_device)
         print("\n Disconnected safely")
 
 
 if __name__ == "__main__":
     teleop_with_cameras()
-
-
@@ -0,0 +1,106 @@
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, '.')
+
+from src.tracing.spans import TRACE_FILE
+
+LAST_TRACES_DEFAULT = 10
+
+
+def load_traces(path: Path) -> dict:
+    traces = defaultdict(list)
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                s = json.loads(line)
+                traces[s["trace_id"]].append(s)
+    return traces
+
+
+def critical_path(spans: list) -> list[dict]:
+    # Walks back from the end of the root span, each time descending into the child that finished
+    # last before the cursor. Time not covered by a child on the path is the parent's own time
+    # (e.g. waiting on the network, or code that isn't instrumented).
+    by_id = {s["span_id"]: s for s in spans}
+    children = defaultdict(list)
+    roots = []
+    for s in spans:
+        if s.get("parent_id") in by_id:
+            children[s["parent_id"]].append(s)
+        else:
+            roots.append(s)
+    if not roots:
+        return []
+    root = min(roots, key=lambda s: s["start_ns"])
+
+    def walk(span: dict, depth: int) -> list[dict]:
+        steps, cursor, covered = [], span["end_ns"], 0
+        for child in sorted(children[span["span_id"]], key=lambda s: s["end_ns"], reverse=True):
+            if child["end_ns"] <= cursor:
+                steps = walk(child, depth + 1) + steps
+                covered += child["end_ns"] - max(child["start_ns"], span["start_ns"])
+                cursor = child["start_ns"]
+        entry = {
+            "name": span["name"],
+            "depth": depth,
+            "start_ns": span["start_ns"],
+            "total_ms": (span["end_ns"] - span["start_ns"]) / 1e6,
+            "self_ms": max(0, span["end_ns"] - span["start_ns"] - covered) / 1e6,
+            "status": span.get("status", "ok"),
+        }
+        return [entry] + steps
+
+    return walk(root, 0)
+
+
+def _print_trace(trace_id: str, path: list[dict]) -> None:
+    root = path[0]
+    print(f"\n{root['name']}  {root['total_ms'] / 1e3:.2f}s  trace {trace_id}")
+    for step in path:
+        bar = "█" * int(40 * step["self_ms"] / root["total_ms"]) if root["total_ms"] else ""
+        status = "" if step["status"] == "ok" else f"  [{step['status']}]"
+        name = "  " * step["depth"] + step["name"]
+        print(f"  {name:<44} total {step['total_ms']:>9.1f} ms  self {step['self_ms']:>9.1f} ms  {bar}{status}")
+
+
+def summarize(path: Path | None = None, last: int | None = None, trace_id: str | None = None) -> dict:
+    path = path or TRACE_FILE
+    traces = load_traces(path)
+    if trace_id:
+        selected = {trace_id: traces[trace_id]}
+    else:
+        ordered = sorted(traces.items(), key=lambda kv: min(s["start_ns"] for s in kv[1]))
+        selected = dict(ordered[-(last or LAST_TRACES_DEFAULT):])
+
+    self_by_stage = defaultdict(list)
+    for tid, spans in selected.items():
+        steps = critical_path(spans)
+        if not steps:
+            continue
+        _print_trace(tid, steps)
+        for step in steps:
+            self_by_stage[step["name"]].append(step["self_ms"])
+
+    summary = {
+        name: {"n": len(v), "mean_ms": float(np.mean(v)), "p95_ms": float(np.percentile(v, 95))}
+        for name, v in self_by_stage.items()
+    }
+    print(f"\nCritical-path self time over {len(selected)} traces:")
+    for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["mean_ms"] * kv[1]["n"]):
+        print(f"  {name:<44} n={s['n']:<4} mean {s['mean_ms']:>9.1f} ms  p95 {s['p95_ms']:>9.1f} ms")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Critical path per traced tool call")
+    parser.add_argument("--file", type=Path, default=TRACE_FILE)
+    parser.add_argument("--last", type=int, default=LAST_TRACES_DEFAULT, help="number of most recent traces")
+    parser.add_argument("--trace-id")
+    args = parser.parse_args()
+    summarize(args.file, args.last, args.trace_id)
@@ -1,14 +1,105 @@
+import json
+import os
+
 from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
 
+from ..hardware.config_resized_camera import ResizedOpenCVCameraConfig
+
 # Update these to match your machine
 FOLLOWER_PORT = "/dev/tty.usbmodem58370529381"
 LEADER_PORT   = "/dev/tty.usbmodem5A460815221"
 
-camera_config = {
-    "top":   OpenCVCameraConfig(index_or_path=0, width=1920, height=1080, fps=30),
-    "wrist": OpenCVCameraConfig(index_or_path=1, width=1920, height=1080, fps=30),
-}
+CAMERA_INDICES = {"top": 0, "wrist": 1}
+# FOURCC requested by the reduced-size profiles; record-full leaves it to the driver, as before,
+# so recordings keep their current encoding. Set to None to let the driver choose everywhere.
+CAMERA_FOURCC = "MJPG"
+
+# "real" drives the SO101 arms on the ports above; "sim" uses src/hardware/sim.py (no hardware needed)
+ROBOT_BACKEND = os.getenv("ROBOT_BACKEND", "real")
 
 FPS = 30
 ROBOT_ID  = "follower_arm_2"
-LEADER_ID = "leader_arm_2"
\ No newline at end of file
+LEADER_ID = "leader_arm_2"
+
+# Robot cells driven from this host: one follower (plus its leader for teleop) and its cameras each.
+# By default that is the single cell above; CELLS_FILE points at a JSON file of the same shape
+# ({"cell_name": {"follower_port": ..., "leader_port": ..., "robot_id": ..., "leader_id": ...,
+# "camera_indices": {"top": 0, "wrist": 1}}, ...}). The first cell is the default one.
+CELLS = {
+    "cell0": {
+        "follower_port": FOLLOWER_PORT,
+        "leader_port": LEADER_PORT,
+        "robot_id": ROBOT_ID,
+        "leader_id": LEADER_ID,
+        "camera_indices": CAMERA_INDICES,
+    },
+}
+CELLS_FILE = os.getenv("CELLS_FILE")
+if CELLS_FILE:
+    with open(CELLS_FILE) as f:
+        CELLS = json.load(f)
+DEFAULT_CELL = next(iter(CELLS))
+
+
+def cell_config(cell: str | None = None) -> dict:
+    if cell is not None and cell not in CELLS:
+        raise ValueError(f"Unknown cell {cell}; configured cells: {', '.join(CELLS)}")
+    return CELLS[cell or DEFAULT_CELL]
+
+# Named capture profiles. "capture" is requested from the driver, "output" is what the
+# robot observation (and rerun, and the policy preprocessor) receives.
+# infer-fast output is replaced by the policy's training resolution, see camera_config_for_policy.
+# Check that your cameras don't crop at the lower capture sizes, or the field of view will
+# no longer match the 1080p recordings.
+CAMERA_PROFILES = {
+    "record-full": {"capture": (1920, 1080), "output": (1920, 1080), "fourcc": None},
+    "infer-fast":  {"capture": (1280, 720),  "output": (640, 360),   "fourcc": CAMERA_FOURCC},
+    "preview":     {"capture": (1280, 720),  "output": (320, 180),   "fourcc": CAMERA_FOURCC},
+}
+
+
+def cameras_for_profile(profile: str, output_sizes: dict | None = None, cell: str | None = None) -> dict:
+    spec = CAMERA_PROFILES[profile]
+    capture_w, capture_h = spec["capture"]
+    cameras = {}
+    for name, index in cell_config(cell)["camera_indices"].items():
+        out_w, out_h = (output_sizes or {}).get(name, spec["output"])
+        if (out_w, out_h) == (capture_w, capture_h):
+            cameras[name] = OpenCVCameraConfig(
+                index_or_path=index, width=out_w, height=out_h, fps=FPS, fourcc=spec["fourcc"]
+            )
+        else:
+            cameras[name] = ResizedOpenCVCameraConfig(
+                index_or_path=index, width=out_w, height=out_h, fps=FPS, fourcc=spec["fourcc"],
+                capture_width=capture_w, capture_height=capture_h,
+            )
+    return cameras
+
+
+camera_config = cameras_for_profile("record-full")
+
+
+def policy_image_sizes(policy_config) -> dict:
+    # Policies trained on a derived lower-resolution dataset (scripts/derive_resolution_tiers.py)
+    # carry that resolution in input_features as (C, H, W).
+    sizes = {}
+    for key, feature in getattr(policy_config, "input_features", {}).items():
+        name = key.rsplit(".", 1)[-1]
+        if key.startswith("observation.images.") and name in CAMERA_INDICES:
+            _, height, width = feature.shape
+            sizes[name] = (width, height)
+    return sizes
+
+
+def profile_for_policy(policy_config) -> str:
+    sizes = policy_image_sizes(policy_config)
+    full = CAMERA_PROFILES["record-full"]["output"]
+    if not sizes or all(size == full for size in sizes.values()):
+        return "record-full"
+    return "infer-fast"
+
+
+def camera_config_for_policy(policy_config, cell: str | None = None) -> dict:
+    profile = profile_for_policy(policy_config)
+    print(f"Camera profile: {profile}")
+    return cameras_for_profile(profile, output_sizes=policy_image_sizes(policy_config), cell=cell)
@@ -0,0 +1 @@
+# Cancelling skills run by the backend
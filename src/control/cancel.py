@@ -0,0 +1,81 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+
+# A skill started by the backend runs inside a cancel_scope. The inference scripts get their
+# record_loop events from control_events(); cancelling the scope's token sets exit_early and
+# stop_recording on them, so record_loop leaves at the top of its next tick and the script
+# stops its episodes and goes through its usual safe disconnect (gripper release).
+_current = contextvars.ContextVar("cancel_token", default=None)
+
+
+class CancelToken:
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.reason = None
+        self._events = []
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def attach(self, events: dict) -> None:
+        with self._lock:
+            self._events.append(events)
+            if self.cancelled.is_set():
+                _stop(events)
+
+    def on_cancel(self, callback) -> None:
+        # callback() runs on the cancelling thread, once
+        with self._lock:
+            self._callbacks.append(callback)
+            if not self.cancelled.is_set():
+                return
+        callback()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self.cancelled.is_set():
+                return
+            self.reason = reason
+            self.cancelled.set()
+            for events in self._events:
+                _stop(events)
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+
+def _stop(events: dict) -> None:
+    events["exit_early"] = True
+    events["stop_recording"] = True
+
+
+@contextmanager
+def cancel_scope(token: CancelToken):
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def current_cancel_token() -> CancelToken | None:
+    return _current.get()
+
+
+def cancel_requested() -> bool:
+    token = _current.get()
+    return token is not None and token.cancelled.is_set()
+
+
+def control_events() -> dict:
+    # Replaces `_, events = init_keyboard_listener()` in the inference scripts. Inside a backend
+    # job the events follow the job's CancelToken; run from a terminal, ESC still stops the run.
+    token = _current.get()
+    if token is None:
+        from lerobot.utils.control_utils import init_keyboard_listener
+
+        _, events = init_keyboard_listener()
+        return events
+    events = {"exit_early": False, "rerecord_episode": False, "stop_recording": False}
+    token.attach(events)
+    return events
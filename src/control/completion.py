@@ -0,0 +1,127 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from ..tracing.spans import span
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# Per-skill detector parameters, fit from the recorded datasets by scripts/fit_completion_detectors.py.
+# A skill without parameters (or EARLY_STOP=0) always runs for its full episode_time_s.
+COMPLETION_DETECTORS_FILE = Path(os.getenv("COMPLETION_DETECTORS_FILE", project_root / "completion_detectors.json"))
+EARLY_STOP = os.getenv("EARLY_STOP", "1") == "1"
+# How long every completion condition must hold before the episode is ended
+EARLY_STOP_HOLD_S = float(os.getenv("EARLY_STOP_HOLD_S", "1.0"))
+# Never end an episode before this fraction of episode_time_s (nor before the fitted min_episode_s)
+EARLY_STOP_MIN_FRACTION = float(os.getenv("EARLY_STOP_MIN_FRACTION", "0.3"))
+GRIPPER_KEY = "gripper.pos"
+
+
+def load_detector_params() -> dict:
+    if not COMPLETION_DETECTORS_FILE.exists():
+        return {}
+    return json.loads(COMPLETION_DETECTORS_FILE.read_text())
+
+
+class CompletionDetector:
+    # Evaluated every control tick. The skill is done when, for EARLY_STOP_HOLD_S in a row:
+    #  - every joint is within its tolerance of the skill's learned rest pose,
+    #  - every joint (gripper included) moves slower than velocity_threshold (position units/s;
+    #    the follower runs with use_degrees=False, so joints are normalized to -100..100 and the
+    #    gripper to 0..100, and tolerances / thresholds are in those units too),
+    #  - the gripper is open (>= gripper_open_min) and steady,
+    #  - consecutive policy actions differ by less than action_delta_threshold.
+    # It then sets events["exit_early"], which record_loop checks at the top of its next tick.
+
+    def __init__(self, skill: str, events: dict, episode_time_s: float, params: dict | None = None):
+        self.skill = skill
+        self.events = events
+        self.episode_time_s = episode_time_s
+        self.params = params
+        self.enabled = EARLY_STOP and params is not None
+        if params is not None:
+            self.min_episode_s = max(params.get("min_episode_s", 0.0), EARLY_STOP_MIN_FRACTION * episode_time_s)
+        self.total_saved_s = 0.0
+        self._unwatched = None
+        self.start_episode()
+
+    def start_episode(self, now: float | None = None) -> None:
+        self.started = time.perf_counter() if now is None else now
+        self.last_obs = None
+        self.last_obs_t = None
+        self.last_action = None
+        self.action_still = False
+        self.done_since = None
+        self.stopped_at = None
+
+    def attach(self, robot):
+        # Wraps this robot instance's get_observation / send_action (not the class), so cells
+        # running side by side each see only their own arm.
+        if not self.enabled:
+            return robot
+        get_observation, send_action = robot.get_observation, robot.send_action
+
+        def get_observation_watched():
+            observation = get_observation()
+            self.observe(observation)
+            return observation
+
+        def send_action_watched(action):
+            self.on_action(action)
+            return send_action(action)
+
+        self._unwatched = (get_observation, send_action)
+        robot.get_observation = get_observation_watched
+        robot.send_action = send_action_watched
+        return robot
+
+    def detach(self, robot) -> None:
+        # Before the robot is handed to the next skill (robot_session), which attaches its own
+        if self._unwatched is not None:
+            robot.get_observation, robot.send_action = self._unwatched
+            self._unwatched = None
+
+    def on_action(self, action: dict) -> None:
+        joints = {k: float(v) for k, v in action.items() if k.endswith(".pos")}
+        if self.last_action is not None:
+            delta = max((abs(v - self.last_action.get(k, v)) for k, v in joints.items()), default=0.0)
+            self.action_still = delta <= self.params["action_delta_threshold"]
+        self.last_action = joints
+
+    def observe(self, observation: dict, now: float | None = None) -> None:
+        # now: only passed when replaying recorded episodes (scripts/fit_completion_detectors.py)
+        now = time.perf_counter() if now is None else now
+        joints = {k: float(v) for k, v in observation.items() if k.endswith(".pos")}
+        last, last_t = self.last_obs, self.last_obs_t
+        self.last_obs, self.last_obs_t = joints, now
+        if self.stopped_at is not None or last is None or now <= last_t:
+            return
+        speed = max((abs(v - last.get(k, v)) / (now - last_t) for k, v in joints.items()), default=0.0)
+        rest, tolerance = self.params["rest_pose"], self.params["rest_tolerance"]
+        at_rest = all(abs(joints[k] - rest[k]) <= tolerance[k] for k in rest if k in joints and k != GRIPPER_KEY)
+        gripper_open = joints.get(GRIPPER_KEY, float("inf")) >= self.params["gripper_open_min"]
+        if not (at_rest and gripper_open and speed <= self.params["velocity_threshold"] and self.action_still):
+            self.done_since = None
+            return
+        if self.done_since is None:
+            self.done_since = now
+        elapsed = now - self.started
+        if now - self.done_since >= EARLY_STOP_HOLD_S and elapsed >= self.min_episode_s:
+            self.stopped_at = elapsed
+            self.events["exit_early"] = True
+
+    def end_episode(self, episode_idx: int = 0) -> float:
+        # Seconds saved in the episode that just ended (0 if it ran its full time)
+        if self.stopped_at is None:
+            return 0.0
+        saved = max(0.0, self.episode_time_s - self.stopped_at)
+        self.total_saved_s += saved
+        print(f"✓ {self.skill}: episode {episode_idx + 1} complete at {self.stopped_at:.1f}s, saved {saved:.1f}s")
+        with span("early_stop", skill=self.skill, episode=episode_idx, at_s=self.stopped_at, saved_s=saved):
+            pass
+        return saved
+
+
+def completion_detector(skill: str, events: dict, episode_time_s: float) -> CompletionDetector:
+    return CompletionDetector(skill, events, episode_time_s, load_detector_params().get(skill))
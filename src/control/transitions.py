@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from ..tracing.spans import span
+from .cancel import cancel_requested
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# Per-skill start-state distribution, fit from the recorded datasets by scripts/fit_start_poses.py:
+# {"skill": {"start_pose": {joint: pos}, "start_spread": {joint: pos}}}, in the follower's normalized
+# position units (use_degrees=False: joints -100..100, gripper 0..100). Before a skill's first
+# episode the arm is moved from wherever the previous skill left it to the nearest pose inside
+# start_pose ± start_spread, so the policy starts in distribution.
+SKILL_START_POSES_FILE = Path(os.getenv("SKILL_START_POSES_FILE", project_root / "skill_start_poses.json"))
+TRANSITIONS = os.getenv("TRANSITIONS", "1") == "1"
+TRANSITION_MAX_SPEED = float(os.getenv("TRANSITION_MAX_SPEED", "40"))  # position units/s
+TRANSITION_MIN_S = 0.3
+TRANSITION_SKIP = 1.0  # no move if no joint is further than this (position units) from the target
+
+
+def load_start_poses() -> dict:
+    if not SKILL_START_POSES_FILE.exists():
+        return {}
+    return json.loads(SKILL_START_POSES_FILE.read_text())
+
+
+def transition_target(current: dict, start_pose: dict, start_spread: dict) -> dict:
+    # Nearest point of the recorded start distribution: each joint clamped into its band
+    return {
+        k: min(max(current.get(k, mid), mid - start_spread.get(k, 0.0)), mid + start_spread.get(k, 0.0))
+        for k, mid in start_pose.items()
+    }
+
+
+def plan_transition(current: dict, target: dict, fps: int, max_speed: float = TRANSITION_MAX_SPEED) -> list[dict]:
+    # Minimum-jerk blend (zero velocity and acceleration at both ends). Its peak speed is
+    # 1.875 * distance / duration, so the duration is chosen to keep every joint under max_speed.
+    distance = max((abs(target[k] - current.get(k, target[k])) for k in target), default=0.0)
+    if distance <= TRANSITION_SKIP:
+        return []
+    duration = max(TRANSITION_MIN_S, 1.875 * distance / max_speed)
+    steps = max(1, round(duration * fps))
+    path = []
+    for i in range(1, steps + 1):
+        s = i / steps
+        blend = 10 * s**3 - 15 * s**4 + 6 * s**5
+        path.append({k: current.get(k, v) + (v - current.get(k, v)) * blend for k, v in target.items()})
+    return path
+
+
+def transition_to_start(robot, skill: str, fps: int) -> float:
+    # Runs on the live connection before the skill's first episode; returns the seconds it took
+    params = load_start_poses().get(skill)
+    if not TRANSITIONS or params is None:
+        return 0.0
+    observation = robot.get_observation()
+    current = {k: float(v) for k, v in observation.items() if k.endswith(".pos")}
+    target = transition_target(current, params["start_pose"], params["start_spread"])
+    path = plan_transition(current, target, fps)
+    if not path:
+        return 0.0
+    t0 = time.perf_counter()
+    with span("transition", skill=skill, steps=len(path)):
+        for i, action in enumerate(path):
+            # Same rule as record_loop: a cancel stops the arm within one control tick, and the
+            # caller then goes through its safe release
+            if cancel_requested():
+                elapsed = time.perf_counter() - t0
+                print(f"Transition to {skill} start pose cancelled after {elapsed:.1f}s")
+                return elapsed
+            robot.send_action(action)
+            delay = t0 + (i + 1) / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    elapsed = time.perf_counter() - t0
+    print(f"✓ Moved to {skill} start pose in {elapsed:.1f}s")
+    return elapsed
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset, LeRobotDatasetMetadata
+from lerobot.datasets.utils import load_episodes
+from lerobot.datasets.video_utils import get_safe_default_codec
+from lerobot.utils.constants import HF_LEROBOT_HOME
+
+# Manifests live outside the dataset root so push_to_hub never uploads them
+MANIFEST_DIR = HF_LEROBOT_HOME / "_manifests"
+MANIFEST_VERSION = 1
+
+
+def manifest_path(repo_id: str) -> Path:
+    return MANIFEST_DIR / f"{repo_id}.json"
+
+
+def features_hash(features: dict) -> str:
+    blob = json.dumps(features, sort_keys=True, default=list)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def load_manifest(repo_id: str) -> dict | None:
+    path = manifest_path(repo_id)
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _last_episode_files(meta: LeRobotDatasetMetadata, ep_index: int) -> dict:
+    files = {str(meta.get_data_file_path(ep_index)): None}
+    for key in meta.video_keys:
+        files[str(meta.get_video_file_path(ep_index, key))] = None
+    for rel_path in files:
+        full_path = meta.root / rel_path
+        files[rel_path] = full_path.stat().st_size if full_path.exists() else -1
+    return files
+
+
+def write_manifest(dataset: LeRobotDataset, features: dict) -> dict:
+    # Call only after the dataset is finalized (e.g. after VideoEncodingManager exits),
+    # otherwise the parquet/video files of the last episode are still being written.
+    meta = dataset.meta
+    num_episodes = meta.total_episodes
+    last_episode = None
+    if num_episodes > 0:
+        meta.episodes = load_episodes(meta.root)
+        ep_index = num_episodes - 1
+        last_episode = {
+            "episode_index": ep_index,
+            "length": int(meta.episodes[ep_index]["length"]),
+            "files": _last_episode_files(meta, ep_index),
+        }
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "repo_id": dataset.repo_id,
+        "root": str(meta.root),
+        "fps": meta.fps,
+        "num_episodes": num_episodes,
+        "num_frames": meta.total_frames,
+        "features_hash": features_hash(features),
+        "last_episode": last_episode,
+        "updated_at": time.time(),
+    }
+
+    path = manifest_path(dataset.repo_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(path)
+    return manifest
+
+
+def verify_manifest(manifest: dict) -> str | None:
+    # Returns None when the last episode on disk matches the manifest, else the reason it doesn't
+    last_episode = manifest["last_episode"]
+    if manifest["num_episodes"] > 0 and last_episode is None:
+        return "manifest has no last-episode record"
+    if last_episode is not None:
+        root = Path(manifest["root"])
+        for rel_path, size in last_episode["files"].items():
+            full_path = root / rel_path
+            if not full_path.exists():
+                return f"missing file {rel_path}"
+            if full_path.stat().st_size != size:
+                return f"size mismatch for {rel_path}"
+    return None
+
+
+def _open_without_frames(repo_id: str, meta: LeRobotDatasetMetadata) -> LeRobotDataset:
+    # Mirrors LeRobotDataset.create() but keeps the existing metadata, so only
+    # info/tasks/episode metadata are read and the frame parquet files are never loaded.
+    obj = LeRobotDataset.__new__(LeRobotDataset)
+    obj.meta = meta
+    obj.repo_id = repo_id
+    obj.root = meta.root
+    obj.revision = None
+    obj.tolerance_s = 1e-4
+    obj.image_writer = None
+    obj.batch_encoding_size = 1
+    obj.episodes_since_last_encoding = 0
+    obj.episode_buffer = obj.create_episode_buffer()
+    obj.episodes = None
+    obj.hf_dataset = obj.create_hf_dataset()
+    obj.image_transforms = None
+    obj.delta_timestamps = None
+    obj.delta_indices = None
+    obj.video_backend = get_safe_default_codec()
+    obj.writer = None
+    obj.latest_episode = None
+    obj._current_file_start_frame = None
+    obj._lazy_loading = True
+    obj._recorded_frames = meta.total_frames
+    obj._writer_closed_for_reading = False
+    return obj
+
+
+def resume_dataset(repo_id: str, features: dict, image_writer_threads: int = 0) -> LeRobotDataset:
+    manifest = load_manifest(repo_id)
+    if manifest is not None and manifest["features_hash"] != features_hash(features):
+        raise ValueError(
+            f"Cannot resume {repo_id}: feature spec changed since the dataset was recorded. "
+            "Record into a new REPO_ID or restore the original camera/robot config."
+        )
+    reason = "no manifest found" if manifest is None else verify_manifest(manifest)
+
+    meta = None
+    if reason is None:
+        meta = LeRobotDatasetMetadata(repo_id, root=manifest["root"])
+        if meta.total_episodes != manifest["num_episodes"] or meta.total_frames != manifest["num_frames"]:
+            reason = "manifest is out of date with info.json"
+
+    if reason is None:
+        print("Resuming from manifest (fast path)")
+        dataset = _open_without_frames(repo_id, meta)
+    else:
+        print(f"Full dataset load ({reason})")
+        dataset = LeRobotDataset(repo_id)
+
+    if image_writer_threads > 0:
+        dataset.start_image_writer(num_processes=0, num_threads=image_writer_threads)
+    return dataset
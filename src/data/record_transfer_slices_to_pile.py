@@ -7,7 +7,6 @@ from lerobot.datasets.pipeline_features import (
 )
 from lerobot.datasets.utils import combine_feature_dicts
 from lerobot.utils.control_utils import init_keyboard_listener
-from lerobot.utils.visualization_utils import init_rerun
 from lerobot.utils.utils import log_say
 from lerobot.scripts.lerobot_record import record_loop
 from lerobot.processor.factory import (
@@ -17,6 +16,8 @@ from lerobot.processor.factory import (
 )
 
 from ..hardware.connect import connect_both, disconnect_both
+from .manifest import resume_dataset, write_manifest
+from ..visualization.rerun_sink import start_visualization, stop_visualization
 from ..config.ports_and_cameras import FPS
 
 REPO_ID = "sangam-101/so101-transfer-slices-to-pile"
@@ -53,12 +54,8 @@ dataset_features = combine_feature_dicts(
 if dataset_exists:
     print(f"Found existing dataset at {cache_dir}")
     print("Resuming recording...")
-    dataset = LeRobotDataset(REPO_ID)
-    if hasattr(robot, "cameras") and len(robot.cameras) > 0:
-        dataset.start_image_writer(
-            num_processes=0,
-            num_threads=4 * len(robot.cameras),
-        )
+    num_cameras = len(robot.cameras) if hasattr(robot, "cameras") else 0
+    dataset = resume_dataset(REPO_ID, dataset_features, image_writer_threads=4 * num_cameras)
     starting_episode = dataset.num_episodes
     print(f"Loaded {starting_episode} existing episodes")
     print(f"Will record {NUM_EPISODES - starting_episode} more episodes (target: {NUM_EPISODES} total)\n")
@@ -77,7 +74,7 @@ else:
     print(f"Will record {NUM_EPISODES} episodes\n")
 
 _, events = init_keyboard_listener()
-init_rerun(session_name="record_transfer_slices")
+start_visualization(session_name="record_transfer_slices", robot=robot)
 
 print("="*60)
 print("RECORDING INSTRUCTIONS")
@@ -118,7 +115,7 @@ try:
                     dataset=dataset,
                     control_time_s=EPISODE_TIME_SEC,
                     single_task=TASK_DESCRIPTION,
-                    display_data=True,
+                    display_data=False,
                 )
 
                 if not events["stop_recording"] and (
@@ -135,7 +132,7 @@ try:
                         teleop=teleop_device,
                         control_time_s=RESET_TIME_SEC,
                         single_task=TASK_DESCRIPTION,
-                        display_data=True,
+                        display_data=False,
                     )
 
                 if events["rerecord_episode"]:
@@ -158,9 +155,13 @@ try:
         except KeyboardInterrupt:
             log_say("Stop recording", play_sounds=True, blocking=True)
 finally:
+    stop_visualization()
     # Ensure robot and teleop get disconnected even if encoding/upload fails
     disconnect_both(robot, teleop_device)
 
+# Dataset is finalized here; record episode count and last-episode files for fast resume
+write_manifest(dataset, dataset_features)
+
 # Videos are now properly encoded after exiting VideoEncodingManager context,
 # so it is safe to push to the Hub.
 if dataset.num_episodes > 0:
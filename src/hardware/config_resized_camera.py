@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+from lerobot.cameras.configs import CameraConfig
+from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
+
+
+@CameraConfig.register_subclass("opencv_resized")
+@dataclass
+class ResizedOpenCVCameraConfig(OpenCVCameraConfig):
+    # width/height are what the robot reports and the policy sees;
+    # capture_width/capture_height are requested from the driver and resized on the capture thread.
+    capture_width: int | None = None
+    capture_height: int | None = None
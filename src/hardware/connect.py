@@ -1,28 +1,62 @@
+import threading
+import time
+from contextlib import contextmanager
+
 from lerobot.robots.so101_follower import SO101FollowerConfig, SO101Follower
 from lerobot.teleoperators.so101_leader import SO101LeaderConfig, SO101Leader
 from . import _features
+from .parallel_observation import with_parallel_observations
 from ..config.ports_and_cameras import (
-    FOLLOWER_PORT, LEADER_PORT, camera_config, ROBOT_ID, LEADER_ID
+    camera_config, cameras_for_profile, cell_config, DEFAULT_CELL, ROBOT_BACKEND
 )
 
-def make_robot():
+# Called with every observation the follower returns, on the control thread (keep them cheap)
+_observation_hooks = []
+
+def add_observation_hook(hook):
+    _observation_hooks.append(hook)
+
+def _with_observation_hooks(robot):
+    if not _observation_hooks:
+        return robot
+    get_observation = robot.get_observation
+    def get_observation_with_hooks():
+        observation = get_observation()
+        for hook in _observation_hooks:
+            hook(observation)
+        return observation
+    robot.get_observation = get_observation_with_hooks
+    return robot
+
+def make_robot(cameras=None, cell=None):
+    # cell: name in CELLS (ports_and_cameras.py); None is the default cell
+    cell_cfg = cell_config(cell)
+    if cameras is None:
+        cameras = camera_config if cell in (None, DEFAULT_CELL) else cameras_for_profile("record-full", cell=cell)
     robot_config = SO101FollowerConfig(
-        port=FOLLOWER_PORT,
-        id=ROBOT_ID,
-        cameras=camera_config
+        port=cell_cfg["follower_port"],
+        id=cell_cfg["robot_id"],
+        cameras=cameras
     )
-    return SO101Follower(robot_config)
+    if ROBOT_BACKEND == "sim":
+        from .sim import SimSO101Follower
+        return _with_observation_hooks(with_parallel_observations(SimSO101Follower(robot_config)))
+    return _with_observation_hooks(with_parallel_observations(SO101Follower(robot_config)))
 
-def make_teleop():
+def make_teleop(cell=None):
+    cell_cfg = cell_config(cell)
     teleop_config = SO101LeaderConfig(
-        port=LEADER_PORT,
-        id=LEADER_ID
+        port=cell_cfg["leader_port"],
+        id=cell_cfg["leader_id"]
     )
+    if ROBOT_BACKEND == "sim":
+        from .sim import SimSO101Leader
+        return SimSO101Leader(teleop_config)
     return SO101Leader(teleop_config)
 
-def connect_both():
-    robot = make_robot()
-    teleop_device = make_teleop()
+def connect_both(cameras=None, cell=None):
+    robot = make_robot(cameras, cell)
+    teleop_device = make_teleop(cell)
     robot.connect()
     teleop_device.connect()
     return robot, teleop_device
@@ -32,4 +66,70 @@ def disconnect_both(robot, teleop_device):
     robot.disconnect()
 
 def dataset_features_for(robot):
-    return _features.features_from(robot)
\ No newline at end of file
+    return _features.features_from(robot)
+
+def safe_disconnect(robot):
+    # Open the gripper, then disconnect; if the bus errors on the way out (motors already
+    # unpowered), retry without the torque-disable write.
+    try:
+        robot.send_action({"gripper.pos": 0})
+        time.sleep(0.3)
+    except Exception:
+        pass
+    try:
+        robot.disconnect()
+    except RuntimeError:
+        try:
+            robot.config.disable_torque_on_disconnect = False
+            robot.disconnect()
+        except Exception:
+            pass
+    print("✓ Disconnected safely")
+
+# Followers kept connected between the skills of a workflow, per cell (see robot_session)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+@contextmanager
+def robot_session(cell=None):
+    # Skills run inside keep the follower connected (torque on, where they ended) for the next
+    # skill instead of releasing and disconnecting; it is disconnected safely when the session ends.
+    key = cell or DEFAULT_CELL
+    with _sessions_lock:
+        _sessions[key] = None
+    try:
+        yield
+    finally:
+        with _sessions_lock:
+            robot = _sessions.pop(key, None)
+        if robot is not None:
+            safe_disconnect(robot)
+
+def acquire_robot(cameras=None, cell=None):
+    # The follower held by this cell's session if its cameras match, otherwise a new connection
+    key = cell or DEFAULT_CELL
+    with _sessions_lock:
+        held = _sessions.get(key)
+        if held is not None:
+            _sessions[key] = None
+    if held is not None:
+        if cameras is None or held.config.cameras == cameras:
+            return held
+        safe_disconnect(held)
+    robot, _ = connect_both(cameras, cell)
+    return robot
+
+def release_robot(robot, cell=None, keep=True):
+    # Hands the follower back to the cell's session if one is open (and keep), else disconnects it
+    key = cell or DEFAULT_CELL
+    with _sessions_lock:
+        if keep and key in _sessions:
+            _sessions[key] = robot
+            print("✓ Kept connected for the next skill")
+            return
+    safe_disconnect(robot)
+
+def held_robot(cell=None):
+    # The follower this cell's session is holding between skills, or None
+    with _sessions_lock:
+        return _sessions.get(cell or DEFAULT_CELL)
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from lerobot.utils.errors import DeviceNotConnectedError
+
+# OBS_PARALLEL=1: the follower's motor sync-read and each camera's async_read are issued at the
+# same time, so a tick waits for the slowest source instead of the sum of all of them.
+OBS_PARALLEL = os.getenv("OBS_PARALLEL", "1") == "1"
+# A source whose data is older than this when the observation is assembled is reported as stale
+# (the observation is still returned; the count shows up in stats()). Motor data is aged from when
+# the sync read was issued, camera frames from when the camera's read thread grabbed them, so a
+# camera that keeps handing out an old frame is caught, not only slow reads.
+OBS_MAX_AGE_MS = float(os.getenv("OBS_MAX_AGE_MS", "50"))
+LATENCY_SAMPLES_KEPT = 1000
+STALE_WARN_EVERY = 100
+
+
+class ObservationAggregator:
+    # Replaces robot.get_observation on one follower instance. The read threads are started here,
+    # once, so a tick never pays for thread creation. timestamps holds, for the last observation,
+    # the perf_counter time each source's data was taken ("motors" and one per camera).
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.sequential_get_observation = robot.get_observation
+        self.sources = 1 + len(robot.cameras)
+        self.pool = ThreadPoolExecutor(max_workers=self.sources, thread_name_prefix="observation")
+        self._start_threads()
+        for camera in robot.cameras.values():
+            _stamp_frames(camera)
+        self.timestamps = {}
+        self.latency_ms = deque(maxlen=LATENCY_SAMPLES_KEPT)
+        self.stale = 0
+        self.ticks = 0
+
+    def _start_threads(self) -> None:
+        # The pool creates a thread per submit only while none is idle; holding every task at a
+        # barrier forces all of them to exist before the first tick.
+        barrier = threading.Barrier(self.sources)
+        for future in [self.pool.submit(barrier.wait) for _ in range(self.sources)]:
+            future.result()
+
+    def _read_motors(self) -> tuple[dict, float]:
+        issued = time.perf_counter()
+        positions = self.robot.bus.sync_read("Present_Position")
+        return {f"{motor}.pos": value for motor, value in positions.items()}, issued
+
+    @staticmethod
+    def _read_camera(camera) -> tuple:
+        frame = camera.async_read()
+        return frame, camera.latest_frame_t
+
+    def get_observation(self) -> dict:
+        if not self.robot.is_connected:
+            raise DeviceNotConnectedError(f"{self.robot} is not connected.")
+        t0 = time.perf_counter()
+        motors = self.pool.submit(self._read_motors)
+        cameras = {key: self.pool.submit(self._read_camera, cam) for key, cam in self.robot.cameras.items()}
+        observation, motors_t = motors.result()
+        timestamps = {"motors": motors_t}
+        for key, future in cameras.items():
+            observation[key], timestamps[key] = future.result()
+        done = time.perf_counter()
+        self.timestamps = timestamps
+        self.latency_ms.append((done - t0) * 1000)
+        self.ticks += 1
+        age_ms = {source: (done - t) * 1000 for source, t in timestamps.items()}
+        if max(age_ms.values()) > OBS_MAX_AGE_MS:
+            self.stale += 1
+            if self.stale % STALE_WARN_EVERY == 1:
+                oldest = max(age_ms, key=age_ms.get)
+                print(f"⚠️  {self.robot}: {oldest} was {age_ms[oldest]:.0f} ms old ({self.stale} stale observations)")
+        return observation
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latency_ms)
+        pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+        return {"ticks": self.ticks, "stale": self.stale, "p50_ms": pick(0.5), "p95_ms": pick(0.95), "max_ms": pick(1.0)}
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False)
+
+
+def _stamp_frames(camera) -> None:
+    # Cameras with a read thread (lerobot's OpenCVCamera and its subclasses) call self.read() there
+    # for every frame; wrapping the instance's read records when the newest frame was grabbed.
+    # SimCamera sets latest_frame_t itself.
+    if hasattr(camera, "latest_frame_t"):
+        return
+    camera.latest_frame_t = time.perf_counter()
+    read = camera.read
+
+    def read_stamped(*args, **kwargs):
+        frame = read(*args, **kwargs)
+        camera.latest_frame_t = time.perf_counter()
+        return frame
+
+    camera.read = read_stamped
+
+
+def with_parallel_observations(robot):
+    # Installed before connect(); reads only start on the first get_observation()
+    if not OBS_PARALLEL or not robot.cameras:
+        return robot
+    aggregator = ObservationAggregator(robot)
+    disconnect = robot.disconnect
+
+    def disconnect_and_stop():
+        try:
+            disconnect()
+        finally:
+            aggregator.close()
+
+    robot.get_observation = aggregator.get_observation
+    robot.disconnect = disconnect_and_stop
+    robot.observation_aggregator = aggregator
+    return robot
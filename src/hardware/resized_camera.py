@@ -0,0 +1,22 @@
+import cv2
+from lerobot.cameras.opencv import OpenCVCamera
+
+from .config_resized_camera import ResizedOpenCVCameraConfig
+
+
+class ResizedOpenCVCamera(OpenCVCamera):
+    # Built by lerobot's make_cameras_from_configs for "opencv_resized" configs.
+    # Resizing happens inside read(), i.e. on the camera's own async_read thread,
+    # so the control loop only ever handles the smaller frame.
+
+    def __init__(self, config: ResizedOpenCVCameraConfig):
+        super().__init__(config)
+        self.capture_width = config.capture_width or self.capture_width
+        self.capture_height = config.capture_height or self.capture_height
+
+    def _postprocess_image(self, image, color_mode=None):
+        processed = super()._postprocess_image(image, color_mode)
+        h, w = processed.shape[:2]
+        if (w, h) != (self.width, self.height):
+            processed = cv2.resize(processed, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return processed
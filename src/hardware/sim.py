@@ -0,0 +1,316 @@
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import av
+import cv2
+import numpy as np
+import pyarrow.parquet as pq
+from lerobot.cameras.camera import Camera
+from lerobot.cameras.configs import ColorMode
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+from lerobot.robots.so101_follower import SO101Follower
+from lerobot.teleoperators.so101_leader import SO101Leader
+from lerobot.utils.errors import DeviceNotConnectedError
+
+# Recorded dataset the sim replays: leader trajectories, follower start pose and camera frames
+SIM_DATASET_ID = os.getenv("SIM_DATASET_ID", "sangam-101/so101-pick-and-place-carrot")
+SIM_EPISODE = int(os.getenv("SIM_EPISODE", "0"))
+
+# Serial timing of a 6-motor Feetech sync read/write at 1 Mbaud, measured on the real arm
+SIM_READ_LATENCY_S = float(os.getenv("SIM_READ_LATENCY_S", "0.003"))
+SIM_WRITE_LATENCY_S = float(os.getenv("SIM_WRITE_LATENCY_S", "0.001"))
+SIM_LATENCY_JITTER_S = float(os.getenv("SIM_LATENCY_JITTER_S", "0.0005"))
+
+# Joint model: first-order lag toward the goal, rate limited (normalized units, i.e. -100..100)
+SIM_JOINT_TAU_S = 0.08
+SIM_JOINT_MAX_SPEED = 150.0
+
+_dataset_cache = {}
+
+
+def _sleep_latency(base_s: float) -> None:
+    time.sleep(max(0.0, random.gauss(base_s, SIM_LATENCY_JITTER_S)))
+
+
+def _load_episode(repo_id: str, episode_index: int) -> dict | None:
+    # Returns {"fps", "names", "actions", "states", "meta"} for one recorded episode, or None when
+    # the dataset is not available (e.g. offline with an empty cache).
+    key = (repo_id, episode_index)
+    if key in _dataset_cache:
+        return _dataset_cache[key]
+    episode = None
+    try:
+        meta = LeRobotDatasetMetadata(repo_id)
+        data_files = sorted((meta.root / "data").glob("chunk-*/file-*.parquet"))
+        if not data_files:
+            meta.pull_from_repo(allow_patterns="data/")
+            data_files = sorted((meta.root / "data").glob("chunk-*/file-*.parquet"))
+        for data_file in data_files:
+            table = pq.read_table(data_file, columns=["episode_index", "action", "observation.state"])
+            frames = table.to_pandas()
+            frames = frames[frames["episode_index"] == episode_index]
+            if len(frames):
+                episode = {
+                    "fps": meta.fps,
+                    "names": meta.features["action"]["names"],
+                    "actions": np.stack(frames["action"].to_numpy()),
+                    "states": np.stack(frames["observation.state"].to_numpy()),
+                    "meta": meta,
+                }
+                break
+    except Exception as e:
+        print(f"Sim: could not load {repo_id} episode {episode_index} ({e}); using synthetic data")
+    _dataset_cache[key] = episode
+    return episode
+
+
+class SimMotorsBus:
+    # Stands in for FeetechMotorsBus. Only the calls made by SO101Follower/SO101Leader and this
+    # repo are implemented. Position writes drive a simple joint model; reads sleep for a serial-like
+    # latency and return the model state, or the replayed trajectory when one is given (leader).
+
+    def __init__(self, motors: dict, start_positions: dict | None = None, trajectory: tuple | None = None):
+        self.motors = motors
+        self.calibration = {}
+        self.is_connected = False
+        self.is_calibrated = True
+        self.lock = threading.Lock()
+        self.positions = {m: 0.0 for m in motors}
+        self.positions.update(start_positions or {})
+        self.goals = dict(self.positions)
+        self.last_update = time.perf_counter()
+        self.trajectory = trajectory  # (fps, [{motor: pos}, ...])
+        self.trajectory_t0 = None
+
+    def connect(self, handshake: bool = True) -> None:
+        self.is_connected = True
+        self.last_update = time.perf_counter()
+        self.trajectory_t0 = time.perf_counter()
+
+    def disconnect(self, disable_torque: bool = True) -> None:
+        if not self.is_connected:
+            raise DeviceNotConnectedError("SimMotorsBus is not connected.")
+        self.is_connected = False
+
+    def write_calibration(self, calibration: dict, cache: bool = True) -> None:
+        self.calibration = calibration
+
+    @contextmanager
+    def torque_disabled(self, motors=None):
+        yield
+
+    def configure_motors(self, *args, **kwargs) -> None:
+        return
+
+    def disable_torque(self, motors=None, num_retry: int = 0) -> None:
+        return
+
+    def enable_torque(self, motors=None, num_retry: int = 0) -> None:
+        return
+
+    def write(self, data_name: str, motor: str, value, *args, **kwargs) -> None:
+        if data_name == "Goal_Position":
+            self.sync_write(data_name, {motor: value})
+
+    def _step(self) -> None:
+        now = time.perf_counter()
+        dt = now - self.last_update
+        self.last_update = now
+        alpha = 1.0 - math.exp(-dt / SIM_JOINT_TAU_S)
+        max_step = SIM_JOINT_MAX_SPEED * dt
+        for motor, goal in self.goals.items():
+            delta = (goal - self.positions[motor]) * alpha
+            self.positions[motor] += max(-max_step, min(max_step, delta))
+
+    def _trajectory_positions(self) -> dict:
+        fps, frames = self.trajectory
+        idx = int((time.perf_counter() - self.trajectory_t0) * fps) % len(frames)
+        return dict(frames[idx])
+
+    def sync_read(self, data_name: str, motors=None, *args, **kwargs) -> dict:
+        if not self.is_connected:
+            raise DeviceNotConnectedError("SimMotorsBus is not connected.")
+        _sleep_latency(SIM_READ_LATENCY_S)
+        if data_name != "Present_Position":
+            return {m: 0 for m in (motors or self.motors)}
+        with self.lock:
+            if self.trajectory is not None:
+                values = self._trajectory_positions()
+            else:
+                self._step()
+                values = dict(self.positions)
+        if motors is not None:
+            motors = [motors] if isinstance(motors, str) else motors
+            values = {m: values[m] for m in motors}
+        return values
+
+    def read(self, data_name: str, motor: str, *args, **kwargs):
+        return self.sync_read(data_name, [motor])[motor]
+
+    def sync_write(self, data_name: str, values: dict, *args, **kwargs) -> None:
+        if not self.is_connected:
+            raise DeviceNotConnectedError("SimMotorsBus is not connected.")
+        _sleep_latency(SIM_WRITE_LATENCY_S)
+        if data_name == "Goal_Position":
+            with self.lock:
+                self._step()
+                for motor, value in values.items():
+                    self.goals[motor] = float(value)
+
+
+class SimCamera(Camera):
+    # Streams frames from the recorded dataset video for this camera at the configured fps,
+    # resized to the configured width/height (RGB, like OpenCVCamera). Falls back to a moving
+    # synthetic pattern when no video is available.
+
+    def __init__(self, config, name: str, repo_id: str = SIM_DATASET_ID):
+        super().__init__(config)
+        self.name = name
+        self.repo_id = repo_id
+        self.fps = config.fps or 30
+        self.width = config.width or 640
+        self.height = config.height or 480
+        self.color_mode = getattr(config, "color_mode", ColorMode.RGB)
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.frame_lock = threading.Lock()
+        self.latest_frame = None
+        self.latest_frame_t = time.perf_counter()  # when latest_frame was produced (see parallel_observation.py)
+        self.new_frame_event = threading.Event()
+        self._connected = False
+
+    def __str__(self) -> str:
+        return f"SimCamera({self.name})"
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @staticmethod
+    def find_cameras() -> list:
+        return []
+
+    def _video_segment(self) -> tuple[Path, float, float] | None:
+        # SIM_EPISODE's part of the multi-episode video file for this camera: (path, from_ts, to_ts),
+        # so the frames line up with the joints SimSO101Leader replays from the same episode
+        episode = _load_episode(self.repo_id, SIM_EPISODE)
+        if episode is None:
+            return None
+        meta = episode["meta"]
+        video_key = f"observation.images.{self.name}"
+        if video_key not in meta.video_keys:
+            return None
+        rel_path = meta.get_video_file_path(SIM_EPISODE, video_key)
+        video_path = meta.root / rel_path
+        if not video_path.exists():
+            try:
+                meta.pull_from_repo(allow_patterns=str(rel_path))
+            except Exception:
+                return None
+            if not video_path.exists():
+                return None
+        ep = meta.episodes[SIM_EPISODE]
+        return video_path, ep[f"videos/{video_key}/from_timestamp"], ep[f"videos/{video_key}/to_timestamp"]
+
+    def _frames(self):
+        segment = self._video_segment()
+        if segment is None:
+            i = 0
+            while True:
+                frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+                frame[:, :, 0] = (np.arange(self.width) + i * 4) % 256
+                frame[:, :, 1] = 96
+                i += 1
+                yield frame
+        video_path, from_ts, to_ts = segment
+        while True:
+            with av.open(str(video_path)) as container:
+                stream = container.streams.video[0]
+                container.seek(int(from_ts / stream.time_base), stream=stream, backward=True)
+                for frame in container.decode(stream):
+                    if frame.time < from_ts - 1e-4:
+                        continue
+                    if frame.time >= to_ts - 1e-4:
+                        break
+                    yield frame.to_ndarray(format="rgb24")
+
+    def _read_loop(self) -> None:
+        period = 1.0 / self.fps
+        next_t = time.perf_counter()
+        for frame in self._frames():
+            if self.stop_event.is_set():
+                return
+            if frame.shape[1] != self.width or frame.shape[0] != self.height:
+                frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+            if self.color_mode == ColorMode.BGR:
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            with self.frame_lock:
+                self.latest_frame = frame
+                self.latest_frame_t = time.perf_counter()
+            self.new_frame_event.set()
+            next_t += period
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+
+    def connect(self, warmup: bool = True) -> None:
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._read_loop, name=f"{self}_read_loop", daemon=True)
+        self.thread.start()
+        self._connected = True
+        if warmup:
+            self.async_read(timeout_ms=5000)
+
+    def read(self, color_mode=None) -> np.ndarray:
+        return self.async_read()
+
+    def async_read(self, timeout_ms: float = 200) -> np.ndarray:
+        if not self._connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+        if not self.new_frame_event.wait(timeout=timeout_ms / 1000.0):
+            raise TimeoutError(f"Timed out waiting for frame from {self} after {timeout_ms} ms.")
+        with self.frame_lock:
+            frame = self.latest_frame
+            self.new_frame_event.clear()
+        return frame
+
+    def disconnect(self) -> None:
+        if not self._connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self._connected = False
+
+
+def _positions_by_motor(names: list, values) -> dict:
+    return {name.removesuffix(".pos"): float(v) for name, v in zip(names, values)}
+
+
+class SimSO101Follower(SO101Follower):
+    # Same class surface as the real follower (name, features, connect/send_action/...), with the
+    # Feetech bus and cameras swapped for simulated ones.
+
+    def __init__(self, config):
+        super().__init__(config)
+        episode = _load_episode(SIM_DATASET_ID, SIM_EPISODE)
+        start = _positions_by_motor(episode["names"], episode["states"][0]) if episode else None
+        self.bus = SimMotorsBus(self.bus.motors, start_positions=start)
+        self.cameras = {name: SimCamera(cfg, name) for name, cfg in config.cameras.items()}
+
+
+class SimSO101Leader(SO101Leader):
+    # Replays the recorded actions of SIM_EPISODE in a loop as leader arm positions.
+
+    def __init__(self, config):
+        super().__init__(config)
+        episode = _load_episode(SIM_DATASET_ID, SIM_EPISODE)
+        trajectory = None
+        if episode is not None:
+            frames = [_positions_by_motor(episode["names"], a) for a in episode["actions"]]
+            trajectory = (episode["fps"], frames)
+        self.bus = SimMotorsBus(self.bus.motors, trajectory=trajectory)
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from lerobot.utils.robot_utils import busy_wait
+
+from ..config.ports_and_cameras import FPS
+
+STATS_WINDOW = 10_000  # ticks kept for percentile stats
+
+
+def _percentiles_ms(samples) -> dict:
+    if not samples:
+        return {}
+    arr = np.asarray(samples) * 1e3
+    return {
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+        "max": float(arr.max()),
+    }
+
+
+class TeleopEngine:
+    # Runs leader read -> follower write on its own fixed-rate thread.
+    # All motor bus traffic (including the optional follower state read) happens on this
+    # thread, so callers must not use robot.get_observation() concurrently; read
+    # cameras with robot.cameras[name].async_read() and joints with latest_follower_state().
+
+    def __init__(self, robot, teleop_device, fps: int = FPS, read_follower: bool = False):
+        self.robot = robot
+        self.teleop_device = teleop_device
+        self.period = 1.0 / fps
+        self.read_follower = read_follower
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.error = None
+        self._action = {}
+        self._follower_state = {}
+        self.latencies = deque(maxlen=STATS_WINDOW)
+        self.jitters = deque(maxlen=STATS_WINDOW)
+        self.ticks = 0
+        self.overruns = 0
+
+    def start(self) -> "TeleopEngine":
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name="teleop_engine", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _loop(self) -> None:
+        next_tick = time.perf_counter()
+        try:
+            while not self.stop_event.is_set():
+                tick_start = time.perf_counter()
+                self.jitters.append(abs(tick_start - next_tick))
+
+                action = self.teleop_device.get_action()
+                self.robot.send_action(action)
+                self.latencies.append(time.perf_counter() - tick_start)
+
+                follower_state = None
+                if self.read_follower:
+                    positions = self.robot.bus.sync_read("Present_Position")
+                    follower_state = {f"{motor}.pos": val for motor, val in positions.items()}
+                with self.lock:
+                    self._action = action
+                    if follower_state is not None:
+                        self._follower_state = follower_state
+                self.ticks += 1
+
+                next_tick += self.period
+                remaining = next_tick - time.perf_counter()
+                if remaining < 0:
+                    # Fell behind: count it and re-anchor instead of bursting to catch up
+                    self.overruns += 1
+                    next_tick = time.perf_counter()
+                else:
+                    busy_wait(remaining)
+        except Exception as e:
+            self.error = e
+
+    def check(self) -> None:
+        if self.error is not None:
+            raise RuntimeError(f"Teleop engine stopped: {self.error}") from self.error
+
+    def latest_action(self) -> dict:
+        with self.lock:
+            return dict(self._action)
+
+    def latest_follower_state(self) -> dict:
+        with self.lock:
+            return dict(self._follower_state)
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "latency_ms": _percentiles_ms(list(self.latencies)),
+            "jitter_ms": _percentiles_ms(list(self.jitters)),
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        lat, jit = s["latency_ms"], s["jitter_ms"]
+        if not lat:
+            return "No teleop ticks yet"
+        return (
+            f"ticks={s['ticks']} overruns={s['overruns']} | "
+            f"leader→follower p50={lat['p50']:.1f} p95={lat['p95']:.1f} p99={lat['p99']:.1f} ms | "
+            f"jitter p50={jit['p50']:.2f} p95={jit['p95']:.2f} p99={jit['p99']:.2f} ms"
+        )
@@ -0,0 +1 @@
+# Pinned policy snapshots
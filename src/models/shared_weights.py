@@ -0,0 +1,154 @@
+import copy
+import ctypes
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+import torch
+
+from .store import SNAPSHOT_PATTERNS, resolve_model
+
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+WEIGHTS_FILE = "model.safetensors"
+
+# Open mappings, kept for the life of the process so parameter storage never dangles
+_mappings = {}
+# Policies loaded in this process, shared by every robot cell that runs them
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def local_model_dir(model_id: str) -> Path:
+    path = Path(resolve_model(model_id))
+    if path.is_dir():
+        return path
+    from huggingface_hub import snapshot_download
+
+    return Path(snapshot_download(model_id, allow_patterns=SNAPSHOT_PATTERNS))
+
+
+def mmap_state_dict(weights_path: Path) -> dict:
+    # Tensors that are views into a copy-on-write mapping of the safetensors file. Every process
+    # mapping the same file shares the same page-cache pages; a page only becomes private to a
+    # process if that process writes to it, which inference never does.
+    weights_path = Path(weights_path).resolve()
+    key = str(weights_path)
+    if key not in _mappings:
+        with open(weights_path, "rb") as f:
+            _mappings[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    mm = _mappings[key]
+    (header_len,) = struct.unpack("<Q", mm[:8])
+    header = json.loads(mm[8 : 8 + header_len])
+    data_start = 8 + header_len
+    state = {}
+    for name, meta in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = SAFETENSORS_DTYPES[meta["dtype"]]
+        begin, end = meta["data_offsets"]
+        count = (end - begin) // torch.empty((), dtype=dtype).element_size()
+        tensor = torch.frombuffer(mm, dtype=dtype, count=count, offset=data_start + begin) if count else torch.empty(0, dtype=dtype)
+        state[name] = tensor.view(meta["shape"])
+    return state
+
+
+def _trim_heap() -> None:
+    # Return the freed, randomly initialised parameters to the OS (glibc keeps them otherwise)
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def load_policy_shared(policy_cls, model_id: str):
+    # Drop-in for policy_cls.from_pretrained(model_id) on CPU: the policy is built from its config,
+    # then its parameters are replaced (assign=True, no copy) by views of the mapped weights file.
+    from lerobot.configs.policies import PreTrainedConfig
+
+    path = local_model_dir(model_id)
+    config = PreTrainedConfig.from_pretrained(path)
+    config.device = "cpu"
+    policy = policy_cls(config)
+    state = mmap_state_dict(path / WEIGHTS_FILE)
+    expected = policy.state_dict()
+    mismatched = [k for k, v in state.items() if k in expected and expected[k].dtype != v.dtype]
+    if mismatched:
+        # A dtype cast would copy; keep those parameters private rather than fail
+        for k in mismatched:
+            state[k] = state[k].to(expected[k].dtype)
+    policy.load_state_dict(state, strict=True, assign=True)
+    del expected
+    _trim_heap()
+    policy.eval()
+    return policy
+
+
+def _load_policy(policy_cls, model_path: str):
+    # On CPU the weights are mapped (load_policy_shared), so skill processes and evaluation workers
+    # running the same checkpoint share one copy. On mps/cuda the parameters are copied to the
+    # device anyway, so from_pretrained is used as before.
+    from lerobot.configs.policies import PreTrainedConfig
+
+    path = local_model_dir(model_path)
+    if PreTrainedConfig.from_pretrained(path).device == "cpu":
+        return load_policy_shared(policy_cls, str(path))
+    return policy_cls.from_pretrained(path)
+
+
+def shared_policy(policy_cls, model_path: str):
+    # The policy loaded once per process (see _load_policy). Each caller gets its own
+    # shallow copy: modules and parameters are shared, while the per-episode state that reset()
+    # replaces (action queues) stays per cell, so several cells can run the same skill at once.
+    key = (policy_cls, str(model_path))
+    with _policies_lock:
+        if key not in _policies:
+            _policies[key] = _load_policy(policy_cls, model_path)
+    policy = copy.copy(_policies[key])
+    if getattr(policy, "temporal_ensembler", None) is not None:
+        policy.temporal_ensembler = copy.deepcopy(policy.temporal_ensembler)
+    policy.reset()
+    return policy
+
+
+def memory_report(pid: int | None = None, weights_path: Path | None = None) -> dict:
+    # Linux only (/proc). Pss splits each shared page between the processes that map it, so the
+    # sum of Pss over all workers is their real combined footprint.
+    pid = pid or os.getpid()
+    report = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[0].rstrip(":") in ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"):
+                    report[parts[0].rstrip(":").lower() + "_mb"] = int(parts[1]) / 1024
+    except FileNotFoundError:
+        return {}
+    report["shared_mb"] = report.get("shared_clean_mb", 0) + report.get("shared_dirty_mb", 0)
+    report["private_mb"] = report.get("private_clean_mb", 0) + report.get("private_dirty_mb", 0)
+    if weights_path is not None:
+        target = str(Path(weights_path).resolve())
+        weights = {"rss_mb": 0.0, "pss_mb": 0.0}
+        in_mapping = False
+        with open(f"/proc/{pid}/smaps") as f:
+            for line in f:
+                parts = line.split()
+                if "-" in parts[0] and len(parts) >= 5 and ":" in parts[3]:
+                    in_mapping = parts[-1] == target
+                elif in_mapping and parts[0] in ("Rss:", "Pss:"):
+                    weights[parts[0].rstrip(":").lower() + "_mb"] += int(parts[1]) / 1024
+        report["weights_mapping"] = weights
+    return report
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+# MODEL_OFFLINE=1: never touch the network; unpinned or missing snapshots are an error.
+# huggingface_hub reads HF_HUB_OFFLINE at import, so it is set before importing it.
+MODEL_OFFLINE = os.getenv("MODEL_OFFLINE", "0") == "1"
+if MODEL_OFFLINE:
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+from huggingface_hub import HfApi, snapshot_download
+from huggingface_hub.errors import LocalEntryNotFoundError
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# Checkpoints used by the skills. Pin them with `python scripts/model_store.py pin` and commit
+# models.lock.json; every skill then loads exactly the pinned revision.
+MODEL_SNAPSHOTS = {
+    "act_pick_and_place": "sangam-101/act_so101_pick_and_place_carrot_policy",
+    "act_use_slicer": "sangam-101/act_so101_slicer_to_slice_carrot_policy",
+    "act_transfer_slices": "sangam-101/act_so101_transfer_slices_to_pile",
+    "smolvla_pick_and_place": "sangam-101/smolvla_so101_pick_and_place_carrot",
+    "smolvla_use_slicer": "sangam-101/smolvla_so101_slicer_to_slice_carrot",
+    "smolvla_transfer_slices": "sangam-101/smolvla_so101_transfer_slices_to_pile",
+}
+MODEL_LOCK_FILE = Path(os.getenv("MODEL_LOCK_FILE", project_root / "models.lock.json"))
+# Check done on each load: "size" (cheap), "sha256" (reads every file), "off". Prefetch always hashes.
+MODEL_VERIFY = os.getenv("MODEL_VERIFY", "size")
+SNAPSHOT_PATTERNS = ["*.json", "*.safetensors"]  # policy config, processor configs and weights
+
+_verified = set()  # snapshot dirs already checked in this process
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_lock() -> dict:
+    if not MODEL_LOCK_FILE.exists():
+        return {}
+    return json.loads(MODEL_LOCK_FILE.read_text())
+
+
+def _write_lock(lock: dict) -> None:
+    MODEL_LOCK_FILE.write_text(json.dumps(dict(sorted(lock.items())), indent=2) + "\n")
+
+
+def _download(repo_id: str, revision: str, local_only: bool) -> Path:
+    return Path(
+        snapshot_download(repo_id, revision=revision, allow_patterns=SNAPSHOT_PATTERNS, local_files_only=local_only)
+    )
+
+
+def pin(repo_id: str, revision: str | None = None) -> dict:
+    # Resolves revision (default: current main) to a commit sha, downloads that snapshot and
+    # records per-file size and sha256. LFS files are cross-checked against the hub's own hash.
+    if MODEL_OFFLINE:
+        raise RuntimeError("Cannot pin with MODEL_OFFLINE=1")
+    info = HfApi().model_info(repo_id, revision=revision or "main", files_metadata=True)
+    path = _download(repo_id, info.sha, local_only=False)
+    files = {}
+    for file in sorted(p for p in path.rglob("*") if p.is_file()):
+        rel = file.relative_to(path).as_posix()
+        files[rel] = {"size": file.stat().st_size, "sha256": _sha256(file)}
+    for sibling in info.siblings or []:
+        lfs = getattr(sibling, "lfs", None)
+        if lfs and sibling.rfilename in files and lfs.sha256 != files[sibling.rfilename]["sha256"]:
+            raise RuntimeError(f"{repo_id}@{info.sha}: {sibling.rfilename} does not match the hub checksum")
+    entry = {"revision": info.sha, "pinned_at": datetime.now().isoformat(timespec="seconds"), "files": files}
+    lock = load_lock()
+    lock[repo_id] = entry
+    _write_lock(lock)
+    return entry
+
+
+def verify(repo_id: str, path: Path, level: str = "sha256") -> list[str]:
+    entry = load_lock()[repo_id]
+    problems = []
+    for rel, expected in entry["files"].items():
+        file = path / rel
+        if not file.exists():
+            problems.append(f"{rel}: missing")
+        elif file.stat().st_size != expected["size"]:
+            problems.append(f"{rel}: size {file.stat().st_size} != {expected['size']}")
+        elif level == "sha256" and _sha256(file) != expected["sha256"]:
+            problems.append(f"{rel}: sha256 mismatch")
+    return problems
+
+
+def snapshot_path(repo_id: str, verify_level: str | None = None) -> Path:
+    # Local directory of the pinned snapshot, downloading it first unless offline.
+    entry = load_lock().get(repo_id)
+    if entry is None:
+        raise RuntimeError(f"{repo_id} is not pinned in {MODEL_LOCK_FILE}; run scripts/model_store.py pin")
+    try:
+        path = _download(repo_id, entry["revision"], local_only=True)
+    except LocalEntryNotFoundError:
+        if MODEL_OFFLINE:
+            raise RuntimeError(
+                f"{repo_id}@{entry['revision'][:8]} is not in the local cache and MODEL_OFFLINE=1; "
+                "run scripts/model_store.py prefetch"
+            )
+        path = _download(repo_id, entry["revision"], local_only=False)
+    level = verify_level or MODEL_VERIFY
+    if level != "off" and (path, level) not in _verified:
+        problems = verify(repo_id, path, level)
+        if problems:
+            raise RuntimeError(f"{repo_id}@{entry['revision'][:8]} failed verification: {'; '.join(problems)}")
+        _verified.add((path, level))
+    return path
+
+
+def resolve_model(model_id: str) -> str:
+    # What the inference scripts pass to from_pretrained / make_pre_post_processors. A pinned repo
+    # id becomes its local snapshot directory, which lerobot loads with memory-mapped safetensors
+    # and no hub calls. Local paths pass through; unpinned repo ids keep today's behaviour online.
+    if Path(model_id).exists():
+        return model_id
+    if model_id in load_lock():
+        return str(snapshot_path(model_id))
+    if MODEL_OFFLINE:
+        raise RuntimeError(f"{model_id} is not pinned in {MODEL_LOCK_FILE} and MODEL_OFFLINE=1")
+    return model_id
+
+
+def prefetch(repo_ids: list[str] | None = None) -> dict:
+    lock = load_lock()
+    results = {}
+    for repo_id in repo_ids or list(lock):
+        results[repo_id] = snapshot_path(repo_id, verify_level="sha256")
+    return results
@@ -0,0 +1 @@
+# End-to-end span tracing
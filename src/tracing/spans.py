@@ -0,0 +1,136 @@
+import contextvars
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# TRACE_EXPORT: "jsonl" appends finished spans to TRACE_FILE from a background thread, "off" drops them
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "off")
+TRACE_FILE = Path(os.getenv("TRACE_FILE", project_root / "traces" / "spans.jsonl"))
+# Once TRACE_FILE grows past this it is moved to spans.jsonl.1 (replacing the previous one)
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+TRACE_QUEUE_SIZE = 10_000
+
+# (trace_id, span_id) of the innermost open span. asyncio.to_thread copies context variables, so
+# a skill running on a worker thread continues the trace of the request that started it.
+_current = contextvars.ContextVar("trace_span", default=None)
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def _new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str] | None:
+    # W3C trace context: "00-<32 hex trace id>-<16 hex parent span id>-<flags>"
+    parts = (header or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def current_traceparent() -> str | None:
+    ctx = _current.get()
+    return f"00-{ctx[0]}-{ctx[1]}-01" if ctx else None
+
+
+class JsonlSpanExporter:
+    # The caller only enqueues; file writes happen on the exporter thread so spans can be
+    # emitted from the event loop and the control loop without blocking either.
+
+    def __init__(self, path: Path = TRACE_FILE, queue_size: int = TRACE_QUEUE_SIZE, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.lock = threading.Lock()
+        self.dropped = 0
+
+    def export(self, span: dict) -> None:
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name="span_exporter", daemon=True)
+                self.thread.start()
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _worker(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            spans = [self.queue.get()]
+            while not self.queue.empty():
+                spans.append(self.queue.get_nowait())
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(s) + "\n" for s in spans)
+                size = f.tell()
+            if self.max_bytes > 0 and size >= self.max_bytes:
+                self.path.replace(self.path.with_name(self.path.name + ".1"))
+
+    def flush(self, timeout_s: float = 2.0) -> None:
+        deadline = time.monotonic() + timeout_s
+        while not self.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+exporter = JsonlSpanExporter()
+
+
+def export_span(span: dict) -> None:
+    if TRACE_EXPORT == "jsonl":
+        exporter.export(span)
+
+
+@contextmanager
+def trace_context(traceparent: str | None):
+    # Continues the caller's trace (e.g. the frontend's tool call) for the enclosed block, or
+    # leaves the current context untouched when no valid traceparent is given.
+    parsed = parse_traceparent(traceparent)
+    if parsed is None:
+        yield
+        return
+    token = _current.set(parsed)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    parent = _current.get()
+    trace_id = parent[0] if parent else new_trace_id()
+    span_id = _new_span_id()
+    token = _current.set((trace_id, span_id))
+    start_ns = time.time_ns()
+    t0 = time.perf_counter_ns()
+    status = "ok"
+    try:
+        yield span_id
+    except BaseException as e:
+        status = f"error: {type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        export_span(
+            {
+                "trace_id": trace_id,
+                "span_id": span_id,
+                "parent_id": parent[1] if parent else None,
+                "name": name,
+                "start_ns": start_ns,
+                "end_ns": start_ns + time.perf_counter_ns() - t0,
+                "status": status,
+                "attributes": attributes,
+            }
+        )
@@ -0,0 +1 @@
+# Off-thread rerun visualization
@@ -0,0 +1,181 @@
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import rerun as rr
+from lerobot.utils.visualization_utils import log_rerun_data
+
+# VIZ_MODE: "live" spawns the rerun viewer, "rrd" writes a .rrd file to VIZ_RRD_DIR, "off" logs nothing
+VIZ_MODE = os.getenv("VIZ_MODE", "live")
+VIZ_IMAGE_HZ = float(os.getenv("VIZ_IMAGE_HZ", "5"))
+VIZ_SCALAR_HZ = float(os.getenv("VIZ_SCALAR_HZ", "30"))
+VIZ_IMAGE_MAX_WIDTH = int(os.getenv("VIZ_IMAGE_MAX_WIDTH", "480"))
+VIZ_QUEUE_SIZE = int(os.getenv("VIZ_QUEUE_SIZE", "4"))
+VIZ_RRD_DIR = Path(os.getenv("VIZ_RRD_DIR", "rerun_recordings"))
+
+
+def _is_image(value) -> bool:
+    return isinstance(value, np.ndarray) and value.ndim == 3
+
+
+def _downsample(image: np.ndarray, max_width: int) -> np.ndarray:
+    h, w = image.shape[:2]
+    if w <= max_width:
+        return image
+    scale = max_width / w
+    return cv2.resize(image, (max_width, int(h * scale)), interpolation=cv2.INTER_AREA)
+
+
+class RerunSink:
+    # Takes observation/action samples from the control loop and does the rerun work on its own
+    # thread. The control thread only decimates and enqueues; when the queue is full the sample is
+    # dropped.
+
+    def __init__(
+        self,
+        session_name: str,
+        mode: str = VIZ_MODE,
+        image_hz: float = VIZ_IMAGE_HZ,
+        scalar_hz: float = VIZ_SCALAR_HZ,
+        image_max_width: int = VIZ_IMAGE_MAX_WIDTH,
+        queue_size: int = VIZ_QUEUE_SIZE,
+        rrd_dir: Path = VIZ_RRD_DIR,
+    ):
+        self.session_name = session_name
+        self.mode = mode
+        self.image_period = 1.0 / image_hz if image_hz > 0 else float("inf")
+        self.scalar_period = 1.0 / scalar_hz if scalar_hz > 0 else float("inf")
+        self.image_max_width = image_max_width
+        self.rrd_dir = Path(rrd_dir)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.last_image_t = 0.0
+        self.last_scalar_t = 0.0
+        self.submitted = 0
+        self.dropped = 0
+        self.logged = 0
+        self._unwatched = None
+        self._last_observation = None
+
+    def start(self) -> "RerunSink":
+        if self.mode == "off":
+            return self
+        rr.init(self.session_name)
+        if self.mode == "rrd":
+            self.rrd_dir.mkdir(parents=True, exist_ok=True)
+            rrd_path = self.rrd_dir / f"{self.session_name}_{time.strftime('%Y%m%d_%H%M%S')}.rrd"
+            rr.save(str(rrd_path))
+            print(f"Rerun recording to {rrd_path}")
+        else:
+            rr.spawn(memory_limit=os.getenv("LEROBOT_RERUN_MEMORY_LIMIT", "10%"))
+        self.thread = threading.Thread(target=self._worker, name="rerun_sink", daemon=True)
+        self.thread.start()
+        return self
+
+    def attach(self, robot):
+        # Wraps this robot instance's get_observation / send_action (not the class, nor lerobot's
+        # log_rerun_data), so only this arm is shown and other cells' record loops are untouched.
+        # One sample per control tick: the tick's observation together with the action sent.
+        get_observation, send_action = robot.get_observation, robot.send_action
+
+        def get_observation_logged():
+            observation = get_observation()
+            self._last_observation = observation
+            return observation
+
+        def send_action_logged(action):
+            sent = send_action(action)
+            self.log(observation=self._last_observation, action=sent)
+            return sent
+
+        self._unwatched = (robot, get_observation, send_action)
+        robot.get_observation = get_observation_logged
+        robot.send_action = send_action_logged
+        return robot
+
+    def detach(self) -> None:
+        if self._unwatched is not None:
+            robot, robot.get_observation, robot.send_action = self._unwatched
+            self._unwatched = None
+            self._last_observation = None
+
+    def log(self, observation: dict | None = None, action: dict | None = None) -> None:
+        if self.thread is None:
+            return
+        now = time.perf_counter()
+        send_images = now - self.last_image_t >= self.image_period
+        send_scalars = now - self.last_scalar_t >= self.scalar_period
+        if not (send_images or send_scalars):
+            return
+
+        obs_out = {}
+        for key, value in (observation or {}).items():
+            if _is_image(value):
+                if send_images:
+                    obs_out[key] = value
+            elif send_scalars:
+                obs_out[key] = value
+        act_out = action if send_scalars else None
+
+        self.submitted += 1
+        try:
+            self.queue.put_nowait((time.time(), obs_out, act_out))
+        except queue.Full:
+            self.dropped += 1
+            return
+        if send_images:
+            self.last_image_t = now
+        if send_scalars:
+            self.last_scalar_t = now
+
+    def _worker(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            t, observation, action = item
+            observation = {
+                k: _downsample(v, self.image_max_width) if _is_image(v) else v for k, v in observation.items()
+            }
+            try:
+                rr.set_time("capture_time", timestamp=t)
+                log_rerun_data(observation=observation, action=action)
+                self.logged += 1
+            except Exception as e:
+                print(f"Rerun logging error: {e}")
+
+    def stop(self) -> None:
+        self.detach()
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout=2.0)
+        self.thread = None
+        print(f"Visualization: {self.logged} logged, {self.dropped} dropped of {self.submitted} samples")
+
+
+_active_sink = None
+
+
+def start_visualization(session_name: str, robot=None, **kwargs) -> RerunSink:
+    # Replaces init_rerun() + record_loop(display_data=True): starts the sink and, when a robot is
+    # given, logs that robot's observations and actions through it. Callers pass
+    # display_data=False to record_loop so nothing is logged on the control thread.
+    global _active_sink
+    stop_visualization()
+    _active_sink = RerunSink(session_name, **kwargs).start()
+    if robot is not None:
+        _active_sink.attach(robot)
+    return _active_sink
+
+
+def stop_visualization() -> None:
+    # Detaches from the robot before it is handed to the next skill (robot_session)
+    global _active_sink
+    if _active_sink is not None:
+        _active_sink.stop()
+        _active_sink = None
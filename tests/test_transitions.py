@@ -0,0 +1,58 @@
+import json
+import threading
+
+from src.control import transitions
+from src.control.cancel import CancelToken, cancel_scope
+
+FPS = 30
+
+
+class FakeRobot:
+    def __init__(self, observation: dict, on_action=None):
+        self.observation = observation
+        self.on_action = on_action
+        self.actions = []
+
+    def get_observation(self) -> dict:
+        return dict(self.observation)
+
+    def send_action(self, action: dict) -> dict:
+        self.actions.append(action)
+        if self.on_action is not None:
+            self.on_action(len(self.actions))
+        return action
+
+
+def _start_poses(tmp_path, monkeypatch):
+    path = tmp_path / "skill_start_poses.json"
+    path.write_text(json.dumps({"skill": {"start_pose": {"shoulder_pan.pos": 50.0}, "start_spread": {"shoulder_pan.pos": 0.0}}}))
+    monkeypatch.setattr(transitions, "SKILL_START_POSES_FILE", path)
+    monkeypatch.setattr(transitions, "TRANSITIONS", True)
+
+
+def test_transition_runs_the_whole_path(tmp_path, monkeypatch):
+    _start_poses(tmp_path, monkeypatch)
+    monkeypatch.setattr(transitions.time, "sleep", lambda s: None)
+    robot = FakeRobot({"shoulder_pan.pos": 0.0})
+    transitions.transition_to_start(robot, "skill", FPS)
+    steps = len(transitions.plan_transition({"shoulder_pan.pos": 0.0}, {"shoulder_pan.pos": 50.0}, FPS))
+    assert len(robot.actions) == steps
+    assert robot.actions[-1]["shoulder_pan.pos"] == 50.0
+
+
+def test_cancel_stops_the_transition_mid_path(tmp_path, monkeypatch):
+    _start_poses(tmp_path, monkeypatch)
+    monkeypatch.setattr(transitions.time, "sleep", lambda s: None)
+    token = CancelToken()
+
+    def cancel_after_five(sent: int) -> None:
+        if sent == 5:
+            # From another thread, like /robot/abort or the scheduler
+            thread = threading.Thread(target=token.cancel)
+            thread.start()
+            thread.join()
+
+    robot = FakeRobot({"shoulder_pan.pos": 0.0}, on_action=cancel_after_five)
+    with cancel_scope(token):
+        transitions.transition_to_start(robot, "skill", FPS)
+    assert len(robot.actions) == 5